@@ -107,6 +107,9 @@ API
 """
 from functools import partial, update_wrapper
 
+from .batch import make_validate_batch
+from .cache import make_key_cache_info
+from .decoder import decode, make_validate_bytes
 from .draft04 import CodeGeneratorDraft04
 from .draft06 import CodeGeneratorDraft06
 from .draft07 import CodeGeneratorDraft07
@@ -117,6 +120,7 @@ from .exceptions import (
     JsonSchemaValuesException,
     JsonSchemaDefinitionException,
 )
+from .optimizer import optimize_definition
 from .ref_resolver import RefResolver
 from .version import VERSION
 
@@ -129,6 +133,7 @@ __all__ = (
     'validate',
     'compile',
     'compile_to_code',
+    'decode',
 )
 
 
@@ -141,6 +146,10 @@ def validate(
     use_formats: bool = True,
     detailed_exceptions: bool = True,
     fast_fail: bool = True,
+    return_bool: bool = False,
+    json_input: bool = False,
+    key_cache_size: int | None = None,
+    optimize: bool = False,
 ):
     """
     Validation function for lazy programmers or for use cases when you need
@@ -161,7 +170,10 @@ def validate(
     :any:`compile` for details and security considerations when schemas are not
     fully trusted.
     """
-    return compile(definition, handlers, formats, use_default, use_formats, detailed_exceptions, fast_fail)(data)
+    return compile(
+        definition, handlers, formats, use_default, use_formats, detailed_exceptions, fast_fail, return_bool,
+        json_input, key_cache_size, optimize,
+    )(data)
 
 
 #TODO: Change use_default to False when upgrading to version 3.
@@ -174,6 +186,10 @@ def compile(
     use_formats: bool = True,
     detailed_exceptions: bool = True,
     fast_fail: bool = True,
+    return_bool: bool = False,
+    json_input: bool = False,
+    key_cache_size: int | None = None,
+    optimize: bool = False,
 ):
     """
     Generates validation function for validating JSON schema passed in ``definition``.
@@ -252,6 +268,21 @@ def compile(
             'bar': lambda value: value in ('foo', 'bar'),
         })
 
+    Module ``fastjsonschema.formats`` contains validators of some formats written
+    without regular expressions (accepting the same values) which are faster, you can
+    pass them the same way: ``formats=NATIVE_FORMATS`` after ``from fastjsonschema.formats
+    import NATIVE_FORMATS``. Expensive custom formats can be wrapped by ``cached_format``
+    from the same module to remember results of recently validated values:
+
+    .. code-block:: python
+
+        from fastjsonschema.formats import cached_format
+
+        currency = cached_format(lambda value: value in load_currencies(), max_size=1000)
+        validate = fastjsonschema.compile(definition, formats={'currency': currency})
+        validate(data)
+        currency.cache_info().hit_ratio
+
     Note that formats are automatically used as assertions. It can be turned
     off by passing `use_formats=False`. When disabled, custom formats are
     disabled as well. (Added in 2.19.0.)
@@ -262,6 +293,45 @@ def compile(
     By default, the execution stops with the first validation error. If you need
     to collect all the errors, turn this off by passing `fast_fail=False`.
 
+    If you need only to know whether data are valid, pass `return_bool=True`.
+    Generated function then returns `True` or `False` instead of returning data
+    or raising an exception, which makes rejecting invalid data as cheap as
+    accepting valid data. Options `detailed_exceptions` and `fast_fail` have
+    no effect in this mode.
+
+    .. code-block:: python
+
+        is_valid = fastjsonschema.compile({'type': 'string'}, return_bool=True)
+        assert is_valid('hello') is True
+        assert is_valid(42) is False
+
+    When validated data always come straight from JSON decoder (such as ``json.loads``),
+    you can pass `json_input=True`. Data can then contain only `dict`, `list`, `str`,
+    `int`, `float`, `bool` and `None`, so generated code checks exact types (`tuple` is
+    not an array and `Decimal` is not a number) computing type of every value only once.
+    In this mode `bool` is never treated as a number, not even by keywords like `minimum`.
+
+    When the same keys of objects repeat in validated data, you can pass `key_cache_size`
+    to remember results of ``propertyNames`` and ``patternProperties`` for that many
+    recently used keys (for each such keyword). Results are shared by all calls, so
+    custom formats used by ``propertyNames`` has to be always the same. How well it
+    works can be checked by ``key_cache_info``:
+
+    .. code-block:: python
+
+        validate = fastjsonschema.compile({'propertyNames': {'pattern': '^[a-z]+$'}}, key_cache_size=1000)
+        validate({'a': 1})
+        validate({'a': 2})
+        validate.key_cache_info()
+        # {'validate__property_names1': CacheInfo(hits=1, misses=1, maxsize=1000, currsize=1)}
+
+    Definitions written for people often contain redundant structure (such as
+    ``allOf`` with one item, the same ``type`` repeated in ``allOf`` or ``not`` of
+    ``not``). Pass `optimize=True` to simplify the definition before generating the
+    code. Results of validation are the same, exceptions have the same names and rules,
+    but their ``definition`` is the simplified one. Parts of the definition referenced
+    by ``$ref`` are kept as they are.
+
     Exception :any:`JsonSchemaDefinitionException` is raised when generating the
     code fails (bad definition).
 
@@ -271,6 +341,35 @@ def compile(
     Exception :any:`JsonSchemaValuesException` is raised from generated function when
     validation fails (data do not follow the definition) contatining all the errors
     (when fast_fail is set to `False`).
+
+    When you have raw JSON document (for example body of HTTP request), you can
+    decode and validate it in one call with ``validate_bytes``. It can check size and
+    nesting of the document before decoding it (see :any:`decode`) and it uses
+    ``orjson`` for decoding when it is installed.
+
+    .. code-block:: python
+
+        validate = fastjsonschema.compile({'type': 'string'})
+        validate.validate_bytes(b'"hello"', max_size=1024, max_depth=32)
+
+    Many records can be validated at once by ``validate_batch`` returning indexes of
+    invalid ones. Records can be passed as a list of objects or as a dict of columns
+    (lists or NumPy arrays). When ``numpy`` is installed and the definition is a flat
+    object with properties defined only by ``type``, bounds and ``enum``, values are
+    checked by columns and the generated function is called only for records which
+    did not pass. Otherwise it is called for every record.
+
+    .. code-block:: python
+
+        validate = fastjsonschema.compile({
+            'type': 'object',
+            'properties': {'age': {'type': 'integer', 'minimum': 0}},
+            'required': ['age'],
+        })
+        validate.validate_batch([{'age': 42}, {'age': -1}, {}])
+        # [1, 2]
+        validate.validate_batch({'age': numpy.array([42, -1])})
+        # [1]
     """
     resolver, code_generator = _factory(
         definition,
@@ -280,13 +379,22 @@ def compile(
         use_formats,
         detailed_exceptions,
         fast_fail,
+        return_bool,
+        json_input,
+        key_cache_size,
+        optimize,
     )
     global_state = code_generator.global_state
     # Do not pass local state so it can recursively call itself.
     exec(code_generator.func_code, global_state)
     func = global_state[resolver.get_scope_name()]
     if formats:
-        return update_wrapper(partial(func, custom_formats=formats), func)
+        func = update_wrapper(partial(func, custom_formats=formats), func)
+    func.validate_bytes = make_validate_bytes(func, return_bool)
+    func.key_cache_info = make_key_cache_info(global_state)
+    func.validate_batch = make_validate_batch(
+        func, definition, return_bool, not isinstance(code_generator, CodeGeneratorDraft06),
+    )
     return func
 
 
@@ -299,6 +407,10 @@ def compile_to_code(
     use_formats: bool = True,
     detailed_exceptions: bool = True,
     fast_fail: bool = True,
+    return_bool: bool = False,
+    json_input: bool = False,
+    key_cache_size: int | None = None,
+    optimize: bool = False,
 ):
     """
     Generates validation code for validating JSON schema passed in ``definition``.
@@ -333,6 +445,10 @@ def compile_to_code(
         use_formats,
         detailed_exceptions,
         fast_fail,
+        return_bool,
+        json_input,
+        key_cache_size,
+        optimize,
     )
     return (
         'VERSION = "' + VERSION + '"\n' +
@@ -349,9 +465,16 @@ def _factory(
     use_formats: bool = True,
     detailed_exceptions: bool = True,
     fast_fail: bool = True,
+    return_bool: bool = False,
+    json_input: bool = False,
+    key_cache_size: int | None = None,
+    optimize: bool = False,
 ):
+    code_generator_class = _get_code_generator_class(definition)
+    if optimize:
+        definition = optimize_definition(definition, issubclass(code_generator_class, CodeGeneratorDraft06))
     resolver = RefResolver.from_schema(definition, handlers=handlers, store={})
-    code_generator = _get_code_generator_class(definition)(
+    code_generator = code_generator_class(
         definition,
         resolver=resolver,
         formats=formats,
@@ -359,6 +482,9 @@ def _factory(
         use_formats=use_formats,
         detailed_exceptions=detailed_exceptions,
         fast_fail=fast_fail,
+        return_bool=return_bool,
+        json_input=json_input,
+        key_cache_size=key_cache_size,
     )
     return resolver, code_generator
 
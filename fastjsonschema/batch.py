@@ -0,0 +1,254 @@
+"""
+Validation of many flat records sharing one definition of object at once.
+
+When records are passed as columns (for example NumPy arrays or columns of a data
+frame), ``numpy`` is installed and definition of records is simple (object with
+properties defined only by type, bounds and enum, and required properties), each
+column is checked by vectorized operations. Generated validation function is then
+called only for records which did not pass, so reported records are always the
+same as by calling it for each record. Otherwise each record is validated by the
+generated function. That includes list of records, transposing it to columns in
+Python takes longer than validating it by the generated function.
+"""
+
+from itertools import compress
+
+from .exceptions import JsonSchemaValueException, JsonSchemaValuesException
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+RECORDS_KEYWORDS = frozenset((
+    '$schema', 'type', 'properties', 'required', 'additionalProperties', 'title', 'description', '$comment',
+))
+COLUMN_KEYWORDS = frozenset((
+    'type', 'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum', 'enum', 'title', 'description', '$comment',
+))
+JSON_TYPE_TO_PYTHON_TYPES = {
+    'null': (type(None),),
+    'boolean': (bool,),
+    'number': (int, float),
+    'integer': (int,),
+    'string': (str,),
+}
+# Kinds of dtype of NumPy arrays with items of the same Python type.
+NUMPY_KIND_TO_PYTHON_TYPE = {
+    'b': bool,
+    'i': int,
+    'u': int,
+    'f': float,
+    'U': str,
+}
+# Bigger numbers are not exactly represented by float64, such records are always
+# validated by generated function.
+MAX_EXACT_NUMBER = 2 ** 53
+
+
+def make_validate_batch(func, definition, return_bool=False, exclusive_bounds_are_flags=False):
+    """
+    Returns function validating list of records (or mapping of property names to
+    columns, which can be NumPy arrays) by ``func`` generated by :any:`compile`
+    and returning indexes of invalid records. Available as ``validate_batch``
+    property of it.
+    """
+    columns_definition = _columns_definition(definition, exclusive_bounds_are_flags)
+    if numpy is None:
+        columns_definition = None
+
+    def is_valid(record):
+        try:
+            result = func(record)
+        except (JsonSchemaValueException, JsonSchemaValuesException):
+            return False
+        return result is True if return_bool else True
+
+    def validate_batch(records):
+        if not isinstance(records, dict):
+            return [index for index, record in enumerate(records) if not is_valid(record)]
+        count = max((len(column) for column in records.values()), default=0)
+        if columns_definition is None:
+            suspicious = range(count)
+        else:
+            suspicious = _check_columns(columns_definition, records, count)
+        return [index for index in suspicious if not is_valid(_record_from_columns(records, index))]
+    return validate_batch
+
+
+def _columns_definition(definition, exclusive_bounds_are_flags):
+    """
+    Returns definition of records prepared for checking by columns, or ``None``
+    when it is not simple enough. It is a dict with ``columns`` mapping names of
+    properties to tuple of allowed Python types, bounds (list of tuples of NumPy
+    function comparing invalid value with a bound, such as ``less`` for minimum)
+    and enum (frozenset or ``None``), with ``required`` names and ``properties``
+    (names, or ``None`` when additional properties are allowed).
+    """
+    if not isinstance(definition, dict) or not definition.keys() <= RECORDS_KEYWORDS:
+        return None
+    if definition.get('type') != 'object':
+        return None
+    properties = definition.get('properties', {})
+    required = definition.get('required', [])
+    additional_properties = definition.get('additionalProperties', True)
+    if not isinstance(properties, dict) or not isinstance(required, list) or additional_properties not in (True, False):
+        return None
+    if not all(isinstance(name, str) for name in required):
+        return None
+
+    columns = {}
+    for name, column_definition in properties.items():
+        column = _column_definition(column_definition, exclusive_bounds_are_flags)
+        if column is None:
+            return None
+        columns[name] = column
+    for name in required:
+        # Required property without definition can be anything.
+        columns.setdefault(name, (None, [], None))
+    return {
+        'columns': columns,
+        'required': frozenset(required),
+        'properties': None if additional_properties else frozenset(properties),
+    }
+
+
+def _column_definition(definition, exclusive_bounds_are_flags):  # pylint: disable=too-many-return-statements
+    if not isinstance(definition, dict) or not definition.keys() <= COLUMN_KEYWORDS or 'type' not in definition:
+        return None
+    types = definition['type'] if isinstance(definition['type'], list) else [definition['type']]
+    if not types or not all(json_type in JSON_TYPE_TO_PYTHON_TYPES for json_type in types):
+        return None
+    python_types = frozenset(
+        python_type
+        for json_type in types
+        for python_type in JSON_TYPE_TO_PYTHON_TYPES[json_type]
+    )
+
+    if exclusive_bounds_are_flags:
+        # Before draft 06 exclusive bounds are only flags of minimum and maximum.
+        flags = (definition.get('exclusiveMinimum', False), definition.get('exclusiveMaximum', False))
+        if not all(isinstance(flag, bool) for flag in flags):
+            return None
+        keywords = (
+            ('minimum', 'less_equal' if definition.get('exclusiveMinimum') else 'less'),
+            ('maximum', 'greater_equal' if definition.get('exclusiveMaximum') else 'greater'),
+        )
+    else:
+        keywords = (
+            ('minimum', 'less'),
+            ('exclusiveMinimum', 'less_equal'),
+            ('maximum', 'greater'),
+            ('exclusiveMaximum', 'greater_equal'),
+        )
+    bounds = []
+    for keyword, function in keywords:
+        if keyword in definition:
+            value = definition[keyword]
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                return None
+            bounds.append((function, value))
+    if bounds and not python_types <= {int, float}:
+        return None
+
+    enum = definition.get('enum')
+    if enum is not None:
+        if not isinstance(enum, list):
+            return None
+        if not all(type(value) in python_types for value in enum):
+            return None
+        # With types so for example ``1.0`` is not considered the same as ``1``.
+        enum = frozenset(zip(map(type, enum), enum))
+    return python_types, bounds, enum
+
+
+def _check_columns(columns_definition, columns, count):
+    """
+    Returns indexes of records which can be invalid, all other records are valid.
+    """
+    properties = columns_definition['properties']
+    if properties is not None and not columns.keys() <= properties:
+        return range(count)
+    suspicious = numpy.zeros(count, dtype=bool)
+
+    for name, (python_types, bounds, enum) in columns_definition['columns'].items():
+        column = columns.get(name)
+        if column is None:
+            if name in columns_definition['required'] and count:
+                return range(count)
+            continue
+        if len(column) != count:
+            return range(count)
+        if python_types is not None:
+            suspicious |= _check_column(column, python_types, bounds, enum)
+    return numpy.flatnonzero(suspicious).tolist()
+
+
+def _check_column(column, python_types, bounds, enum):  # pylint: disable=too-many-branches
+    """
+    Returns mask of values in ``column`` which can be invalid.
+    """
+    count = len(column)
+    if isinstance(column, numpy.ndarray) and column.dtype.kind in NUMPY_KIND_TO_PYTHON_TYPE:
+        # All values are of the same type.
+        python_type = NUMPY_KIND_TO_PYTHON_TYPE[column.dtype.kind]
+        if python_type not in python_types:
+            return numpy.ones(count, dtype=bool)
+        if enum is not None:
+            enum = [value for value_type, value in enum if value_type is python_type]
+        suspicious, valid_type, values = numpy.zeros(count, dtype=bool), None, column
+    else:
+        if isinstance(column, numpy.ndarray):
+            column = column.tolist()
+        valid_type = numpy.fromiter(map(python_types.__contains__, map(type, column)), dtype=bool, count=count)
+        suspicious = ~valid_type
+        if not bounds and enum is None:
+            return suspicious
+        values = list(compress(column, valid_type))
+
+    values_suspicious = numpy.zeros(len(values), dtype=bool)
+    if bounds:
+        numbers = _numbers_array(values)
+        if numbers is None:
+            values_suspicious[:] = True
+        else:
+            values_suspicious |= numpy.abs(numbers) >= MAX_EXACT_NUMBER
+            for function, value in bounds:
+                values_suspicious |= getattr(numpy, function)(numbers, value)
+    if enum is not None and valid_type is None:
+        values_suspicious |= ~numpy.isin(values, enum)
+    elif enum is not None:
+        values_suspicious |= ~numpy.fromiter(
+            map(enum.__contains__, zip(map(type, values), values)), dtype=bool, count=len(values),
+        )
+
+    if valid_type is None:
+        suspicious |= values_suspicious
+    else:
+        suspicious[numpy.flatnonzero(valid_type)[values_suspicious]] = True
+    return suspicious
+
+
+def _numbers_array(values):
+    if isinstance(values, numpy.ndarray):
+        return values
+    try:
+        numbers = numpy.asarray(values)
+    except (OverflowError, ValueError):
+        return None
+    if numbers.dtype.kind not in 'iuf':
+        # For example integers too big for int64 are kept as objects.
+        return None
+    return numbers
+
+
+def _record_from_columns(columns, index):
+    record = {}
+    for name, column in columns.items():
+        if index < len(column):
+            value = column[index]
+            if numpy is not None and isinstance(value, numpy.generic):
+                value = value.item()
+            record[name] = value
+    return record
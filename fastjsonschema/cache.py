@@ -0,0 +1,124 @@
+"""
+Caches used by generated code at runtime. Keys of objects repeat heavily across
+validated documents, so the results computed for them are kept to not compute
+them again for every document.
+"""
+
+from collections import OrderedDict, namedtuple
+import re
+
+
+MAX_SIZE = 4096
+
+class CacheInfo(namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])):
+    __slots__ = ()
+
+    @property
+    def hit_ratio(self):
+        """
+        Returns part of calls (from 0 to 1) answered from the cache.
+        """
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+class PatternsCache(dict):
+    """
+    Mapping of a key to tuple of bools whether the key is matched by each of
+    ``patterns`` (compiled regular expressions), used by ``patternProperties``.
+    Missing keys are computed on access and when there are more than ``max_size``
+    keys, the cache is cleared so it cannot grow without limits.
+
+    All patterns are also joined into one alternation, so keys not matched by any
+    pattern are resolved by only one search.
+    """
+
+    def __init__(self, patterns, max_size=MAX_SIZE):
+        super().__init__()
+        self._patterns = tuple(patterns)
+        self._max_size = max_size
+        self._no_match = (False,) * len(self._patterns)
+        self._any_pattern = _join_patterns(self._patterns)
+
+    def __missing__(self, key):
+        if len(self) >= self._max_size:
+            self.clear()
+        result = self[key] = self.match(key)
+        return result
+
+    def match(self, key):
+        """
+        Returns tuple of bools whether the key is matched by each pattern without cache.
+        """
+        if self._any_pattern is not None and not self._any_pattern.search(key):
+            return self._no_match
+        return tuple(bool(pattern.search(key)) for pattern in self._patterns)
+
+
+class KeyCache:
+    """
+    Least recently used cache of results of ``func`` called with a key of object
+    as the first argument (other arguments are not part of the cache key), used
+    by ``propertyNames`` and ``patternProperties`` when :any:`compile` is called
+    with ``key_cache_size`` and by custom formats wrapped by :any:`cached_format`.
+    It keeps at most ``max_size`` keys and counts hits and misses, see `cache_info`.
+    """
+
+    def __init__(self, func, max_size):
+        self._func = func
+        self._max_size = max_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, key, *args):
+        cache = self._cache
+        try:
+            result = cache[key]
+            cache.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            result = cache[key] = self._func(key, *args)
+            if len(cache) > self._max_size:
+                cache.popitem(last=False)
+            return result
+        self.hits += 1
+        return result
+
+    def cache_info(self):
+        """
+        Returns statistics of the cache the same way as :func:`functools.lru_cache`.
+        """
+        return CacheInfo(self.hits, self.misses, self._max_size, len(self._cache))
+
+    def cache_clear(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+
+def make_key_cache_info(global_state):
+    """
+    Returns function returning statistics of all :any:`KeyCache` in generated code
+    by their names. Available as ``key_cache_info`` property of function generated
+    by :any:`compile`.
+    """
+    caches = {name: value for name, value in global_state.items() if isinstance(value, KeyCache)}
+
+    def key_cache_info():
+        return {name: cache.cache_info() for name, cache in caches.items()}
+    return key_cache_info
+
+
+def _join_patterns(patterns):
+    if len(patterns) < 2 or len(set(pattern.flags for pattern in patterns)) != 1:
+        return None
+    # Patterns with groups are not joined as numbers of their groups would change.
+    if any(pattern.groups for pattern in patterns):
+        return None
+    try:
+        return re.compile(
+            '|'.join('(?:{})'.format(pattern.pattern) for pattern in patterns),
+            patterns[0].flags,
+        )
+    except re.error:
+        return None
@@ -0,0 +1,75 @@
+"""
+Canonical form of JSON values used by generated code to compare objects and arrays
+(for example in ``enum``, ``const`` or ``uniqueItems``) by one lookup in a set
+instead of comparing them item by item.
+"""
+
+
+def canonical(value, max_depth=None):  # pylint: disable=too-many-return-statements
+    """
+    Returns hashable form of JSON ``value``. Two values have the same canonical form
+    only when they are equal by JSON Schema: objects are compared without order of
+    keys, arrays and tuples are the same, ``1`` equals ``1.0`` but not ``True``.
+
+    Values nested deeper than ``max_depth`` levels get unique form not equal to
+    anything else, so data which cannot match anyway are not walked through entirely.
+    Values of other types (such as ``Decimal``) are compared as they are when they
+    are hashable, otherwise they get unique form as well.
+    """
+    if isinstance(value, str) or value is None:
+        return value
+    if isinstance(value, bool):
+        return ('boolean', value)
+    if isinstance(value, (int, float)):
+        return value
+    if max_depth == 0:
+        return object()
+    if max_depth is not None:
+        max_depth -= 1
+    if isinstance(value, dict):
+        return ('object', frozenset((key, canonical(item, max_depth)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return ('array', tuple(canonical(item, max_depth) for item in value))
+    try:
+        hash(value)
+    except TypeError:
+        return object()
+    return value
+
+
+def has_unique_items(items):
+    """
+    Returns whether all ``items`` are different by JSON Schema (see :any:`canonical`).
+    Items are first put into a set as they are which is enough when they are all
+    hashable and different. Only when it fails or finds some equal items (which
+    can be also ``1`` and ``True``), they are compared by their canonical form.
+    """
+    try:
+        if len(set(items)) == len(items):
+            return True
+    except TypeError:
+        pass
+    return len(set(map(canonical, items))) == len(items)
+
+
+def has_unique_scalars(items):
+    """
+    Same as :any:`has_unique_items` for items known to be strings, numbers or null
+    (not booleans together with numbers), for which comparison in a set is enough.
+    """
+    try:
+        return len(set(items)) == len(items)
+    except TypeError:
+        # Items are validated before, this is only for direct calls with other items.
+        return has_unique_items(items)
+
+
+def depth(value):
+    """
+    Returns number of nested levels of objects and arrays in JSON ``value``.
+    """
+    if isinstance(value, dict):
+        return 1 + max((depth(item) for item in value.values()), default=0)
+    if isinstance(value, (list, tuple)):
+        return 1 + max((depth(item) for item in value), default=0)
+    return 0
@@ -0,0 +1,250 @@
+"""
+Code of conditions for simple parts of definitions used by generators.
+
+Functions here only inspect the definition and return code of conditions (or data
+needed to build them), they do not generate any lines nor global variables, which
+is left to the generators:
+
+ * types of data after keyword ``type`` (:any:`checked_types`),
+ * values of ``enum`` compared one by one (:any:`value_condition`),
+ * ``multipleOf`` of floats checked for integers by exact modulo
+   (:any:`integer_modulo_code`),
+ * discriminating property of ``oneOf`` or ``anyOf`` (:any:`find_discriminator`),
+ * definitions of items which can be validated for all items at once
+   (:any:`bulk_items_checks`).
+"""
+
+import decimal
+
+from .generator import enforce_list
+
+
+# Keywords of definition of items which can be validated for all items at once by
+# builtin functions (see `bulk_items_checks`), others are only annotations.
+BULK_ITEMS_KEYWORDS = frozenset((
+    'type', 'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum',
+    'minLength', 'maxLength', 'enum', 'pattern',
+    'title', 'description', '$comment', 'examples', 'default',
+))
+BULK_ITEMS_TYPES = frozenset(('null', 'boolean', 'number', 'integer', 'string'))
+
+
+def checked_types(type_definition):
+    """
+    Returns types of keywords applicable only to some type (``string``, ``number``,
+    ``array`` or ``object``) which data can have after keyword ``type`` with value
+    ``type_definition``. Integers are guarded by the same check as numbers.
+    """
+    return {'number' if json_type == 'integer' else json_type for json_type in enforce_list(type_definition)}
+
+
+def type_condition(var, json_type, json_input=False):
+    """
+    Returns condition whether ``var`` is ``string``, ``number`` (not boolean) or
+    (for any other ``json_type``) object or array.
+    """
+    if json_input:
+        if json_type == 'string':
+            return 'type({}) is str'.format(var)
+        if json_type == 'number':
+            return '(type({var}) is int or type({var}) is float)'.format(var=var)
+        return '(type({var}) is dict or type({var}) is list)'.format(var=var)
+    if json_type == 'string':
+        return 'isinstance({}, str)'.format(var)
+    if json_type == 'number':
+        return 'isinstance({var}, (int, float)) and not isinstance({var}, bool)'.format(var=var)
+    return 'isinstance({}, (dict, list, tuple))'.format(var)
+
+
+def value_condition(var, value, json_input=False):  # pylint: disable=too-many-return-statements
+    """
+    Returns condition whether ``var`` is equal to ``value`` by JSON Schema, so for
+    example ``1`` is not equal to ``True``. With ``json_input`` only exact types of
+    data from JSON decoder are expected.
+    """
+    if json_input:
+        return _json_value_condition(var, value)
+    if isinstance(value, bool):
+        return 'isinstance({var}, bool) and {var} is {val}'.format(var=var, val=repr(value))
+    if isinstance(value, (int, float)):
+        return (
+            'isinstance({var}, (int, float)) and not isinstance({var}, bool) and {var} == {val}'
+        ).format(var=var, val=repr(value))
+    if value is None:
+        return '{var} is None'.format(var=var)
+    if isinstance(value, str):
+        return 'isinstance({var}, str) and {var} == {val}'.format(var=var, val=repr(value))
+    if isinstance(value, dict):
+        return _dict_condition(var, value, 'isinstance({var}, dict)', value_condition)
+    if isinstance(value, (list, tuple)):
+        return _list_condition(var, value, 'isinstance({var}, (list, tuple))', value_condition)
+    return '{var} == {val}'.format(var=var, val=repr(value))
+
+
+def _json_value_condition(var, value):
+    # Only str can be equal to str and only bool is identical to True or False.
+    if isinstance(value, bool) or value is None:
+        return '{var} is {val}'.format(var=var, val=repr(value))
+    if isinstance(value, (int, float)):
+        return '{var} == {val} and type({var}) is not bool'.format(var=var, val=repr(value))
+    if isinstance(value, dict):
+        return _dict_condition(var, value, 'type({var}) is dict', _json_value_condition)
+    if isinstance(value, (list, tuple)):
+        return _list_condition(var, value, 'type({var}) is list', _json_value_condition)
+    return '{var} == {val}'.format(var=var, val=repr(value))
+
+
+def _dict_condition(var, value, type_check, item_condition):
+    type_check = type_check.format(var=var)
+    if not value:
+        return '{} and not {}'.format(type_check, var)
+    key_checks = ' and '.join(
+        '{key!r} in {var} and {match}'.format(
+            key=key,
+            var=var,
+            match=item_condition('{var}[{key!r}]'.format(var=var, key=key), item),
+        )
+        for key, item in value.items()
+    )
+    return '{} and len({}) == {} and {}'.format(type_check, var, len(value), key_checks)
+
+
+def _list_condition(var, value, type_check, item_condition):
+    type_check = type_check.format(var=var)
+    if not value:
+        return '{} and not {}'.format(type_check, var)
+    item_checks = ' and '.join(
+        item_condition('{var}[{index}]'.format(var=var, index=index), item)
+        for index, item in enumerate(value)
+    )
+    return '{} and len({}) == {} and {}'.format(type_check, var, len(value), item_checks)
+
+
+def integer_modulo_code(multiple_of):
+    """
+    Returns code of expression (with ``{}`` for integer) which is zero only when
+    the integer is multiple of ``multiple_of`` (float) in its decimal form.
+    """
+    multiple_of = decimal.Decimal(repr(multiple_of))
+    _, digits, exponent = multiple_of.as_tuple()
+    if exponent >= 0:
+        # Not int(float), for example int(1e23) is 99999999999999991611392.
+        return '{{}} % {}'.format(int(multiple_of))
+    return '{{}} * {} % {}'.format(10 ** -exponent, int(''.join(map(str, digits))))
+
+
+def find_discriminator(values_of_definitions):
+    """
+    Returns name of property with mapping of its values to indexes of definitions,
+    such that each value belongs to only one definition. ``values_of_definitions``
+    are results of :any:`discriminator_values` for each definition. Returns ``None``
+    if there is no such property.
+    """
+    if len(values_of_definitions) < 2:
+        return None
+    for key in values_of_definitions[0]:
+        mapping = {}
+        for index, values_of_definition in enumerate(values_of_definitions):
+            values = values_of_definition.get(key)
+            if not values or any(value in mapping for value in values):
+                break
+            mapping.update((value, index) for value in values)
+        else:
+            return key, mapping
+    return None
+
+
+def discriminator_values(definition, use_const=True):
+    """
+    Returns mapping of properties of ``definition`` (without ``$ref``) which has
+    to be present and has to be one of the string values. Pass ``use_const`` as
+    ``False`` for draft-04 which does not know keyword ``const``.
+    """
+    if not isinstance(definition, dict) or definition.get('type') not in ('object', ['object']):
+        return {}
+    properties = definition.get('properties')
+    required = definition.get('required')
+    if not isinstance(properties, dict) or not isinstance(required, list):
+        return {}
+    result = {}
+    for key in required:
+        property_definition = properties.get(key)
+        if not isinstance(property_definition, dict) or '$ref' in property_definition:
+            continue
+        if 'const' in property_definition and use_const:
+            values = [property_definition['const']]
+        elif isinstance(property_definition.get('enum'), list):
+            values = property_definition['enum']
+        else:
+            continue
+        if values and all(isinstance(value, str) for value in values):
+            result[key] = values
+    return result
+
+
+def bulk_items_checks(items_definition, exclusive_bounds_are_flags=False):  # pylint: disable=too-many-return-statements
+    """
+    Returns checks of simple definition of scalar items (only type, bounds, length,
+    enum or pattern) which can be done for all items at once as tuple of types,
+    bounds and lengths (both as tuples of function ``min`` or ``max``, operator
+    and value), enum and pattern. Returns ``None`` for other definitions.
+    """
+    if not isinstance(items_definition, dict) or 'type' not in items_definition:
+        return None
+    if not items_definition.keys() <= BULK_ITEMS_KEYWORDS:
+        return None
+    types = set(enforce_list(items_definition['type']))
+    if not types or not types <= BULK_ITEMS_TYPES:
+        return None
+    is_number = types <= {'number', 'integer'}
+    is_string = types == {'string'}
+    bounds = _bulk_items_bounds(items_definition, exclusive_bounds_are_flags)
+    lengths = [
+        (func, operator, items_definition[keyword])
+        for keyword, func, operator in (('minLength', 'min', '>='), ('maxLength', 'max', '<='))
+        if keyword in items_definition
+    ]
+    enum = items_definition.get('enum')
+    pattern = items_definition.get('pattern')
+    if bounds is None or (bounds and not is_number):
+        return None
+    if lengths and (not is_string or not all(isinstance(length, int) for _, _, length in lengths)):
+        return None
+    if enum is not None and not (
+        isinstance(enum, (list, tuple)) and (
+            (is_string and all(isinstance(value, str) for value in enum))
+            or (is_number and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in enum))
+        )
+    ):
+        return None
+    if pattern is not None and (not is_string or not isinstance(pattern, str)):
+        return None
+    return types, bounds, lengths, enum, pattern
+
+
+def _bulk_items_bounds(items_definition, exclusive_bounds_are_flags):
+    """
+    Returns list of bounds of numbers as tuples of function (``min`` or ``max``),
+    operator and value, or ``None`` when some bound is not a number.
+    """
+    if exclusive_bounds_are_flags:
+        # Before draft 06 exclusive bounds are only flags of minimum and maximum.
+        keywords = (
+            ('minimum', 'min', '>' if items_definition.get('exclusiveMinimum', False) else '>='),
+            ('maximum', 'max', '<' if items_definition.get('exclusiveMaximum', False) else '<='),
+        )
+    else:
+        keywords = (
+            ('minimum', 'min', '>='),
+            ('exclusiveMinimum', 'min', '>'),
+            ('maximum', 'max', '<='),
+            ('exclusiveMaximum', 'max', '<'),
+        )
+    bounds = []
+    for keyword, func, operator in keywords:
+        if keyword in items_definition:
+            value = items_definition[keyword]
+            if not isinstance(value, (int, float, decimal.Decimal)) or isinstance(value, bool):
+                return None
+            bounds.append((func, operator, value))
+    return bounds
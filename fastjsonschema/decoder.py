@@ -0,0 +1,93 @@
+"""
+Decoding of raw JSON documents (for example HTTP body) right before validation.
+
+When ``orjson`` is installed, it is used for decoding as it is several times
+faster than the standard library. Otherwise :mod:`json` is used.
+"""
+
+import re
+
+from .exceptions import JsonSchemaValueException
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+
+# Strings are matched as a whole so brackets inside of them are not counted.
+BYTES_DEPTH_TOKENS = re.compile(rb'"(?:[^"\\]|\\.)*"|([\[{])|([\]}])', re.S)
+STR_DEPTH_TOKENS = re.compile(r'"(?:[^"\\]|\\.)*"|([\[{])|([\]}])', re.S)
+
+
+def decode(buf, max_size=None, max_depth=None):
+    """
+    Decodes JSON document passed as ``bytes`` (or ``bytearray``, ``memoryview``
+    or ``str``) and returns Python object.
+
+    Limits are checked before the document is decoded, so too big or too deeply
+    nested documents do not waste any time or memory. ``max_size`` is in bytes
+    (in characters for ``str``) and ``max_depth`` is the maximum number of nested
+    arrays and objects. Neither is limited by default. Checking ``max_depth`` walks
+    through the whole document in Python, so it is several times slower than decoding
+    itself. Without it the nesting is limited only by the decoder, for example
+    :mod:`json` stops at recursion limit which is reported as invalid JSON.
+
+    Exception :any:`JsonSchemaValueException` is raised when any limit is reached
+    or when ``buf`` is not a valid JSON document.
+    """
+    if isinstance(buf, memoryview):
+        buf = buf.tobytes()
+    if max_size is not None and len(buf) > max_size:
+        raise JsonSchemaValueException(
+            'data must be shorter than or equal to {} bytes'.format(max_size),
+            name='data',
+        )
+    if max_depth is not None and _is_too_deep(buf, max_depth):
+        raise JsonSchemaValueException(
+            'data must be nested less than or equal to {} levels'.format(max_depth),
+            name='data',
+        )
+    try:
+        return loads(buf)
+    except (ValueError, TypeError, RecursionError) as exc:
+        raise JsonSchemaValueException('data must be valid JSON', name='data') from exc
+
+
+def _is_too_deep(buf, max_depth):
+    if isinstance(buf, str):
+        open_brackets, tokens = ('[', '{'), STR_DEPTH_TOKENS
+    else:
+        open_brackets, tokens = (b'[', b'{'), BYTES_DEPTH_TOKENS
+    # Cheap check first: document cannot be nested more than it has brackets.
+    if buf.count(open_brackets[0]) + buf.count(open_brackets[1]) <= max_depth:
+        return False
+    depth = 0
+    for match in tokens.finditer(buf):
+        if match.lastindex == 1:
+            depth += 1
+            if depth > max_depth:
+                return True
+        elif match.lastindex == 2:
+            depth -= 1
+    return False
+
+
+def make_validate_bytes(func, return_bool=False):
+    """
+    Returns function decoding raw JSON document and validating it by ``func``
+    generated by :any:`compile`. Available as ``validate_bytes`` property of it.
+    With ``return_bool`` documents which cannot be decoded return ``False`` as
+    any other invalid data.
+    """
+    def validate_bytes(buf, max_size=None, max_depth=None):
+        return func(decode(buf, max_size, max_depth))
+
+    def validate_bytes_bool(buf, max_size=None, max_depth=None):
+        try:
+            data = decode(buf, max_size, max_depth)
+        except JsonSchemaValueException:
+            return False
+        return func(data)
+
+    return validate_bytes_bool if return_bool else validate_bytes
@@ -1,8 +1,15 @@
 import decimal
 import re
 
+from .cache import PatternsCache
+from .canonical import canonical, depth, has_unique_items, has_unique_scalars
+from .conditions import (
+    bulk_items_checks, checked_types, discriminator_values, find_discriminator, integer_modulo_code,
+    type_condition, value_condition,
+)
 from .exceptions import JsonSchemaDefinitionException
 from .generator import CodeGenerator, enforce_list
+from .patterns import pattern_to_condition
 
 
 JSON_TYPE_TO_PYTHON_TYPE = {
@@ -15,6 +22,41 @@ JSON_TYPE_TO_PYTHON_TYPE = {
     'object': 'dict',
 }
 
+# Data from JSON decoder can contain only these exact types (see `json_input`).
+JSON_TYPE_TO_EXACT_PYTHON_TYPES = {
+    'null': ('NoneType',),
+    'boolean': ('bool',),
+    'number': ('int', 'float'),
+    'integer': ('int',),
+    'string': ('str',),
+    'array': ('list',),
+    'object': ('dict',),
+}
+
+# Types used to guard keywords applicable only to some type (such as minLength for strings).
+TYPE_GUARDS = {
+    'string': 'str',
+    'number': '(int, float, Decimal)',
+    'array': '(list, tuple)',
+    'object': 'dict',
+}
+
+# Keywords applicable only to data of one type. All keywords for the same type are
+# generated together under one check of the type, see `run_generate_functions`.
+KEYWORDS_TYPES = {
+    keyword: json_type
+    for json_type, keywords in (
+        ('string', ('minLength', 'maxLength', 'pattern', 'format')),
+        ('number', ('minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum', 'multipleOf')),
+        ('array', ('minItems', 'maxItems', 'uniqueItems', 'items', 'contains')),
+        ('object', (
+            'minProperties', 'maxProperties', 'required', 'dependencies', 'properties', 'patternProperties',
+            'additionalProperties', 'propertyNames',
+        )),
+    )
+    for keyword in keywords
+}
+
 DOLLAR_FINDER = re.compile(r"(?<!\\)\$")  # Finds any un-escaped $ (including inside []-sets)
 
 
@@ -30,12 +72,12 @@ class CodeGeneratorDraft04(CodeGenerator):
         'email': r'^(?!.*\.\..*@)[^@.][^@]*(?<!\.)@[^@]+\.[^@]+\Z',
         'hostname': r'^(([a-zA-Z0-9]|[a-zA-Z0-9][a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])\.)*([A-Za-z0-9]|[A-Za-z0-9][A-Za-z0-9\-]{0,61}[A-Za-z0-9])\Z',
         'ipv4': r'^((25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])\.){3}(25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])\Z',
-        'ipv6': r'^(?:(?:[0-9A-Fa-f]{1,4}:){6}(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|::(?:[0-9A-Fa-f]{1,4}:){5}(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:[0-9A-Fa-f]{1,4})?::(?:[0-9A-Fa-f]{1,4}:){4}(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4})?::(?:[0-9A-Fa-f]{1,4}:){3}(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:(?:[0-9A-Fa-f]{1,4}:){,2}[0-9A-Fa-f]{1,4})?::(?:[0-9A-Fa-f]{1,4}:){2}(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:(?:[0-9A-Fa-f]{1,4}:){,3}[0-9A-Fa-f]{1,4})?::[0-9A-Fa-f]{1,4}:(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:(?:[0-9A-Fa-f]{1,4}:){,4}[0-9A-Fa-f]{1,4})?::(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:(?:[0-9A-Fa-f]{1,4}:){,5}[0-9A-Fa-f]{1,4})?::[0-9A-Fa-f]{1,4}|(?:(?:[0-9A-Fa-f]{1,4}:){,6}[0-9A-Fa-f]{1,4})?::)\Z',
+        'ipv6': r'^(?:(?:[0-9A-Fa-f]{1,4}:){6}(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|::(?:[0-9A-Fa-f]{1,4}:){5}(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:[0-9A-Fa-f]{1,4})?::(?:[0-9A-Fa-f]{1,4}:){4}(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:(?:[0-9A-Fa-f]{1,4}:)?[0-9A-Fa-f]{1,4})?::(?:[0-9A-Fa-f]{1,4}:){3}(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:(?:[0-9A-Fa-f]{1,4}:){,2}[0-9A-Fa-f]{1,4})?::(?:[0-9A-Fa-f]{1,4}:){2}(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:(?:[0-9A-Fa-f]{1,4}:){,3}[0-9A-Fa-f]{1,4})?::[0-9A-Fa-f]{1,4}:(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:(?:[0-9A-Fa-f]{1,4}:){,4}[0-9A-Fa-f]{1,4})?::(?:[0-9A-Fa-f]{1,4}:[0-9A-Fa-f]{1,4}|(?:(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}(?:[0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5]))|(?:(?:[0-9A-Fa-f]{1,4}:){,5}[0-9A-Fa-f]{1,4})?::[0-9A-Fa-f]{1,4}|(?:(?:[0-9A-Fa-f]{1,4}:){,6}[0-9A-Fa-f]{1,4})?::)\Z',
         'uri': r'^\w+:(\/?\/?)[^\s]+\Z',
     }
 
-    def __init__(self, definition, resolver=None, formats={}, use_default=True, use_formats=True, detailed_exceptions=True, fast_fail=True):
-        super().__init__(definition, resolver, detailed_exceptions, fast_fail)
+    def __init__(self, definition, resolver=None, formats={}, use_default=True, use_formats=True, detailed_exceptions=True, fast_fail=True, return_bool=False, json_input=False, key_cache_size=None):
+        super().__init__(definition, resolver, detailed_exceptions, fast_fail, return_bool, json_input, key_cache_size)
         self._custom_formats = formats
         self._use_formats = use_formats
         self._use_default = use_default
@@ -74,6 +116,74 @@ class CodeGeneratorDraft04(CodeGenerator):
         res['custom_formats'] = self._custom_formats
         return res
 
+    def run_generate_functions(self, definition):
+        """
+        Returns the number of generate functions that were executed.
+
+        Keywords applicable only to some type of data are not generated one by one
+        each with its own check of type. Instead, they are grouped by the type and
+        generated as one switch, so every value is checked for its type only once:
+
+        .. code-block:: python
+
+            if isinstance(data, str):
+                # minLength, pattern, ...
+            elif isinstance(data, (int, float, Decimal)):
+                # minimum, multipleOf, ...
+
+        The switch is placed where the first keyword applicable to some type would be.
+        When data already passed keyword ``type``, only branches of allowed types are
+        generated and the only one is generated without any check.
+        """
+        count = 0
+        typed_funcs = {}
+        funcs_after_switch = []
+        for key, func in self.keyword_functions(definition):
+            count += 1
+            if key in KEYWORDS_TYPES:
+                typed_funcs.setdefault(KEYWORDS_TYPES[key], []).append(func)
+            elif typed_funcs:
+                funcs_after_switch.append(func)
+            else:
+                func()
+        if typed_funcs:
+            # Invalid type stops validation unless errors are only collected.
+            stops = 'type' in definition and (self._fast_fail or self._is_valid_function)
+            self.generate_type_switch(typed_funcs, checked_types(definition['type']) if stops else None)
+        for func in funcs_after_switch:
+            func()
+        return count
+
+    def generate_type_switch(self, typed_funcs, allowed_types=None):
+        """
+        Generates ``if-elif`` switch by type where each branch contains code generated
+        by passed functions for that type (mapping from JSON type to list of functions).
+        Branches of types other than ``allowed_types`` are not generated, and when
+        only one type is possible, its code is generated without the switch.
+        """
+        if allowed_types is not None:
+            typed_funcs = {json_type: funcs for json_type, funcs in typed_funcs.items() if json_type in allowed_types}
+            if len(allowed_types) == 1 and typed_funcs:
+                for func in typed_funcs[next(iter(allowed_types))]:
+                    func()
+                return
+        # All guards are prepared first as they can create variables used by them.
+        guards = [(self.type_guard(json_type), funcs) for json_type, funcs in typed_funcs.items()]
+        statement = 'if'
+        for guard, funcs in guards:
+            variables_count = len(self._variables)
+            with self.l('{} {}:', statement, guard, optimize=False) as guard_block:
+                for func in funcs:
+                    func()
+            # Variables created in one branch are not available in other ones.
+            while len(self._variables) > variables_count:
+                self._variables.popitem()
+            # Nothing to check for this type.
+            if guard_block.is_empty():
+                self._code.pop()
+            else:
+                statement = 'elif'
+
     def generate_type(self):
         """
         Validation of type. Can be one type or list of types.
@@ -89,6 +199,11 @@ class CodeGeneratorDraft04(CodeGenerator):
         except KeyError as exc:
             raise JsonSchemaDefinitionException('Unknown type') from exc
 
+        if self._json_input:
+            with self.l('if not ({}):', self.exact_type_check(types)):
+                self.exc('{name} must be {}', ' or '.join(types), rule='type')
+            return
+
         extra = ''
         if ('number' in types or 'integer' in types) and 'boolean' not in types:
             extra = ' or isinstance({variable}, bool)'.format(variable=self._variable)
@@ -96,6 +211,37 @@ class CodeGeneratorDraft04(CodeGenerator):
         with self.l('if not isinstance({variable}, ({})){}:', python_types, extra):
             self.exc('{name} must be {}', ' or '.join(types), rule='type')
 
+    def exact_type_check(self, types):
+        """
+        Returns condition whether ``{variable}`` is of any of JSON ``types`` using
+        exact types of data from JSON decoder. Used only with ``json_input``.
+        """
+        return ' or '.join(self._exact_type_conditions(types))
+
+    def _exact_type_conditions(self, types):
+        conditions = []
+        if 'null' in types:
+            conditions.append('{} is None'.format(self._variable))
+        python_types = [
+            python_type
+            for json_type in types if json_type != 'null'
+            for python_type in JSON_TYPE_TO_EXACT_PYTHON_TYPES[json_type]
+        ]
+        if python_types:
+            self.create_variable_type()
+        for python_type in dict.fromkeys(python_types):
+            conditions.append('{}_type is {}'.format(self._variable, python_type))
+        return conditions
+
+    def type_guard(self, json_type):
+        """
+        Returns condition whether ``{variable}`` is of ``json_type`` used to guard
+        keywords applicable only to that type (such as ``minLength`` to strings).
+        """
+        if self._json_input:
+            return self.exact_type_check([json_type])
+        return 'isinstance({}, {})'.format(self._variable, TYPE_GUARDS[json_type])
+
     def generate_enum(self):
         """
         Means that only value specified in the enum is valid.
@@ -109,7 +255,7 @@ class CodeGeneratorDraft04(CodeGenerator):
         enum = self._definition['enum']
         if not isinstance(enum, (list, tuple)):
             raise JsonSchemaDefinitionException('enum must be an array')
-        matches = ' or '.join(self._enum_value_matches(self._variable, value) for value in enum)
+        matches = self._enum_matches(self._variable, enum)
         if matches:
             with self.l('if not ({}):', matches):
                 self.exc('{name} must be one of {}', self.e(enum), rule='enum')
@@ -117,42 +263,44 @@ class CodeGeneratorDraft04(CodeGenerator):
             with self.l('if True:'):
                 self.exc('{name} must be one of {}', self.e(enum), rule='enum')
 
-    def _enum_value_matches(self, var, value):
-        if isinstance(value, bool):
-            return 'isinstance({var}, bool) and {var} is {val}'.format(var=var, val=repr(value))
-        if isinstance(value, (int, float)) and not isinstance(value, bool):
-            return (
-                'isinstance({var}, (int, float)) and not isinstance({var}, bool) and {var} == {val}'
-            ).format(var=var, val=repr(value))
-        if value is None:
-            return '{var} is None'.format(var=var)
-        if isinstance(value, str):
-            return 'isinstance({var}, str) and {var} == {val}'.format(var=var, val=repr(value))
-        if isinstance(value, dict):
-            if not value:
-                return 'isinstance({var}, dict) and not {var}'.format(var=var)
-            key_checks = ' and '.join(
-                '{key!r} in {var} and {match}'.format(
-                    key=key,
-                    var=var,
-                    match=self._enum_value_matches('{var}[{key!r}]'.format(var=var, key=key), item),
-                )
-                for key, item in value.items()
-            )
-            return 'isinstance({var}, dict) and len({var}) == {size} and {checks}'.format(
-                var=var, size=len(value), checks=key_checks,
-            )
-        if isinstance(value, (list, tuple)):
-            if not value:
-                return 'isinstance({var}, (list, tuple)) and not {var}'.format(var=var)
-            item_checks = ' and '.join(
-                self._enum_value_matches('{var}[{index}]'.format(var=var, index=index), item)
-                for index, item in enumerate(value)
-            )
-            return 'isinstance({var}, (list, tuple)) and len({var}) == {size} and {checks}'.format(
-                var=var, size=len(value), checks=item_checks,
-            )
-        return '{var} == {val}'.format(var=var, val=repr(value))
+    def _enum_matches(self, var, enum):
+        """
+        Returns condition whether ``var`` is one of ``enum`` values. Strings and numbers
+        are looked up in global frozensets (one per type, so for example ``1`` does not
+        match ``True`` nor ``'1'``) instead of comparing them one by one. Objects and
+        arrays are looked up by their canonical form (see :any:`canonical`), so the code
+        does not grow with their size. Other values are compared by :any:`value_condition`.
+        """
+        conditions = []
+        values_in_sets = set()
+        strings = [value for value in enum if isinstance(value, str)]
+        numbers = [value for value in enum if isinstance(value, (int, float)) and not isinstance(value, bool)]
+        for json_type, values in (('string', strings), ('number', numbers)):
+            if len(values) < 2:
+                continue
+            values_in_sets.update(id(value) for value in values)
+            frozenset_name = self.create_global_variable('enum', 'frozenset([{}])'.format(
+                ', '.join(repr(value) for value in dict.fromkeys(values)),
+            ))
+            conditions.append('{} and {} in {}'.format(type_condition(var, json_type, self._json_input), var, frozenset_name))
+
+        compounds = [value for value in enum if isinstance(value, (dict, list, tuple)) and value]
+        if compounds:
+            self.add_extra_import('from fastjsonschema.canonical import canonical', 'canonical', canonical)
+            values_in_sets.update(id(value) for value in compounds)
+            frozenset_name = self.create_global_variable('enum', 'frozenset([{}])'.format(
+                ', '.join('canonical({!r})'.format(value) for value in compounds),
+            ))
+            conditions.append('{} and canonical({}, {}) in {}'.format(
+                type_condition(var, 'compound', self._json_input), var, max(depth(value) for value in compounds), frozenset_name,
+            ))
+
+        conditions.extend(
+            value_condition(var, value, self._json_input)
+            for value in enum
+            if id(value) not in values_in_sets
+        )
+        return ' or '.join(conditions)
 
     def generate_all_of(self):
         """
@@ -189,18 +337,14 @@ class CodeGeneratorDraft04(CodeGenerator):
 
         Valid values for this definition are 3, 4, 5, 10, 11, ... but not 8 for example.
         """
-        self._any_or_one_of_count += 1
-        count = self._any_or_one_of_count
-        self.l('{variable}_any_of_count{count} = 0', count=count)
-        for definition_item in self._definition['anyOf']:
-            # When we know it's passing (at least once), we do not need to do another expensive try-except.
-            with self.l('if not {variable}_any_of_count{count}:', count=count, optimize=False):
-                with self.l('try:', optimize=False):
-                    self.generate_func_code_block(definition_item, self._variable, self._variable_name, clear_variables=True)
-                    self.l('{variable}_any_of_count{count} += 1', count=count)
-                self.l('except JsonSchemaValueException: pass')
-
-        with self.l('if not {variable}_any_of_count{count}:', count=count, optimize=False):
+        calls = self.generate_dispatch(self._definition['anyOf'])
+        if calls is None:
+            # When we know it's passing (at least once), we do not need to call the rest.
+            calls = ' or '.join(
+                '{}({}, custom_formats)'.format(self.generate_is_valid_function(definition_item), self._variable)
+                for definition_item in self._definition['anyOf']
+            )
+        with self.l('if not ({}):', calls or 'False', optimize=False):
             self.exc('{name} cannot be validated by any definition', rule='anyOf')
 
     def generate_one_of(self):
@@ -222,18 +366,75 @@ class CodeGeneratorDraft04(CodeGenerator):
         self._any_or_one_of_count += 1
         count = self._any_or_one_of_count
         self.l('{variable}_one_of_count{count} = 0', count=count)
-        for definition_item in self._definition['oneOf']:
-            # When we know it's failing (one of means exactly once), we do not need to do another expensive try-except.
-            with self.l('if {variable}_one_of_count{count} < 2:', count=count, optimize=False):
-                with self.l('try:', optimize=False):
-                    self.generate_func_code_block(definition_item, self._variable, self._variable_name, clear_variables=True)
+        call = self.generate_dispatch(self._definition['oneOf'])
+        if call is not None:
+            # Only one definition can match, the rest would fail anyway.
+            with self.l('if {}:', call, optimize=False):
+                self.l('{variable}_one_of_count{count} += 1', count=count)
+        else:
+            for index, definition_item in enumerate(self._definition['oneOf']):
+                name = self.generate_is_valid_function(definition_item)
+                # When we know it's failing (one of means exactly once), we do not need to call the rest.
+                condition = 'if {}({variable}, custom_formats):' if index == 0 else \
+                    'if {variable}_one_of_count{count} < 2 and {}({variable}, custom_formats):'
+                with self.l(condition, name, count=count, optimize=False):
                     self.l('{variable}_one_of_count{count} += 1', count=count)
-                self.l('except JsonSchemaValueException: pass')
 
         with self.l('if {variable}_one_of_count{count} != 1:', count=count):
             dynamic = '" (" + str({variable}_one_of_count{}) + " matches found)"'
             self.exc('{name} must be valid exactly by one definition', count, append_to_msg=dynamic, rule='oneOf')
 
+    def generate_dispatch(self, definitions):
+        """
+        Returns condition calling only one of ``definitions`` chosen by a value of
+        a discriminating property, or ``None`` when there is no such property.
+
+        .. code-block:: python
+
+            {
+                'oneOf': [
+                    {'type': 'object', 'properties': {'kind': {'const': 'a'}}, 'required': ['kind'], ...},
+                    {'type': 'object', 'properties': {'kind': {'enum': ['b', 'c']}}, 'required': ['kind'], ...},
+                ],
+            }
+
+        Every definition has to require an object with the same property having
+        string values (by ``const`` or ``enum``) not used by any other definition.
+        Then data can be valid at most by the definition owning the value and
+        others do not have to be tried. Mapping of values to validation functions
+        is generated as a global variable so the lookup is done in constant time.
+        """
+        discriminator = find_discriminator([self._discriminator_values(definition) for definition in definitions])
+        if discriminator is None:
+            return None
+        key, mapping = discriminator
+        names = [self.generate_is_valid_function(definition_item) for definition_item in definitions]
+
+        table = self.create_global_variable('dispatch', '{{{}}}'.format(', '.join(
+            '{}: {}'.format(repr(value), names[index]) for value, index in mapping.items()
+        )))
+
+        value = '{}[{}]'.format(self._variable, repr(key))
+        return '{guard} and isinstance({variable}.get({key}), str) and {value} in {table} and {table}[{value}]({variable}, custom_formats)'.format(
+            guard=self.type_guard('object'),
+            variable=self._variable,
+            key=repr(key),
+            value=value,
+            table=table,
+        )
+
+    def _discriminator_values(self, definition):
+        """
+        Returns :any:`discriminator_values` of ``definition`` or of definition
+        referenced by its ``$ref`` (only direct one, not chain of references).
+        """
+        if isinstance(definition, dict) and '$ref' in definition:
+            with self._resolver.resolving(definition['$ref']) as resolved_definition:
+                if isinstance(resolved_definition, dict) and '$ref' in resolved_definition:
+                    return {}
+                definition = resolved_definition
+        return discriminator_values(definition, 'const' in self._json_keywords_to_function)
+
     def generate_not(self):
         """
         Means that value have not to be valid by this definition.
@@ -255,39 +456,44 @@ class CodeGeneratorDraft04(CodeGenerator):
         elif not not_definition:
             self.exc('{name} must NOT match a disallowed definition', rule='not')
         else:
-            with self.l('try:', optimize=False):
-                code_len = len(self._code)
-                self.generate_func_code_block(not_definition, self._variable, self._variable_name, clear_variables=True)
-                if len(self._code) == code_len:
-                    self.l('pass')
-            self.l('except JsonSchemaValueException: pass')
-            with self.l('else:'):
+            name = self.generate_is_valid_function(not_definition)
+            with self.l('if {}({variable}, custom_formats):', name, optimize=False):
                 self.exc('{name} must NOT match a disallowed definition', rule='not')
 
     def generate_min_length(self):
-        with self.l('if isinstance({variable}, str):'):
-            self.create_variable_with_length()
-            if not isinstance(self._definition['minLength'], (int, float)):
-                raise JsonSchemaDefinitionException('minLength must be a number')
-            with self.l('if {variable}_len < {minLength}:'):
-                self.exc('{name} must be longer than or equal to {minLength} characters', rule='minLength')
+        self.create_variable_with_length()
+        if not isinstance(self._definition['minLength'], (int, float)):
+            raise JsonSchemaDefinitionException('minLength must be a number')
+        with self.l('if {variable}_len < {minLength}:'):
+            self.exc('{name} must be longer than or equal to {minLength} characters', rule='minLength')
 
     def generate_max_length(self):
-        with self.l('if isinstance({variable}, str):'):
-            self.create_variable_with_length()
-            if not isinstance(self._definition['maxLength'], (int, float)):
-                raise JsonSchemaDefinitionException('maxLength must be a number')
-            with self.l('if {variable}_len > {maxLength}:'):
-                self.exc('{name} must be shorter than or equal to {maxLength} characters', rule='maxLength')
+        self.create_variable_with_length()
+        if not isinstance(self._definition['maxLength'], (int, float)):
+            raise JsonSchemaDefinitionException('maxLength must be a number')
+        with self.l('if {variable}_len > {maxLength}:'):
+            self.exc('{name} must be shorter than or equal to {maxLength} characters', rule='maxLength')
 
     def generate_pattern(self):
-        with self.l('if isinstance({variable}, str):'):
-            pattern = self._definition['pattern']
-            safe_pattern = pattern.replace('\\', '\\\\').replace('"', '\\"')
+        """
+        Means that string has to match regular expression.
+
+        .. code-block:: python
+
+            {'pattern': '^[A-Z]{3}$'}
+
+        Simple patterns (such as prefixes or fixed set of characters) are validated
+        by string operations without regular expression, see :any:`pattern_to_condition`.
+        """
+        pattern = self._definition['pattern']
+        safe_pattern = pattern.replace('\\', '\\\\').replace('"', '\\"')
+        condition = pattern_to_condition(pattern, self._variable)
+        if condition is None:
             end_of_string_fixed_pattern = DOLLAR_FINDER.sub(r'\\Z', pattern)
             self._compile_regexps[pattern] = re.compile(end_of_string_fixed_pattern)
-            with self.l('if not REGEX_PATTERNS[{}].search({variable}):', repr(pattern)):
-                self.exc('{name} must match pattern {}', safe_pattern, rule='pattern')
+            condition = 'REGEX_PATTERNS[{}].search({})'.format(repr(pattern), self._variable)
+        with self.l('if not ({}):', condition):
+            self.exc('{name} must match pattern {}', safe_pattern, rule='pattern')
 
     def generate_format(self):
         """
@@ -304,25 +510,25 @@ class CodeGeneratorDraft04(CodeGenerator):
         format_ = self._definition['format']
         if format_ not in self._custom_formats and format_ not in self.FORMAT_REGEXS and format_ != 'regex':
             return
-        with self.l('if isinstance({variable}, str):'):
-            # Checking custom formats - user is allowed to override default formats.
-            if format_ in self._custom_formats:
-                custom_format = self._custom_formats[format_]
-                if isinstance(custom_format, str):
-                    self._generate_format(format_, format_ + '_re_pattern', custom_format)
-                else:
-                    with self.l('if not custom_formats["{}"]({variable}):', format_):
-                        self.exc('{name} must be {}', format_, rule='format')
-            elif format_ in self.FORMAT_REGEXS:
-                format_regex = self.FORMAT_REGEXS[format_]
-                self._generate_format(format_, format_ + '_re_pattern', format_regex)
-            # Format regex is used only in meta schemas.
-            elif format_ == 'regex':
-                self._extra_imports_lines = ['import re']
-                with self.l('try:', optimize=False):
-                    self.l('re.compile({variable})')
-                with self.l('except Exception:'):
-                    self.exc('{name} must be a valid regex', rule='format')
+        # Checking custom formats - user is allowed to override default formats.
+        if format_ in self._custom_formats:
+            custom_format = self._custom_formats[format_]
+            if isinstance(custom_format, str):
+                self._generate_format(format_, format_ + '_re_pattern', custom_format)
+            else:
+                with self.l('if not custom_formats["{}"]({variable}):', format_):
+                    self.exc('{name} must be {}', format_, rule='format')
+        elif format_ in self.FORMAT_REGEXS:
+            format_regex = self.FORMAT_REGEXS[format_]
+            self._generate_format(format_, format_ + '_re_pattern', format_regex)
+        # Format regex is used only in meta schemas.
+        elif format_ == 'regex':
+            if 'import re' not in self._extra_imports_lines:
+                self._extra_imports_lines.append('import re')
+            with self.l('try:', optimize=False):
+                self.l('re.compile({variable})')
+            with self.l('except Exception:'):
+                self.exc('{name} must be a valid regex', rule='format')
 
 
     def _generate_format(self, format_name, regexp_name, regexp):
@@ -333,60 +539,93 @@ class CodeGeneratorDraft04(CodeGenerator):
                 self.exc('{name} must be {}', format_name, rule='format')
 
     def generate_minimum(self):
-        with self.l('if isinstance({variable}, (int, float, Decimal)):'):
-            if not isinstance(self._definition['minimum'], (int, float, decimal.Decimal)):
-                raise JsonSchemaDefinitionException('minimum must be a number')
-            if self._definition.get('exclusiveMinimum', False):
-                with self.l('if {variable} <= {minimum}:'):
-                    self.exc('{name} must be bigger than {minimum}', rule='minimum')
-            else:
-                with self.l('if {variable} < {minimum}:'):
-                    self.exc('{name} must be bigger than or equal to {minimum}', rule='minimum')
+        if not isinstance(self._definition['minimum'], (int, float, decimal.Decimal)):
+            raise JsonSchemaDefinitionException('minimum must be a number')
+        if self._definition.get('exclusiveMinimum', False):
+            with self.l('if {variable} <= {minimum}:'):
+                self.exc('{name} must be bigger than {minimum}', rule='minimum')
+        else:
+            with self.l('if {variable} < {minimum}:'):
+                self.exc('{name} must be bigger than or equal to {minimum}', rule='minimum')
 
     def generate_maximum(self):
-        with self.l('if isinstance({variable}, (int, float, Decimal)):'):
-            if not isinstance(self._definition['maximum'], (int, float, decimal.Decimal)):
-                raise JsonSchemaDefinitionException('maximum must be a number')
-            if self._definition.get('exclusiveMaximum', False):
-                with self.l('if {variable} >= {maximum}:'):
-                    self.exc('{name} must be smaller than {maximum}', rule='maximum')
-            else:
-                with self.l('if {variable} > {maximum}:'):
-                    self.exc('{name} must be smaller than or equal to {maximum}', rule='maximum')
+        if not isinstance(self._definition['maximum'], (int, float, decimal.Decimal)):
+            raise JsonSchemaDefinitionException('maximum must be a number')
+        if self._definition.get('exclusiveMaximum', False):
+            with self.l('if {variable} >= {maximum}:'):
+                self.exc('{name} must be smaller than {maximum}', rule='maximum')
+        else:
+            with self.l('if {variable} > {maximum}:'):
+                self.exc('{name} must be smaller than or equal to {maximum}', rule='maximum')
 
     def generate_multiple_of(self):
-        with self.l('if isinstance({variable}, (int, float, Decimal)):'):
-            if not isinstance(self._definition['multipleOf'], (int, float, decimal.Decimal)):
-                raise JsonSchemaDefinitionException('multipleOf must be a number')
-            # For proper multiplication check of floats we need to use decimals,
-            # because for example 19.01 / 0.01 = 1901.0000000000002.
-            if isinstance(self._definition['multipleOf'], float):
-                self.l('quotient = Decimal(repr({variable})) / Decimal(repr({multipleOf}))')
-            else:
-                self.l('quotient = {variable} / {multipleOf}')
-            with self.l('if int(quotient) != quotient:'):
-                self.exc('{name} must be multiple of {multipleOf}', rule='multipleOf')
-            # For example, 1e308 / 0.123456789
-            with self.l('if {variable} / {multipleOf} == float("inf"):'):
-                self.exc('inifinity reached', rule='multipleOf')
+        """
+        Integers are checked by exact modulo. Multiple of float such as ``0.01``
+        is its decimal form ``1 * 10 ** -2``, so integer is its multiple when the
+        integer multiplied by ``10 ** 2`` is multiple of ``1``. Floats with integer
+        value (up to 2 ** 53 where all integers are represented exactly) are checked
+        the same way. Decimals are needed only for other floats.
+        """
+        multiple_of = self._definition['multipleOf']
+        if not isinstance(multiple_of, (int, float, decimal.Decimal)):
+            raise JsonSchemaDefinitionException('multipleOf must be a number')
+        if isinstance(multiple_of, int) and not isinstance(multiple_of, bool) and multiple_of > 0:
+            with self.l('if {}:', self._python_type_check('int')):
+                with self.l('if {variable} % {multipleOf}:'):
+                    self.exc('{name} must be multiple of {multipleOf}', rule='multipleOf')
+            with self.l('else:'):
+                self._generate_multiple_of_by_division()
+        elif isinstance(multiple_of, float) and multiple_of > 0:
+            modulo = integer_modulo_code(multiple_of)
+            with self.l('if {}:', self._python_type_check('int')):
+                with self.l('if {}:', modulo.format(self._variable)):
+                    self.exc('{name} must be multiple of {multipleOf}', rule='multipleOf')
+            with self.l(
+                'elif {} and {variable}.is_integer() and -9007199254740992.0 <= {variable} <= 9007199254740992.0:',
+                self._python_type_check('float'),
+            ):
+                with self.l('if {}:', modulo.format('int({})'.format(self._variable))):
+                    self.exc('{name} must be multiple of {multipleOf}', rule='multipleOf')
+            with self.l('else:'):
+                self._generate_multiple_of_by_division()
+        else:
+            self._generate_multiple_of_by_division()
+
+    def _python_type_check(self, python_type):
+        if self._json_input:
+            self.create_variable_type()
+            return '{}_type is {}'.format(self._variable, python_type)
+        return 'isinstance({}, {})'.format(self._variable, python_type)
+
+    def _generate_multiple_of_by_division(self):
+        # For proper multiplication check of floats we need to use decimals,
+        # because for example 19.01 / 0.01 = 1901.0000000000002.
+        if isinstance(self._definition['multipleOf'], float):
+            multiple_of = self.create_global_variable('multiple_of', 'Decimal({!r})'.format(
+                repr(self._definition['multipleOf']),
+            ))
+            self.l('quotient = Decimal(repr({variable})) / {}', multiple_of)
+        else:
+            self.l('quotient = {variable} / {multipleOf}')
+        with self.l('if int(quotient) != quotient:'):
+            self.exc('{name} must be multiple of {multipleOf}', rule='multipleOf')
+        # For example, 1e308 / 0.123456789
+        with self.l('if {variable} / {multipleOf} == float("inf"):'):
+            self.exc('inifinity reached', rule='multipleOf')
 
     def generate_min_items(self):
-        self.create_variable_is_list()
-        with self.l('if {variable}_is_list:'):
-            if not isinstance(self._definition['minItems'], (int, float)):
-                raise JsonSchemaDefinitionException('minItems must be a number')
-            self.create_variable_with_length()
-            with self.l('if {variable}_len < {minItems}:'):
-                self.exc('{name} must contain at least {minItems} items', rule='minItems')
+        if not isinstance(self._definition['minItems'], (int, float)):
+            raise JsonSchemaDefinitionException('minItems must be a number')
+        self.create_variable_with_length()
+        with self.l('if {variable}_len < {minItems}:'):
+            self.exc('{name} must contain at least {minItems} items', rule='minItems')
 
     def generate_max_items(self):
-        self.create_variable_is_list()
-        with self.l('if {variable}_is_list:'):
-            if not isinstance(self._definition['maxItems'], (int, float)):
-                raise JsonSchemaDefinitionException('maxItems must be a number')
-            self.create_variable_with_length()
-            with self.l('if {variable}_len > {maxItems}:'):
-                self.exc('{name} must contain less than or equal to {maxItems} items', rule='maxItems')
+        if not isinstance(self._definition['maxItems'], (int, float)):
+            raise JsonSchemaDefinitionException('maxItems must be a number')
+        self.create_variable_with_length()
+        with self.l('if {variable}_len > {maxItems}:'):
+            self.exc('{name} must contain less than or equal to {maxItems} items', rule='maxItems')
 
     def generate_unique_items(self):
         """
@@ -402,24 +641,30 @@ class CodeGeneratorDraft04(CodeGenerator):
             2.0819358825683594
             >>> timeit.timeit("np.unique(x).size == len(x)", "x=range(100)+range(100); import numpy as np", number=100000)
             2.1439831256866455
+
+        Items are compared by :any:`has_unique_items` which puts them into a set as
+        they are and canonicalizes them only when needed. When definition of items
+        allows only strings, numbers or null, :any:`has_unique_scalars` is used
+        instead which never needs to canonicalize valid items. It is generated by
+        :any:`generate_items` after items are validated, so invalid items (such as
+        ``True`` among numbers) are reported as invalid and not as duplicates.
         """
         unique_definition = self._definition['uniqueItems']
-        if not unique_definition:
+        if not unique_definition or self._has_scalar_items():
             return
+        self._generate_unique_items_check(has_unique_items)
 
-        self.create_variable_is_list()
-        with self.l('if {variable}_is_list:'):
-            self.l(
-                'def fn(var): '
-                'return frozenset(dict((k, fn(v)) '
-                'for k, v in var.items()).items()) '
-                'if hasattr(var, "items") else tuple(fn(v) '
-                'for v in var) '
-                'if isinstance(var, (dict, list)) else str(var) '
-                'if isinstance(var, bool) else var')
-            self.create_variable_with_length()
-            with self.l('if {variable}_len > len(set(fn({variable}_x) for {variable}_x in {variable})):'):
-                self.exc('{name} must contain unique items', rule='uniqueItems')
+    def _generate_unique_items_check(self, func):
+        self.add_extra_import('from fastjsonschema.canonical import {}'.format(func.__name__), func.__name__, func)
+        with self.l('if not {}({variable}):', func.__name__):
+            self.exc('{name} must contain unique items', rule='uniqueItems')
+
+    def _has_scalar_items(self):
+        items = self._definition.get('items')
+        if not isinstance(items, dict) or 'type' not in items or '$ref' in items:  # Type next to $ref is ignored.
+            return False
+        types = set(enforce_list(items['type']))
+        return types <= {'string', 'number', 'integer', 'null'} or types <= {'string', 'boolean', 'null'}
 
     def generate_items(self):
         """
@@ -443,89 +688,117 @@ class CodeGeneratorDraft04(CodeGenerator):
         if items_definition is True:
             return
 
-        self.create_variable_is_list()
-        with self.l('if {variable}_is_list:'):
-            self.create_variable_with_length()
-            if items_definition is False:
-                with self.l('if {variable}:'):
-                    self.exc('{name} must not be there', rule='items')
-            elif isinstance(items_definition, list):
-                for idx, item_definition in enumerate(items_definition):
-                    with self.l('if {variable}_len > {}:', idx):
-                        self.l('{variable}__{0} = {variable}[{0}]', idx)
-                        self.generate_func_code_block(
-                            item_definition,
-                            '{}__{}'.format(self._variable, idx),
-                            '{}[{}]'.format(self._variable_name, idx),
-                        )
-                    if self._use_default and isinstance(item_definition, dict) and 'default' in item_definition:
-                        self.l('else: {variable}.append({})', repr(item_definition['default']))
-
-                if 'additionalItems' in self._definition:
-                    if self._definition['additionalItems'] is False:
-                        with self.l('if {variable}_len > {}:', len(items_definition)):
-                            self.exc('{name} must contain only specified items', rule='items')
-                    else:
-                        with self.l('for {variable}_x, {variable}_item in enumerate({variable}[{0}:], {0}):', len(items_definition)):
-                            code_len = len(self._code)
-                            self.generate_func_code_block(
-                                self._definition['additionalItems'],
-                                '{}_item'.format(self._variable),
-                                '{}[{{{}_x}}]'.format(self._variable_name, self._variable),
-                            )
-                            if len(self._code) == code_len:
-                                self.l('pass')
-            else:
-                if items_definition:
-                    with self.l('for {variable}_x, {variable}_item in enumerate({variable}):'):
-                        code_len = len(self._code)
+        self.create_variable_with_length()
+        if items_definition is False:
+            with self.l('if {variable}:'):
+                self.exc('{name} must not be there', rule='items')
+        elif isinstance(items_definition, list):
+            for idx, item_definition in enumerate(items_definition):
+                with self.l('if {variable}_len > {}:', idx):
+                    self.l('{variable}__{0} = {variable}[{0}]', idx)
+                    self.generate_func_code_block(
+                        item_definition,
+                        '{}__{}'.format(self._variable, idx),
+                        '{}[{}]'.format(self._variable_name, idx),
+                    )
+                if self._use_default and isinstance(item_definition, dict) and 'default' in item_definition:
+                    self.l('else: {variable}.append({})', repr(item_definition['default']))
+
+            if 'additionalItems' in self._definition:
+                if self._definition['additionalItems'] is False:
+                    with self.l('if {variable}_len > {}:', len(items_definition)):
+                        self.exc('{name} must contain only specified items', rule='items')
+                else:
+                    with self.l('for {variable}_x, {variable}_item in enumerate({variable}[{0}:], {0}):', len(items_definition)):
                         self.generate_func_code_block(
-                            items_definition,
+                            self._definition['additionalItems'],
                             '{}_item'.format(self._variable),
                             '{}[{{{}_x}}]'.format(self._variable_name, self._variable),
                         )
-                        if len(self._code) == code_len:
-                            self.l('pass')
+        elif items_definition:
+            bulk_condition = self._bulk_items_condition(items_definition)
+            if bulk_condition:
+                # Items are checked one by one only to find which one is invalid.
+                with self.l('if not ({}):', bulk_condition):
+                    self._generate_items_loop(items_definition)
+            else:
+                self._generate_items_loop(items_definition)
+            if self._definition.get('uniqueItems') and self._has_scalar_items():
+                self._generate_unique_items_check(has_unique_scalars)
+
+    def _generate_items_loop(self, items_definition):
+        with self.l('for {variable}_x, {variable}_item in enumerate({variable}):'):
+            self.generate_func_code_block(
+                items_definition,
+                '{}_item'.format(self._variable),
+                '{}[{{{}_x}}]'.format(self._variable_name, self._variable),
+            )
+
+    def _bulk_items_condition(self, items_definition):
+        """
+        Returns condition which is true only when all items are valid by simple
+        definition of scalar items (see :any:`bulk_items_checks`), checked by builtin
+        functions such as ``min`` or ``map`` instead of loop in Python. Exact types
+        are checked so other types (such as ``bool`` which is not a number) fall
+        to the loop. Returns ``None`` for other definitions.
+        """
+        checks = bulk_items_checks(items_definition, 'exclusiveMinimum' not in self._json_keywords_to_function)
+        if checks is None:
+            return None
+        types, bounds, lengths, enum, pattern = checks
+
+        # Decimals are not included as they raise when compared with NaN by min or max.
+        python_types = {python_type for json_type in types for python_type in JSON_TYPE_TO_EXACT_PYTHON_TYPES[json_type]}
+        types_name = self.create_global_variable('item_types', 'frozenset(({},))'.format(
+            ', '.join(sorted(python_types)),
+        ))
+        conditions = [self._variable, '{}.issuperset(map(type, {}))'.format(types_name, self._variable)]
+        for func, operator, value in bounds:
+            conditions.append('{}({}) {} {!r}'.format(func, self._variable, operator, value))
+        for func, operator, value in lengths:
+            conditions.append('{}(map(len, {})) {} {}'.format(func, self._variable, operator, value))
+        if enum is not None:
+            enum_name = self.create_global_variable('enum', 'frozenset({!r})'.format(list(enum)))
+            conditions.append('{}.issuperset({})'.format(enum_name, self._variable))
+        if pattern is not None:
+            self._compile_regexps[pattern] = re.compile(DOLLAR_FINDER.sub(r'\\Z', pattern))
+            conditions.append('all(map(REGEX_PATTERNS[{!r}].search, {}))'.format(pattern, self._variable))
+        return ' and '.join(conditions)
 
     def generate_min_properties(self):
-        self.create_variable_is_dict()
-        with self.l('if {variable}_is_dict:'):
-            if not isinstance(self._definition['minProperties'], (int, float)):
-                raise JsonSchemaDefinitionException('minProperties must be a number')
-            self.create_variable_with_length()
-            with self.l('if {variable}_len < {minProperties}:'):
-                self.exc('{name} must contain at least {minProperties} properties', rule='minProperties')
+        if not isinstance(self._definition['minProperties'], (int, float)):
+            raise JsonSchemaDefinitionException('minProperties must be a number')
+        self.create_variable_with_length()
+        with self.l('if {variable}_len < {minProperties}:'):
+            self.exc('{name} must contain at least {minProperties} properties', rule='minProperties')
 
     def generate_max_properties(self):
-        self.create_variable_is_dict()
-        with self.l('if {variable}_is_dict:'):
-            if not isinstance(self._definition['maxProperties'], (int, float)):
-                raise JsonSchemaDefinitionException('maxProperties must be a number')
-            self.create_variable_with_length()
-            with self.l('if {variable}_len > {maxProperties}:'):
-                self.exc('{name} must contain less than or equal to {maxProperties} properties', rule='maxProperties')
+        if not isinstance(self._definition['maxProperties'], (int, float)):
+            raise JsonSchemaDefinitionException('maxProperties must be a number')
+        self.create_variable_with_length()
+        with self.l('if {variable}_len > {maxProperties}:'):
+            self.exc('{name} must contain less than or equal to {maxProperties} properties', rule='maxProperties')
 
     def generate_required(self):
-        self.create_variable_is_dict()
-        with self.l('if {variable}_is_dict:'):
-            if not isinstance(self._definition['required'], (list, tuple)):
-                raise JsonSchemaDefinitionException('required must be an array')
-            if len(self._definition['required']) != len(set(self._definition['required'])):
-                raise JsonSchemaDefinitionException('required must contain unique elements')
-            if not self._definition.get('additionalProperties', True):
-                not_possible = [
-                    prop
-                    for prop in self._definition['required']
-                    if
-                        prop not in self._definition.get('properties', {})
-                        and not any(re.search(regex, prop) for regex in self._definition.get('patternProperties', {}))
-                ]
-                if not_possible:
-                    raise JsonSchemaDefinitionException('{}: items {} are required but not allowed'.format(self._variable, not_possible))
-            self.l('{variable}__missing_keys = set({required}) - {variable}.keys()')
-            with self.l('if {variable}__missing_keys:'):
-                dynamic = 'str(sorted({variable}__missing_keys)) + " properties"'
-                self.exc('{name} must contain ', self.e(self._definition['required']), rule='required', append_to_msg=dynamic)
+        if not isinstance(self._definition['required'], (list, tuple)):
+            raise JsonSchemaDefinitionException('required must be an array')
+        if len(self._definition['required']) != len(set(self._definition['required'])):
+            raise JsonSchemaDefinitionException('required must contain unique elements')
+        if not self._definition.get('additionalProperties', True):
+            not_possible = [
+                prop
+                for prop in self._definition['required']
+                if
+                    prop not in self._definition.get('properties', {})
+                    and not any(re.search(regex, prop) for regex in self._definition.get('patternProperties', {}))
+            ]
+            if not_possible:
+                raise JsonSchemaDefinitionException('{}: items {} are required but not allowed'.format(self._variable, not_possible))
+        required = self.create_global_variable('required', 'frozenset({!r})'.format(list(self._definition['required'])))
+        with self.l('if not {variable}.keys() >= {}:', required):
+            self.l('{variable}__missing_keys = {} - {variable}.keys()', required)
+            dynamic = 'str(sorted({variable}__missing_keys)) + " properties"'
+            self.exc('{name} must contain ', self.e(self._definition['required']), rule='required', append_to_msg=dynamic)
 
     def generate_properties(self):
         """
@@ -541,24 +814,20 @@ class CodeGeneratorDraft04(CodeGenerator):
 
         Valid object is containing key called 'key' and value any number.
         """
-        self.create_variable_is_dict()
-        with self.l('if {variable}_is_dict:'):
-            self.create_variable_keys()
-            for key, prop_definition in self._definition['properties'].items():
-                key_name = re.sub(r'($[^a-zA-Z]|[^a-zA-Z0-9])', '', key)
-                if not isinstance(prop_definition, (dict, bool)):
-                    raise JsonSchemaDefinitionException('{}[{}] must be object'.format(self._variable, key_name))
-                with self.l('if "{}" in {variable}_keys:', self.e(key)):
-                    self.l('{variable}_keys.remove("{}")', self.e(key))
-                    self.l('{variable}__{0} = {variable}["{1}"]', key_name, self.e(key))
-                    self.generate_func_code_block(
-                        prop_definition,
-                        '{}__{}'.format(self._variable, key_name),
-                        '{}.{}'.format(self._variable_name, self.e(key)),
-                        clear_variables=True,
-                    )
-                if self._use_default and isinstance(prop_definition, dict) and 'default' in prop_definition:
-                    self.l('else: {variable}["{}"] = {}', self.e(key), repr(prop_definition['default']))
+        for key, prop_definition in self._definition['properties'].items():
+            key_name = re.sub(r'($[^a-zA-Z]|[^a-zA-Z0-9])', '', key)
+            if not isinstance(prop_definition, (dict, bool)):
+                raise JsonSchemaDefinitionException('{}[{}] must be object'.format(self._variable, key_name))
+            with self.l('if "{}" in {variable}:', self.e(key)):
+                self.l('{variable}__{0} = {variable}["{1}"]', key_name, self.e(key))
+                self.generate_func_code_block(
+                    prop_definition,
+                    '{}__{}'.format(self._variable, key_name),
+                    '{}.{}'.format(self._variable_name, self.e(key)),
+                    clear_variables=True,
+                )
+            if self._use_default and isinstance(prop_definition, dict) and 'default' in prop_definition:
+                self.l('else: {variable}["{}"] = {}', self.e(key), repr(prop_definition['default']))
 
     def generate_pattern_properties(self):
         """
@@ -573,26 +842,54 @@ class CodeGeneratorDraft04(CodeGenerator):
             }
 
         Valid object is containing key starting with a 'x' and value any number.
+
+        When there is also ``additionalProperties``, both are generated together by
+        `generate_additional_properties` within one loop over the object.
         """
-        self.create_variable_is_dict()
-        with self.l('if {variable}_is_dict:'):
-            self.create_variable_keys()
-            pattern_prop_definition = self._definition['patternProperties']
-            if pattern_prop_definition == {}:
-                return
-            for pattern, definition in pattern_prop_definition.items():
-                self._compile_regexps[pattern] = re.compile(pattern)
-            with self.l('for {variable}_key, {variable}_val in {variable}.items():'):
-                for pattern, definition in self._definition['patternProperties'].items():
-                    with self.l('if REGEX_PATTERNS[{}].search({variable}_key):', repr(pattern)):
-                        with self.l('if {variable}_key in {variable}_keys:'):
-                            self.l('{variable}_keys.remove({variable}_key)')
-                        self.generate_func_code_block(
-                            definition,
-                            '{}_val'.format(self._variable),
-                            '{}.{{{}_key}}'.format(self._variable_name, self._variable),
-                            clear_variables=True,
-                        )
+        pattern_prop_definition = self._definition['patternProperties']
+        if pattern_prop_definition == {}:
+            return
+        for pattern in pattern_prop_definition:
+            self._compile_regexps[pattern] = re.compile(pattern)
+        if self._has_additional_properties():
+            return
+        with self.l('for {variable}_key, {variable}_val in {variable}.items():') as loop:
+            self._generate_pattern_properties_checks()
+            if all(child.is_empty() for child in loop.children[1:]):
+                # Only lookup of patterns, anything is valid for all of them.
+                del loop.children[:]
+
+    def _generate_pattern_properties_checks(self, is_additional_variable=None):
+        """
+        Generates validation of ``{variable}_val`` by all patterns matching ``{variable}_key``.
+        Which patterns match is looked up in :any:`PatternsCache`, so regular expressions
+        are searched only once for every key.
+        """
+        self.add_extra_import('from fastjsonschema.cache import PatternsCache', 'PatternsCache', PatternsCache)
+        patterns = 'PatternsCache([{}])'.format(', '.join(
+            'REGEX_PATTERNS[{}]'.format(repr(pattern)) for pattern in self._definition['patternProperties']
+        ))
+        key_cache = self.create_key_cache('patterns', patterns + '.match')
+        if key_cache:
+            patterns_lookup = '{}({}_key)'.format(key_cache, self._variable)
+        else:
+            patterns_lookup = '{}[{}_key]'.format(self.create_global_variable('patterns', patterns), self._variable)
+        self.l('{variable}_key_patterns = {}', patterns_lookup)
+        for index, (pattern, definition) in enumerate(self._definition['patternProperties'].items()):
+            with self.l('if {variable}_key_patterns[{}]:', index):
+                if is_additional_variable:
+                    self.l('{} = False', is_additional_variable)
+                self.generate_func_code_block(
+                    definition,
+                    '{}_val'.format(self._variable),
+                    '{}.{{{}_key}}'.format(self._variable_name, self._variable),
+                    clear_variables=True,
+                )
+        return patterns_lookup
+
+    def _has_additional_properties(self):
+        add_prop_definition = self._definition.get('additionalProperties', True)
+        return add_prop_definition is not True and add_prop_definition != {}
 
     def generate_additional_properties(self):
         """
@@ -609,26 +906,67 @@ class CodeGeneratorDraft04(CodeGenerator):
 
         Valid object is containing key called 'key' and it's value any number and
         any other key with any string.
+
+        Keys of properties are prepared as a global frozenset, so without patternProperties
+        it is checked by a comparison of keys view of the object without any copy of keys.
+        With patternProperties each item of the object is validated by patterns and then,
+        if no pattern matched, by this definition in the same loop:
+
+        .. code-block:: python
+
+            for data_key, data_val in data.items():
+                data_is_additional = data_key not in PROPERTIES
+                if REGEX_PATTERNS['^x'].search(data_key):
+                    data_is_additional = False
+                    # patternProperties
+                if data_is_additional:
+                    # additionalProperties
         """
-        self.create_variable_is_dict()
-        with self.l('if {variable}_is_dict:'):
-            self.create_variable_keys()
-            add_prop_definition = self._definition["additionalProperties"]
-            if add_prop_definition is True or add_prop_definition == {}:
-                return
-            if add_prop_definition:
-                properties_keys = list(self._definition.get("properties", {}).keys())
-                with self.l('for {variable}_key in {variable}_keys:'):
-                    with self.l('if {variable}_key not in {}:', properties_keys):
-                        self.l('{variable}_value = {variable}.get({variable}_key)')
-                        self.generate_func_code_block(
-                            add_prop_definition,
-                            '{}_value'.format(self._variable),
-                            '{}.{{{}_key}}'.format(self._variable_name, self._variable),
-                        )
-            else:
-                with self.l('if {variable}_keys:'):
-                    self.exc('{name} must not contain "+str({variable}_keys)+" properties', rule='additionalProperties')
+        if not self._has_additional_properties():
+            return
+        add_prop_definition = self._definition["additionalProperties"]
+        properties_keys = self.create_global_variable('properties', 'frozenset({})'.format(
+            list(self._definition.get("properties", {}).keys()),
+        ))
+        if self._definition.get('patternProperties'):
+            self._generate_pattern_and_additional_properties(properties_keys)
+        elif add_prop_definition:
+            with self.l('for {variable}_key, {variable}_val in {variable}.items():'):
+                with self.l('if {variable}_key not in {}:', properties_keys):
+                    self._generate_additional_properties_value()
+        else:
+            with self.l('if not {variable}.keys() <= {}:', properties_keys):
+                self.l('{variable}_keys = {variable}.keys() - {}', properties_keys)
+                self.exc('{name} must not contain "+str({variable}_keys)+" properties', rule='additionalProperties')
+
+    def _generate_pattern_and_additional_properties(self, properties_keys):
+        add_prop_definition = self._definition["additionalProperties"]
+        if not add_prop_definition:
+            self.l('{variable}_has_additional = False')
+        with self.l('for {variable}_key, {variable}_val in {variable}.items():'):
+            self.l('{variable}_is_additional = {variable}_key not in {}', properties_keys)
+            patterns_lookup = self._generate_pattern_properties_checks('{}_is_additional'.format(self._variable))
+            with self.l('if {variable}_is_additional:'):
+                if add_prop_definition:
+                    self._generate_additional_properties_value()
+                else:
+                    self.l('{variable}_has_additional = True')
+        if not add_prop_definition:
+            with self.l('if {variable}_has_additional:'):
+                self.l(
+                    '{variable}_keys = {{{variable}_key for {variable}_key in {variable} '
+                    'if {variable}_key not in {} and not any({})}}',
+                    properties_keys,
+                    patterns_lookup,
+                )
+                self.exc('{name} must not contain "+str({variable}_keys)+" properties', rule='additionalProperties')
+
+    def _generate_additional_properties_value(self):
+        self.generate_func_code_block(
+            self._definition["additionalProperties"],
+            '{}_val'.format(self._variable),
+            '{}.{{{}_key}}'.format(self._variable_name, self._variable),
+        )
 
     def generate_dependencies(self):
         """
@@ -648,24 +986,15 @@ class CodeGeneratorDraft04(CodeGenerator):
         Since draft 06 definition can be boolean or empty array. True and empty array
         means nothing, False means that key cannot be there at all.
         """
-        self.create_variable_is_dict()
-        with self.l('if {variable}_is_dict:'):
-            is_empty = True
-            for key, values in self._definition["dependencies"].items():
-                if values == [] or values is True:
-                    continue
-                is_empty = False
-                with self.l('if "{}" in {variable}:', self.e(key)):
-                    if values is False:
-                        self.exc('{} in {name} must not be there', key, rule='dependencies')
-                    elif isinstance(values, list):
-                        for value in values:
-                            with self.l('if "{}" not in {variable}:', self.e(value)):
-                                self.exc('{name} missing dependency {} for {}', self.e(value), self.e(key), rule='dependencies')
-                    else:
-                        code_len = len(self._code)
-                        self.generate_func_code_block(values, self._variable, self._variable_name, clear_variables=True)
-                        if len(self._code) == code_len:
-                            self.l('pass')
-            if is_empty:
-                self.l('pass')
+        for key, values in self._definition["dependencies"].items():
+            if values == [] or values is True:
+                continue
+            with self.l('if "{}" in {variable}:', self.e(key)):
+                if values is False:
+                    self.exc('{} in {name} must not be there', key, rule='dependencies')
+                elif isinstance(values, list):
+                    for value in values:
+                        with self.l('if "{}" not in {variable}:', self.e(value)):
+                            self.exc('{name} missing dependency {} for {}', self.e(value), self.e(key), rule='dependencies')
+                else:
+                    self.generate_func_code_block(values, self._variable, self._variable_name, clear_variables=True)
@@ -25,8 +25,22 @@ class CodeGeneratorDraft06(CodeGeneratorDraft04):
         use_formats=True,
         detailed_exceptions=True,
         fast_fail=True,
+        return_bool=False,
+        json_input=False,
+        key_cache_size=None,
     ):
-        super().__init__(definition, resolver, formats, use_default, use_formats, detailed_exceptions, fast_fail)
+        super().__init__(
+            definition,
+            resolver,
+            formats,
+            use_default,
+            use_formats,
+            detailed_exceptions,
+            fast_fail,
+            return_bool,
+            json_input,
+            key_cache_size,
+        )
         self._json_keywords_to_function.update((
             ('exclusiveMinimum', self.generate_exclusive_minimum),
             ('exclusiveMaximum', self.generate_exclusive_maximum),
@@ -70,6 +84,16 @@ class CodeGeneratorDraft06(CodeGeneratorDraft04):
         except KeyError as exc:
             raise JsonSchemaDefinitionException('Unknown type') from exc
 
+        if self._json_input:
+            conditions = self._exact_type_conditions(types)
+            if 'integer' in types and 'number' not in types:
+                conditions.append(
+                    '{variable}_type is float and {variable}.is_integer()'.format(variable=self._variable),
+                )
+            with self.l('if not ({}):', ' or '.join(conditions)):
+                self.exc('{name} must be {}', ' or '.join(types), rule='type')
+            return
+
         extra = ''
 
         if 'integer' in types:
@@ -84,18 +108,16 @@ class CodeGeneratorDraft06(CodeGeneratorDraft04):
             self.exc('{name} must be {}', ' or '.join(types), rule='type')
 
     def generate_exclusive_minimum(self):
-        with self.l('if isinstance({variable}, (int, float, Decimal)):'):
-            if not isinstance(self._definition['exclusiveMinimum'], (int, float, decimal.Decimal)):
-                raise JsonSchemaDefinitionException('exclusiveMinimum must be an integer, a float or a decimal')
-            with self.l('if {variable} <= {exclusiveMinimum}:'):
-                self.exc('{name} must be bigger than {exclusiveMinimum}', rule='exclusiveMinimum')
+        if not isinstance(self._definition['exclusiveMinimum'], (int, float, decimal.Decimal)):
+            raise JsonSchemaDefinitionException('exclusiveMinimum must be an integer, a float or a decimal')
+        with self.l('if {variable} <= {exclusiveMinimum}:'):
+            self.exc('{name} must be bigger than {exclusiveMinimum}', rule='exclusiveMinimum')
 
     def generate_exclusive_maximum(self):
-        with self.l('if isinstance({variable}, (int, float, Decimal)):'):
-            if not isinstance(self._definition['exclusiveMaximum'], (int, float, decimal.Decimal)):
-                raise JsonSchemaDefinitionException('exclusiveMaximum must be an integer, a float or a decimal')
-            with self.l('if {variable} >= {exclusiveMaximum}:'):
-                self.exc('{name} must be smaller than {exclusiveMaximum}', rule='exclusiveMaximum')
+        if not isinstance(self._definition['exclusiveMaximum'], (int, float, decimal.Decimal)):
+            raise JsonSchemaDefinitionException('exclusiveMaximum must be an integer, a float or a decimal')
+        with self.l('if {variable} >= {exclusiveMaximum}:'):
+            self.exc('{name} must be smaller than {exclusiveMaximum}', rule='exclusiveMaximum')
 
     def generate_property_names(self):
         """
@@ -115,30 +137,20 @@ class CodeGeneratorDraft06(CodeGeneratorDraft04):
         if property_names_definition is True:
             pass
         elif property_names_definition is False:
-            self.create_variable_keys()
-            with self.l('if {variable}_keys:'):
+            with self.l('if {variable}:'):
                 self.exc('{name} must not be there', rule='propertyNames')
         else:
-            self.create_variable_is_dict()
-            with self.l('if {variable}_is_dict:'):
-                self.create_variable_with_length()
-                with self.l('if {variable}_len != 0:'):
-                    self.l('{variable}_property_names = True')
-                    with self.l('for {variable}_key in {variable}:'):
-                        with self.l('try:'):
-                            code_len = len(self._code)
-                            self.generate_func_code_block(
-                                property_names_definition,
-                                '{}_key'.format(self._variable),
-                                self._variable_name,
-                                clear_variables=True,
-                            )
-                            if len(self._code) == code_len:
-                                self.l('pass')
-                        with self.l('except JsonSchemaValueException:'):
-                            self.l('{variable}_property_names = False')
-                    with self.l('if not {variable}_property_names:'):
-                        self.exc('{name} must be named by propertyName definition', rule='propertyNames')
+            self.create_variable_with_length()
+            with self.l('if {variable}_len != 0:'):
+                self.l('{variable}_property_names = True')
+                name = self.generate_is_valid_function(property_names_definition)
+                name = self.create_key_cache('property_names', name) or name
+                with self.l('for {variable}_key in {variable}:'):
+                    with self.l('if not {}({variable}_key, custom_formats):', name):
+                        self.l('{variable}_property_names = False')
+                        self.l('break')
+                with self.l('if not {variable}_property_names:'):
+                    self.exc('{name} must be named by propertyName definition', rule='propertyNames')
 
     def generate_contains(self):
         """
@@ -154,31 +166,23 @@ class CodeGeneratorDraft06(CodeGeneratorDraft04):
 
         Valid array is any with at least one number.
         """
-        self.create_variable_is_list()
-        with self.l('if {variable}_is_list:'):
-            contains_definition = self._definition['contains']
-
-            if contains_definition is False:
-                self.exc('{name} is always invalid', rule='contains')
-            elif contains_definition is True:
-                with self.l('if not {variable}:'):
-                    self.exc('{name} must not be empty', rule='contains')
-            else:
-                self.l('{variable}_contains = False')
-                with self.l('for {variable}_key in {variable}:'):
-                    with self.l('try:'):
-                        self.generate_func_code_block(
-                            contains_definition,
-                            '{}_key'.format(self._variable),
-                            self._variable_name,
-                            clear_variables=True,
-                        )
-                        self.l('{variable}_contains = True')
-                        self.l('break')
-                    self.l('except JsonSchemaValueException: pass')
+        contains_definition = self._definition['contains']
+
+        if contains_definition is False:
+            self.exc('{name} is always invalid', rule='contains')
+        elif contains_definition is True:
+            with self.l('if not {variable}:'):
+                self.exc('{name} must not be empty', rule='contains')
+        else:
+            self.l('{variable}_contains = False')
+            name = self.generate_is_valid_function(contains_definition)
+            with self.l('for {variable}_key in {variable}:'):
+                with self.l('if {}({variable}_key, custom_formats):', name):
+                    self.l('{variable}_contains = True')
+                    self.l('break')
 
-                with self.l('if not {variable}_contains:'):
-                    self.exc('{name} must contain one of contains definition', rule='contains')
+            with self.l('if not {variable}_contains:'):
+                self.exc('{name} must contain one of contains definition', rule='contains')
 
     def generate_const(self):
         """
@@ -193,6 +197,6 @@ class CodeGeneratorDraft06(CodeGeneratorDraft04):
         Only valid value is 42 in this example.
         """
         const = self._definition['const']
-        match = self._enum_value_matches(self._variable, const)
+        match = self._enum_matches(self._variable, [const])
         with self.l('if not ({}):', match):
             self.exc('{name} must be same as const definition: {definition_rule}', rule='const')
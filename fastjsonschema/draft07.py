@@ -26,9 +26,23 @@ class CodeGeneratorDraft07(CodeGeneratorDraft06):
         use_default=True,
         use_formats=True,
         detailed_exceptions=True,
-        fast_fail=True
+        fast_fail=True,
+        return_bool=False,
+        json_input=False,
+        key_cache_size=None,
     ):
-        super().__init__(definition, resolver, formats, use_default, use_formats, detailed_exceptions, fast_fail)
+        super().__init__(
+            definition,
+            resolver,
+            formats,
+            use_default,
+            use_formats,
+            detailed_exceptions,
+            fast_fail,
+            return_bool,
+            json_input,
+            key_cache_size,
+        )
         # pylint: disable=duplicate-code
         self._json_keywords_to_function.update((
             ('if', self.generate_if_then_else),
@@ -56,40 +70,26 @@ class CodeGeneratorDraft07(CodeGeneratorDraft06):
 
         Valid values are any between -10 and 0 or any multiplication of two.
         """
-        with self.l('try:', optimize=False):
-            code_len = len(self._code)
-            self.generate_func_code_block(
-                self._definition['if'],
-                self._variable,
-                self._variable_name,
-                clear_variables=True
-            )
-            if len(self._code) == code_len:
-                self.l('pass')
-        with self.l('except JsonSchemaValueException:'):
-            if 'else' in self._definition:
-                code_len = len(self._code)
-                self.generate_func_code_block(
-                    self._definition['else'],
-                    self._variable,
-                    self._variable_name,
-                    clear_variables=True
-                )
-                if len(self._code) == code_len:
-                    self.l('pass')
-            else:
-                self.l('pass')
+        if 'then' not in self._definition and 'else' not in self._definition:
+            return
+        name = self.generate_is_valid_function(self._definition['if'])
         if 'then' in self._definition:
-            with self.l('else:'):
-                code_len = len(self._code)
-                self.generate_func_code_block(
-                    self._definition['then'],
-                    self._variable,
-                    self._variable_name,
-                    clear_variables=True
-                )
-                if len(self._code) == code_len:
-                    self.l('pass')
+            with self.l('if {}({variable}, custom_formats):', name, optimize=False):
+                self._generate_if_then_else_branch('then')
+            if 'else' in self._definition:
+                with self.l('else:'):
+                    self._generate_if_then_else_branch('else')
+        else:
+            with self.l('if not {}({variable}, custom_formats):', name, optimize=False):
+                self._generate_if_then_else_branch('else')
+
+    def _generate_if_then_else_branch(self, keyword):
+        self.generate_func_code_block(
+            self._definition[keyword],
+            self._variable,
+            self._variable_name,
+            clear_variables=True
+        )
 
     def generate_content_encoding(self):
         """
@@ -23,6 +23,9 @@ class JsonSchemaValueException(JsonSchemaException):
      * ``rule`` which the ``value`` is breaking (e.g. ``maximum``)
      * and ``rule_definition`` (e.g. ``42``).
 
+    The ``definition`` is shared by all exceptions raised from the same place of
+    the validation function, so it has to be treated as read-only.
+
     .. versionchanged:: 2.14.0
         Added all extra properties.
     """
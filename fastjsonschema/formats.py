@@ -0,0 +1,96 @@
+"""
+Native validators of formats written without regular expressions.
+
+Each function accepts exactly the same strings as the regular expression of the same
+format (see ``FORMAT_REGEXS`` of code generators), but splits the string and checks
+its parts instead of running regular expression engine. Only formats where it pays
+off are here. Regular expression of ``ipv6`` has many alternatives which are all tried
+before an invalid address is rejected. Other formats (such as ``date-time``, ``ipv4``
+or ``uuid``) are matched faster by compiled regular expressions than by any code
+checking characters in Python.
+
+They are not used by default, pass them as custom formats to use them:
+
+.. code-block:: python
+
+    from fastjsonschema.formats import NATIVE_FORMATS, ipv6
+
+    validate = fastjsonschema.compile(definition, formats={'ipv6': ipv6})
+
+    # Or all of them at once (merge them with your own custom formats if needed).
+    validate = fastjsonschema.compile(definition, formats=NATIVE_FORMATS)
+
+Any custom format can be also wrapped by :any:`cached_format` to remember results
+for recently validated values.
+"""
+
+import re
+
+from .cache import MAX_SIZE, KeyCache
+
+
+HEXDIGITS = '0123456789abcdefABCDEF'
+# All numbers from 0 to 255 without leading zeros.
+IPV4_OCTETS = frozenset(str(number) for number in range(256))
+
+
+def ipv6(value):
+    """
+    Validates ``ipv6`` such as ``2001:db8::1`` or ``::ffff:127.0.0.1``.
+    """
+    head, compressed, tail = value.partition('::')
+    if head and tail:
+        groups = (head + ':' + tail).split(':')
+    elif head or tail:
+        groups = (head or tail).split(':')
+    else:
+        # Only ``::`` or empty string.
+        return bool(compressed)
+    groups_count = len(groups)
+    if '.' in groups[-1]:
+        # IPv4 address takes the place of two groups, only at the end.
+        if (compressed and not tail) or not _ipv4(groups.pop()):
+            return False
+        if not groups:
+            return bool(compressed)
+        groups_count += 1
+    if groups_count > 7 if compressed else groups_count != 8:
+        return False
+    return '' not in groups and max(map(len, groups)) <= 4 and not ''.join(groups).strip(HEXDIGITS)
+
+
+NATIVE_FORMATS = {
+    'ipv6': ipv6,
+}
+
+
+def cached_format(format_, max_size=MAX_SIZE):
+    """
+    Wraps custom format (callable or regular expression) by least recently used
+    cache of results for ``max_size`` values, so an expensive check (for example
+    looking up the value in a database) runs only once for each distinct value.
+
+    .. code-block:: python
+
+        currency = cached_format(lambda value: Currency.objects.filter(code=value).exists(), 1000)
+        validate = fastjsonschema.compile(definition, formats={'currency': currency})
+        validate(data)
+        currency.cache_info().hit_ratio
+
+    Results are shared by all validators using the same wrapped format. Exceptions
+    raised by the callable are not cached.
+    """
+    if isinstance(format_, str):
+        format_ = re.compile(format_)
+    if isinstance(format_, re.Pattern):
+        regex = format_
+
+        def cached(value):
+            return regex.match(value) is not None
+        return KeyCache(cached, max_size)
+    return KeyCache(format_, max_size)
+
+
+def _ipv4(value):
+    parts = value.split('.')
+    return len(parts) == 4 and IPV4_OCTETS.issuperset(parts)
@@ -1,9 +1,14 @@
 from collections import OrderedDict
+from copy import deepcopy
 from decimal import Decimal
 import re
+from string import Formatter
 
+from .cache import KeyCache
 from .exceptions import JsonSchemaValueException, JsonSchemaValuesException, JsonSchemaDefinitionException
-from .indent import indent
+from .indent import Indent, indent
+from .ir import Statement, emit, simplify
+from .path import render_path
 from .ref_resolver import RefResolver
 
 
@@ -28,13 +33,36 @@ class CodeGenerator:
     """
 
     INDENT = 4  # spaces
-
-    def __init__(self, definition, resolver=None, detailed_exceptions=True, fast_fail=True):
+    # Maximum number of keywords of referenced definition generated in place of its call.
+    INLINE_REF_MAX_SIZE = 20
+
+    def __init__(
+        self,
+        definition,
+        resolver=None,
+        detailed_exceptions=True,
+        fast_fail=True,
+        return_bool=False,
+        json_input=False,
+        key_cache_size=None,
+    ):
         self._code = []
+        self._indent = Indent(self)
         self._compile_regexps = {}
+        # definitions (with expanded refs) reported by exceptions and map of ids
+        # of definitions to their definition and index (see ``_definition_index``)
+        self._definitions = []
+        self._definitions_indexes = {}
+        # map of ids of definitions to the definition and its copy with expanded refs
+        self._expanded_definitions = {}
+        # map of ids of definitions referenced by $ref to the definition and its copy
+        self._referenced_definitions = {}
         self._custom_formats = {}
         self._detailed_exceptions = detailed_exceptions
         self._fast_fail = fast_fail
+        self._return_bool = return_bool
+        self._json_input = json_input
+        self._key_cache_size = key_cache_size
 
         # Any extra library should be here to be imported only once.
         # Lines are imports to be printed in the file and objects
@@ -46,28 +74,44 @@ class CodeGenerator:
             "Decimal": Decimal,
         }
 
-        self._variables = set()
-        self._indent = 0
-        self._indent_last_line = None
+        # names of created variables (dict as ordered set, so variables created
+        # in a branch of code can be dropped by ``popitem``)
+        self._variables = {}
         self._variable = None
         self._variable_name = None
         self._root_definition = definition
         self._definition = None
 
-        # map schema URIs to validation function names for functions
-        # that are not yet generated, but need to be generated
+        # map schema URIs (with flag whether function returns bool) to validation
+        # function names for functions that are not yet generated, but need to be generated
         self._needed_validation_functions = {}
-        # validation function names that are already done
+        # validation functions that are already done
         self._validation_functions_done = set()
+        # map schema URIs to size of their code when generated in place of ``$ref``
+        # or ``None`` when they have to be called (see ``_inline_ref_size``)
+        self._inline_ref_sizes = {}
+
+        # name of currently generated function and whether it returns bool
+        self._function_name = None
+        self._is_valid_function = False
+        # code of functions returning bool used by composition keywords
+        # and of other global variables (such as lookup tables)
+        self._global_code = []
+        self._is_valid_functions_count = 0
+        self._global_variables_count = 0
 
         if resolver is None:
             resolver = RefResolver.from_schema(definition, store={})
         self._resolver = resolver
 
         # add main function to `self._needed_validation_functions`
-        self._needed_validation_functions[self._resolver.get_uri()] = self._resolver.get_scope_name()
+        self._needed_validation_functions[(self._resolver.get_uri(), return_bool)] = self._resolver.get_scope_name()
 
         self._json_keywords_to_function = OrderedDict()
+        # order of keywords in ``_json_keywords_to_function`` (see ``keyword_functions``)
+        self._keywords_order = None
+        # map of templates of lines to names of their fields (see ``_format_fields``)
+        self._format_fields_cache = {}
 
     @property
     def func_code(self):
@@ -76,47 +120,49 @@ class CodeGenerator:
         """
         self._generate_func_code()
 
-        return '\n'.join(self._code)
+        return '\n'.join(emit(self._code, self.INDENT))
 
     @property
     def global_state(self):
         """
         Returns global variables for generating function from ``func_code``. Includes
         compiled regular expressions and imports, so it does not have to do it every
-        time when validation function is called.
+        time when validation function is called, and definitions reported by exceptions,
+        so they are passed as objects and not compiled from code.
         """
         self._generate_func_code()
 
-        return dict(
+        return {
             **self._extra_imports_objects,
-            REGEX_PATTERNS=self._compile_regexps,
-            re=re,
-            JsonSchemaValueException=JsonSchemaValueException,
-            JsonSchemaValuesException=JsonSchemaValuesException,
-        )
+            'REGEX_PATTERNS': self._compile_regexps,
+            'DEFINITIONS': self._definitions,
+            're': re,
+            'JsonSchemaValueException': JsonSchemaValueException,
+            'JsonSchemaValuesException': JsonSchemaValuesException,
+        }
 
     @property
     def global_state_code(self):
         """
         Returns global variables for generating function from ``func_code`` as code.
-        Includes compiled regular expressions and imports.
+        Includes compiled regular expressions, imports and definitions reported by
+        exceptions.
         """
         self._generate_func_code()
 
-        if not self._compile_regexps:
-            return '\n'.join(self._extra_imports_lines + [
-                'from fastjsonschema import JsonSchemaValueException, JsonSchemaValuesException',
-                '',
-                '',
-            ])
-        return '\n'.join(self._extra_imports_lines + [
-            'import re',
+        lines = list(self._extra_imports_lines)
+        if self._compile_regexps:
+            lines.append('import re')
+        lines.extend([
             'from fastjsonschema import JsonSchemaValueException, JsonSchemaValuesException',
             '',
             '',
-            'REGEX_PATTERNS = ' + serialize_regexes(self._compile_regexps),
-            '',
         ])
+        if self._compile_regexps:
+            lines.extend(['REGEX_PATTERNS = ' + serialize_regexes(self._compile_regexps), ''])
+        if self._definitions:
+            lines.extend(['DEFINITIONS = ' + serialize_definitions(self._definitions), ''])
+        return '\n'.join(lines)
 
 
     def _generate_func_code(self):
@@ -134,17 +180,24 @@ class CodeGenerator:
             # During generation of validation function, could be needed to generate
             # new one that is added again to `_needed_validation_functions`.
             # Therefore usage of while instead of for loop.
-            uri, name = self._needed_validation_functions.popitem()
-            self.generate_validation_function(uri, name)
+            (uri, return_bool), name = self._needed_validation_functions.popitem()
+            self.generate_validation_function(uri, name, return_bool)
+        self._code.extend(self._global_code)
+        self._code = simplify(self._code)
 
-    def generate_validation_function(self, uri, name):
+    def generate_validation_function(self, uri, name, return_bool=False):
         """
         Generate validation function for given uri with given name
         """
-        self._validation_functions_done.add(uri)
+        self._validation_functions_done.add((uri, return_bool))
+        self._function_name, self._is_valid_function = name, return_bool
         self.l('')
         with self._resolver.resolving(uri) as definition:
             with self.l('def {}(data, custom_formats={{}}, name_prefix=None):', name):
+                if return_bool:
+                    self.generate_func_code_block(definition, 'data', 'data', clear_variables=True)
+                    self.l('return True')
+                    return
                 if not self._fast_fail:
                     self.l('errors = []')
                 self.generate_func_code_block(definition, 'data', 'data', clear_variables=True)
@@ -162,7 +215,7 @@ class CodeGenerator:
         self._definition, self._variable, self._variable_name = definition, variable, variable_name
         if clear_variables:
             backup_variables = self._variables
-            self._variables = set()
+            self._variables = {}
 
         count = self._generate_func_code_block(definition)
 
@@ -172,6 +225,28 @@ class CodeGenerator:
 
         return count
 
+    def generate_is_valid_function(self, definition):
+        """
+        Generates separate function returning only `True` or `False` whether data are
+        valid by ``definition`` and returns its name. Keywords which need to know just
+        the result of a subschema (such as ``anyOf``) call it instead of catching
+        exceptions, because creating an exception is much more expensive than a call.
+        """
+        self._is_valid_functions_count += 1
+        name = '{}__is_valid{}'.format(self._function_name, self._is_valid_functions_count)
+
+        backup = self._code, self._function_name, self._is_valid_function
+        self._code, self._function_name, self._is_valid_function = [], name, True
+
+        self.l('')
+        with self.l('def {}(data, custom_formats={{}}):', name):
+            self.generate_func_code_block(definition, 'data', 'data', clear_variables=True)
+            self.l('return True')
+        self._global_code.extend(self._code)
+
+        self._code, self._function_name, self._is_valid_function = backup
+        return name
+
     def _generate_func_code_block(self, definition):
         if not isinstance(definition, dict):
             raise JsonSchemaDefinitionException("definition must be an object")
@@ -183,12 +258,22 @@ class CodeGenerator:
     def run_generate_functions(self, definition):
         """Returns the number of generate functions that were executed."""
         count = 0
-        for key, func in self._json_keywords_to_function.items():
-            if key in definition:
-                func()
-                count += 1
+        for _, func in self.keyword_functions(definition):
+            func()
+            count += 1
         return count
 
+    def keyword_functions(self, definition):
+        """
+        Returns pairs of keywords used in ``definition`` and their generate functions
+        in the order of ``_json_keywords_to_function``. Only keys of the definition
+        are looked up, not all known keywords.
+        """
+        if self._keywords_order is None:
+            self._keywords_order = {key: index for index, key in enumerate(self._json_keywords_to_function)}
+        keys = sorted((key for key in definition if key in self._keywords_order), key=self._keywords_order.get)
+        return [(key, self._json_keywords_to_function[key]) for key in keys]
+
     def generate_ref(self):
         """
         Ref can be link to remote or local definition.
@@ -202,26 +287,143 @@ class CodeGenerator:
                     'bar': {'$ref': '#/properties/foo'}
                 }
             }
+
+        Small referenced definitions which are not part of any cycle of references
+        are generated in place, so there is no call of function for each value.
+        Recursive definitions are validated by separate functions calling each other.
         """
+        with self._resolver.in_scope(self._definition['$ref']):
+            inline = self._inline_ref_size(self._resolver.get_uri()) is not None
+        if inline:
+            with self._resolver.resolving(self._definition['$ref']) as definition:
+                self.generate_func_code_block(definition, self._variable, self._variable_name)
+            return
         with self._resolver.in_scope(self._definition['$ref']):
             name = self._resolver.get_scope_name()
-            uri = self._resolver.get_uri()
-            if uri not in self._validation_functions_done:
-                self._needed_validation_functions[uri] = name
+            if self._is_valid_function and not self._return_bool:
+                # Variant of validation function returning bool is needed.
+                name = 'is_valid' + name[len('validate'):]
+            key = (self._resolver.get_uri(), self._is_valid_function)
+            if key not in self._validation_functions_done:
+                self._needed_validation_functions[key] = name
             # call validation function
-            assert self._variable_name.startswith("data")
-            path = self._variable_name[4:]
-            name_arg = '(name_prefix or "data") + "{}"'.format(path)
-            if '{' in name_arg:
-                name_arg = name_arg + '.format(**locals())'
-            self.l('{}({variable}, custom_formats, {name_arg})', name, name_arg=name_arg)
+            if self._is_valid_function:
+                with self.l('if not {}({variable}, custom_formats):', name):
+                    self.l('return False')
+                return
+            self.l('{}({variable}, custom_formats, {name_arg})', name, name_arg=self._path_arg())
+
+    def _path_arg(self):
+        """
+        Returns code of path of current variable passed to called validation function
+        as ``name_prefix``. It is a tuple ``(name_prefix, template, args)`` with values
+        of loop variables in ``args``, so nothing is formatted until an error occurs.
+        """
+        assert self._variable_name.startswith('data')
+        args = []
+        def replace(match):
+            if match.group(1):
+                args.append(match.group(1))
+                return '{}'
+            return match.group(0) * 2
+        template = re.sub(r'\{(data\w*_(?:x|key))\}|[{}]', replace, self._variable_name[4:])
+        if not template:
+            return 'name_prefix'
+        return '(name_prefix, {}, ({}))'.format(repr(template), ''.join(arg + ', ' for arg in args))
+
+    def _inline_ref_size(self, uri):
+        """
+        Returns number of keywords of definition at ``uri`` when it should be generated
+        in place of ``$ref`` (including referenced definitions generated in place too),
+        otherwise ``None``.
+        """
+        if uri not in self._inline_ref_sizes:
+            self._analyze_refs(uri)
+        size = self._inline_ref_sizes[uri]
+        return size if size is not None and size <= self.INLINE_REF_MAX_SIZE else None
+
+    def _analyze_refs(self, uri):  # pylint: disable=too-many-locals
+        """
+        Finds strongly connected components of graph of references reachable from
+        ``uri`` by Tarjan's algorithm (without recursion, chains of references can be
+        long) and computes sizes of all found definitions. Components are finished
+        after all components they reference, so their sizes are already known.
+        Definitions in a cycle of references and definitions which would have to be
+        fetched have no size, they are always called.
+        """
+        indexes, lowlinks, nodes = {}, {}, {}
+        stack, on_stack = [], set()
+        work = [(uri, 0)]
+        while work:
+            node, edge_index = work.pop()
+            if edge_index == 0:
+                indexes[node] = lowlinks[node] = len(indexes)
+                stack.append(node)
+                on_stack.add(node)
+                nodes[node] = self._ref_node(node)
+            refs = nodes[node][0] if nodes[node] else []
+            for index in range(edge_index, len(refs)):
+                ref = refs[index]
+                if ref in self._inline_ref_sizes:
+                    continue
+                if ref not in indexes:
+                    work.append((node, index + 1))
+                    work.append((ref, 0))
+                    break
+                if ref in on_stack:
+                    lowlinks[node] = min(lowlinks[node], indexes[ref])
+            else:
+                if lowlinks[node] == indexes[node]:
+                    component = stack[stack.index(node):]
+                    del stack[len(stack) - len(component):]
+                    on_stack.difference_update(component)
+                    recursive = len(component) > 1 or node in refs
+                    for member in component:
+                        self._inline_ref_sizes[member] = None if recursive else self._ref_node_size(nodes[member])
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+
+    def _ref_node(self, uri):
+        """
+        Returns list of URIs referenced by definition at ``uri`` and number of its
+        other keywords, or ``None`` when it cannot be resolved without fetching.
+        """
+        if not self._resolver.is_available(uri):
+            return None
+        refs, size = [], 0
+        try:
+            with self._resolver.resolving(uri) as definition:
+                items = [definition]
+                while items:
+                    item = items.pop()
+                    if isinstance(item, list):
+                        items.extend(item)
+                    elif not isinstance(item, dict):
+                        continue
+                    elif '$ref' in item and isinstance(item['$ref'], str):
+                        with self._resolver.in_scope(item['$ref']):
+                            refs.append(self._resolver.get_uri())
+                    else:
+                        size += len(item)
+                        items.extend(item.values())
+        except (JsonSchemaDefinitionException, LookupError, ValueError):
+            return None
+        return refs, size
+
+    def _ref_node_size(self, node):
+        if node is None:
+            return None
+        refs, size = node
+        # Each reference is either generated in place or it is a call.
+        return size + sum(self._inline_ref_size(ref) or 1 for ref in refs)
 
 
     # pylint: disable=invalid-name
     @indent
     def l(self, line, *args, **kwds):
         """
-        Short-cut of line. Used for inserting line. It's formated with parameters
+        Short-cut of line. Used for inserting line (see :any:`indent`). It's formated with parameters
         ``variable``, ``variable_name`` (as ``name`` for short-cut), all keys from
         current JSON schema ``definition`` and also passed arguments in ``args``
         and named ``kwds``.
@@ -237,26 +439,44 @@ class CodeGenerator:
             with self.l('if {variable} not in {enum}:'):
                 self.l('raise JsonSchemaValueException("Wrong!")')
         """
-        spaces = ' ' * self.INDENT * self._indent
+        context = {}
+        for field in self._format_fields(line):
+            if field in kwds:
+                context[field] = kwds[field]
+            elif field == 'variable':
+                context[field] = self._variable
+            elif field == 'name':
+                context[field] = self._name()
+            elif self._definition and self._definition is not True:
+                context[field] = self._definition[field]
+        line = line.format(*args, **context)
+        line = line.replace('\n', '\\n').replace('\r', '\\r')
+        return line
 
+    def _format_fields(self, line):
+        """
+        Returns names of fields used in ``line`` formatted by ``l``. Lines are mostly
+        the same templates, so they are parsed only once.
+        """
+        fields = self._format_fields_cache.get(line)
+        if fields is None:
+            fields = tuple({
+                re.match(r'\w*', field).group(0)
+                for _, field, _, _ in Formatter().parse(line)
+                if field and not field[0].isdigit()
+            })
+            self._format_fields_cache[line] = fields
+        return fields
+
+    def _name(self):
         name = self._variable_name
         if name:
             # Add name_prefix to the name when it is being outputted.
             assert name.startswith('data')
-            name = '" + (name_prefix or "data") + "' + name[4:]
+            name = '" + render_path(name_prefix) + "' + name[4:]
             if '{' in name:
                 name = name + '".format(**locals()) + "'
-
-        context = dict(
-            self._definition if self._definition and self._definition is not True else {},
-            variable=self._variable,
-            name=name,
-            **kwds
-        )
-        line = line.format(*args, **context)
-        line = line.replace('\n', '\\n').replace('\r', '\\r')
-        self._code.append(spaces + line)
-        return line
+        return name
 
     def e(self, string):
         """
@@ -274,6 +494,11 @@ class CodeGenerator:
         """
         Short-cut for creating raising exception in the code.
         """
+        if self._is_valid_function:
+            self.l('return False')
+            return
+
+        self.add_extra_import('from fastjsonschema.path import render_path', 'render_path', render_path)
         if not self._detailed_exceptions:
             if self._fast_fail:
                 self.l('raise JsonSchemaValueException("'+msg+'")', *args)
@@ -290,9 +515,22 @@ class CodeGenerator:
             if self._fast_fail else
             'errors.append(JsonSchemaValueException('+arg+', value={variable}, name="{name}", definition={definition}, rule={rule}))'
         )
-        definition = self._expand_refs(self._definition)
+        index = self._definition_index(self._definition)
+        definition = self._definitions[index]
         definition_rule = self.e(definition.get(rule) if isinstance(definition, dict) else None)
-        self.l(msg, *args, definition=repr(definition), rule=repr(rule), definition_rule=definition_rule)
+        self.l(msg, *args, definition='DEFINITIONS[{}]'.format(index), rule=repr(rule), definition_rule=definition_rule)
+
+    def _definition_index(self, definition):
+        """
+        Returns index of ``definition`` with expanded refs in global ``DEFINITIONS``.
+        Each definition is expanded and stored only once for all its error sites.
+        """
+        key = id(definition)
+        if key not in self._definitions_indexes:
+            # Definition is kept with the index, so its id cannot be reused by other one.
+            self._definitions_indexes[key] = (definition, len(self._definitions))
+            self._definitions.append(self._expand_refs(definition))
+        return self._definitions_indexes[key][1]
 
     def _expand_refs(self, definition):
         if isinstance(definition, list):
@@ -301,8 +539,36 @@ class CodeGenerator:
             return definition
         if "$ref" in definition and isinstance(definition["$ref"], str):
             with self._resolver.resolving(definition["$ref"]) as schema:
-                return schema
-        return {k: self._expand_refs(v) for k, v in definition.items()}
+                # Copied, so exceptions never share the definition passed by the caller.
+                key = id(schema)
+                if key not in self._referenced_definitions:
+                    self._referenced_definitions[key] = (schema, deepcopy(schema))
+                return self._referenced_definitions[key][1]
+        # Subschemas are expanded again by their own error sites, so each is done once.
+        key = id(definition)
+        if key not in self._expanded_definitions:
+            expanded = {k: self._expand_refs(v) for k, v in definition.items()}
+            self._expanded_definitions[key] = (definition, expanded)
+        return self._expanded_definitions[key][1]
+
+    def create_key_cache(self, name, func):
+        """
+        Returns name of global variable with :any:`KeyCache` of ``func`` (code
+        of Python expression) when ``key_cache_size`` is set, otherwise ``None``.
+        """
+        if not self._key_cache_size:
+            return None
+        self.add_extra_import('from fastjsonschema.cache import KeyCache', 'KeyCache', KeyCache)
+        return self.create_global_variable(name, 'KeyCache({}, {})'.format(func, self._key_cache_size))
+
+    def add_extra_import(self, line, name, obj):
+        """
+        Adds import of ``obj`` used by generated code. ``line`` is used in code
+        generated by :any:`compile_to_code`, ``name`` with ``obj`` by :any:`compile`.
+        """
+        if name not in self._extra_imports_objects:
+            self._extra_imports_lines.append(line)
+            self._extra_imports_objects[name] = obj
 
     def create_variable_with_length(self):
         """
@@ -314,7 +580,7 @@ class CodeGenerator:
         variable_name = '{}_len'.format(self._variable)
         if variable_name in self._variables:
             return
-        self._variables.add(variable_name)
+        self._variables[variable_name] = True
         self.l('{variable}_len = len({variable})')
 
     def create_variable_keys(self):
@@ -325,30 +591,31 @@ class CodeGenerator:
         variable_name = '{}_keys'.format(self._variable)
         if variable_name in self._variables:
             return
-        self._variables.add(variable_name)
+        self._variables[variable_name] = True
         self.l('{variable}_keys = set({variable}.keys())')
 
-    def create_variable_is_list(self):
+    def create_variable_type(self):
         """
-        Append code for creating variable with bool if it's instance of list
-        with a name ``{variable}_is_list``. Similar to `create_variable_with_length`.
+        Append code for creating variable with exact type of that variable with
+        a name ``{variable}_type``. Used only when data come from JSON decoder
+        (``json_input``). Similar to `create_variable_with_length`.
         """
-        variable_name = '{}_is_list'.format(self._variable)
+        variable_name = '{}_type'.format(self._variable)
         if variable_name in self._variables:
             return
-        self._variables.add(variable_name)
-        self.l('{variable}_is_list = isinstance({variable}, (list, tuple))')
+        self._variables[variable_name] = True
+        self.l('{variable}_type = type({variable})')
 
-    def create_variable_is_dict(self):
+    def create_global_variable(self, name, value):
         """
-        Append code for creating variable with bool if it's instance of list
-        with a name ``{variable}_is_dict``. Similar to `create_variable_with_length`.
+        Append code for creating global variable with ``value`` (code of Python
+        expression) and returns its unique name based on ``name``. Used for values
+        which should be prepared only once and not with every call (such as sets).
         """
-        variable_name = '{}_is_dict'.format(self._variable)
-        if variable_name in self._variables:
-            return
-        self._variables.add(variable_name)
-        self.l('{variable}_is_dict = isinstance({variable}, dict)')
+        self._global_variables_count += 1
+        variable_name = '{}__{}{}'.format(self._function_name, name, self._global_variables_count)
+        self._global_code.extend([Statement(''), Statement('{} = {}'.format(variable_name, value))])
+        return variable_name
 
 
 def serialize_regexes(patterns_dict):
@@ -361,6 +628,10 @@ def serialize_regexes(patterns_dict):
     return '{\n    ' + ",\n    ".join(regex_patterns) + "\n}"
 
 
+def serialize_definitions(definitions):
+    return '[\n    ' + ',\n    '.join(repr(definition) for definition in definitions) + '\n]'
+
+
 def repr_regex(regex):
     all_flags = ("A", "I", "DEBUG", "L", "M", "S", "X")
     flags = " | ".join(f"re.{f}" for f in all_flags if regex.flags & getattr(re, f))
@@ -1,30 +1,44 @@
 # pylint: disable=protected-access
+from .ir import Block, Statement
+
 
 def indent(func):
     """
     Decorator for allowing to use method as normal method or with
     context manager for auto-indenting code blocks.
+
+    Returned line is added to the code as :any:`Statement`. When it is
+    used as context manager, it becomes :any:`Block` and code generated
+    inside of it is added to that block.
     """
     def wrapper(self, line, *args, optimize=True, **kwds):
-        last_line = self._indent_last_line
         line = func(self, line, *args, **kwds)
         # When two blocks have the same condition (such as value has to be dict),
-        # do the check only once and keep it under one block.
-        if optimize and last_line == line:
-            self._code.pop()
-        self._indent_last_line = line
-        return Indent(self, line)
+        # the check is done only once and both are kept under one block
+        # (see :any:`merge_blocks`) unless `optimize` is turned off.
+        self._code.append(Statement(line, merge=optimize))
+        return self._indent
     return wrapper
 
 
 class Indent:
-    def __init__(self, instance, line):
+    """
+    Context manager turning the last added statement into block. One instance
+    is used by generator for all blocks, so nothing is created for lines which
+    are not blocks.
+    """
+
+    def __init__(self, instance):
         self.instance = instance
-        self.line = line
+        self.codes = []
 
     def __enter__(self):
-        self.instance._indent += 1
+        code = self.instance._code
+        block = Block(code[-1].code, code[-1].merge)
+        code[-1] = block
+        self.codes.append(code)
+        self.instance._code = block.children
+        return block
 
     def __exit__(self, type_, value, traceback):
-        self.instance._indent -= 1
-        self.instance._indent_last_line = self.line
+        self.instance._code = self.codes.pop()
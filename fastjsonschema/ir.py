@@ -0,0 +1,124 @@
+"""
+Intermediate representation of generated code.
+
+Generators do not join source text directly. Every line is a :any:`Statement` and
+lines used as context manager (``with self.l('if ...:')``) are :any:`Block` nodes
+with statements of their own. Structure of the code (blocks with the same condition
+merged into one, empty blocks dropped) is decided by passes over the whole tree in
+:any:`simplify` and source code is produced from it only once by :any:`emit`.
+"""
+
+# Blocks which can be dropped when there is nothing inside.
+DROPPABLE_KEYWORDS = frozenset(('if', 'elif', 'else', 'for'))
+# Blocks continuing previous block, which cannot be dropped before them.
+CONTINUATION_KEYWORDS = frozenset(('elif', 'else', 'except', 'finally'))
+
+
+class Statement:
+    """
+    One line of code. Consecutive statements with the same code are generated only
+    once unless ``merge`` is ``False``.
+    """
+
+    __slots__ = ('code', 'merge')
+
+    def __init__(self, code, merge=True):
+        self.code = code
+        self.merge = merge
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self.code)
+
+    @property
+    def keyword(self):
+        """
+        Python keyword starting the code, such as ``if`` or ``for``.
+        """
+        return self.code.split(' ', 1)[0].rstrip(':')
+
+    def is_empty(self):
+        """
+        Returns whether nothing is done by this node.
+        """
+        return self.code == 'pass'
+
+
+class Block(Statement):
+    """
+    Line of code starting a block (such as ``if`` or ``for``) with its ``children``.
+    Consecutive blocks with the same code are merged into one unless ``merge`` is
+    ``False``.
+    """
+
+    __slots__ = ('children',)
+
+    def __init__(self, code, merge=True, children=None):
+        super().__init__(code, merge)
+        self.children = children if children is not None else []
+
+    def __repr__(self):
+        return '{}({!r}, {!r})'.format(self.__class__.__name__, self.code, self.children)
+
+    def is_empty(self):
+        return self.keyword in DROPPABLE_KEYWORDS and all(child.is_empty() for child in self.children)
+
+
+def simplify(nodes):
+    """
+    Returns ``nodes`` after all passes.
+    """
+    return drop_empty_blocks(merge_blocks(nodes))
+
+
+def merge_blocks(nodes):
+    """
+    Merges consecutive blocks with the same code (such as checks that value is dict
+    by several keywords) into one and removes repeated statements.
+    """
+    result = []
+    for node in nodes:
+        previous = result[-1] if result else None
+        if (
+            node.merge and previous is not None and previous.code == node.code
+            and isinstance(previous, Block) is isinstance(node, Block)
+        ):
+            if isinstance(node, Block):
+                previous.children.extend(node.children)
+            continue
+        result.append(node)
+    for node in result:
+        if isinstance(node, Block):
+            node.children = merge_blocks(node.children)
+    return result
+
+
+def drop_empty_blocks(nodes):
+    """
+    Drops blocks with nothing to do. Block which has to stay because the following
+    one continues it (such as ``if`` followed by ``else``) gets ``pass`` instead.
+    """
+    result = []
+    for index, node in enumerate(nodes):
+        if isinstance(node, Block):
+            node.children = [child for child in drop_empty_blocks(node.children) if child.code != 'pass']
+            if not node.children:
+                following = nodes[index + 1] if index + 1 < len(nodes) else None
+                continued = following is not None and following.keyword in CONTINUATION_KEYWORDS
+                if node.keyword in DROPPABLE_KEYWORDS and not continued:
+                    continue
+                node.children.append(Statement('pass'))
+        result.append(node)
+    return result
+
+
+def emit(nodes, indent=4, level=0):
+    """
+    Returns lines of source code of ``nodes`` indented by ``indent`` spaces per level.
+    """
+    lines = []
+    spaces = ' ' * indent * level
+    for node in nodes:
+        lines.append(spaces + node.code if node.code else '')
+        if isinstance(node, Block):
+            lines.extend(emit(node.children, indent, level + 1))
+    return lines
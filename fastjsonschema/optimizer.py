@@ -0,0 +1,266 @@
+"""
+Optimization of JSON schema definition before generating code from it.
+
+Generators turn definition into code keyword by keyword, so redundant structure
+would be compiled as it is. :any:`optimize_definition` returns equivalent definition with:
+
+ * ``allOf`` members merged into the definition when keywords do not conflict
+   (same keywords with the same value, intersection of ``type``, the strictest
+   bounds and union of ``required``), nested ``allOf`` flattened and members
+   which are always valid dropped,
+ * ``anyOf`` with a member which is always valid dropped,
+ * ``not`` of ``not`` replaced by the definition itself.
+
+Validation results stay the same. Names of invalid values and rules in exceptions
+stay the same as well, but exceptions report the optimized definition. Parts of the
+definition referenced by ``$ref`` (and everything containing them) are kept, and
+nothing is changed when definition uses ``$id`` in subschemas or ``$ref`` by name.
+Definitions with ``default`` or content keywords (which change validated data)
+are not merged or dropped.
+"""
+
+from urllib.parse import unquote, urldefrag
+
+from .canonical import canonical
+
+
+# Keywords with subschema as value.
+SCHEMA_KEYWORDS = frozenset((
+    'additionalItems', 'additionalProperties', 'contains', 'propertyNames', 'not', 'if', 'then', 'else',
+))
+# Keywords with list of subschemas as value.
+SCHEMAS_LIST_KEYWORDS = frozenset(('allOf', 'anyOf', 'oneOf'))
+# Keywords with object of subschemas as value.
+SCHEMAS_OBJECT_KEYWORDS = frozenset(('properties', 'patternProperties', 'definitions', '$defs'))
+# Keywords changing validated data, their definitions cannot be moved.
+SIDE_EFFECT_KEYWORDS = frozenset(('default', 'contentEncoding', 'contentMediaType'))
+# Keywords meaning of which depends on other keywords of the same definition.
+# Definitions can be merged only when at most one of them uses each group.
+KEYWORD_GROUPS = (
+    frozenset(('properties', 'patternProperties', 'additionalProperties')),
+    frozenset(('items', 'additionalItems')),
+    frozenset(('if', 'then', 'else')),
+    frozenset(('minimum', 'exclusiveMinimum')),
+    frozenset(('maximum', 'exclusiveMaximum')),
+    # Required properties are checked against additionalProperties when generating code.
+    frozenset(('required', 'additionalProperties')),
+)
+# Keywords which prevent any merging.
+UNMERGEABLE_KEYWORDS = frozenset((
+    '$ref', '$id', 'id', '$anchor', '$recursiveRef', '$recursiveAnchor', 'unevaluatedProperties',
+    'unevaluatedItems',
+))
+JSON_TYPES = frozenset(('null', 'boolean', 'object', 'array', 'number', 'integer', 'string'))
+
+
+def optimize_definition(definition, boolean_schemas=True):
+    """
+    Returns optimized copy of ``definition``, it is not changed. Pass ``boolean_schemas``
+    as ``False`` for draft-04 which does not allow ``true`` as definition.
+    """
+    if not isinstance(definition, dict):
+        return definition
+    referenced = set()
+    if not _collect_refs(definition, referenced, True):
+        return definition
+    return Optimizer(referenced, boolean_schemas).optimize(definition, ())[0]
+
+
+def _collect_refs(definition, referenced, root=False):
+    """
+    Adds paths referenced by JSON pointers in ``$ref`` of ``definition`` and all paths
+    containing them (except the root) to ``referenced``. Returns ``False`` when some
+    subschema has ``$id`` or some ``$ref`` is not JSON pointer, paths are not known then.
+    """
+    items = [(definition, root)]
+    while items:
+        item, is_root = items.pop()
+        if isinstance(item, list):
+            items.extend((value, False) for value in item)
+            continue
+        if not isinstance(item, dict):
+            continue
+        if not is_root and (isinstance(item.get('$id'), str) or isinstance(item.get('id'), str)):
+            return False
+        ref = item.get('$ref')
+        if isinstance(ref, str):
+            fragment = urldefrag(ref)[1]
+            if fragment and not fragment.startswith('/'):
+                return False
+            path = tuple(
+                unquote(token).replace('~1', '/').replace('~0', '~')
+                for token in fragment.split('/')[1:]
+            )
+            referenced.update(path[:index] for index in range(1, len(path) + 1))
+        items.extend((value, False) for value in item.values())
+    return True
+
+
+class Optimizer:
+    """
+    This class is not supposed to be used directly, use :any:`optimize_definition`.
+    """
+
+    def __init__(self, referenced, boolean_schemas):
+        self._referenced = referenced
+        self._boolean_schemas = boolean_schemas
+
+    def optimize(self, definition, path):
+        """
+        Returns optimized ``definition`` at ``path`` and whether it (or any subschema)
+        has keywords changing validated data.
+        """
+        if not isinstance(definition, dict):
+            return definition, False
+        if '$ref' in definition:
+            # Other keywords are ignored, only referenced definition is used.
+            return definition, False
+
+        result = {}
+        side_effects = False
+        for key, value in definition.items():
+            if key in SCHEMA_KEYWORDS:
+                value, effects = self.optimize(value, path + (key,))
+            elif key in SCHEMAS_LIST_KEYWORDS or key == 'items' and isinstance(value, list):
+                value, effects = self._optimize_list(value, path + (key,))
+            elif key in SCHEMAS_OBJECT_KEYWORDS or key == 'dependencies' and isinstance(value, dict):
+                value, effects = self._optimize_object(value, path + (key,))
+            elif key == 'items':
+                value, effects = self.optimize(value, path + (key,))
+            else:
+                effects = key in SIDE_EFFECT_KEYWORDS
+            result[key] = value
+            side_effects = side_effects or effects
+
+        # Changed keywords would break JSON pointers going inside of them.
+        changed = (path + ('allOf',), path + ('anyOf',), path + ('not',))
+        if not side_effects and self._referenced.isdisjoint(changed):
+            self._fold_not(result)
+            self._drop_any_of(result)
+            self._merge_all_of(result)
+        return result, side_effects
+
+    def _optimize_list(self, definitions, path):
+        if not isinstance(definitions, list):
+            return definitions, False
+        optimized = [self.optimize(item, path + (str(index),)) for index, item in enumerate(definitions)]
+        return [item for item, _ in optimized], any(effects for _, effects in optimized)
+
+    def _optimize_object(self, definitions, path):
+        if not isinstance(definitions, dict):
+            return definitions, False
+        optimized = {key: self.optimize(item, path + (key,)) for key, item in definitions.items()}
+        return {key: item for key, (item, _) in optimized.items()}, any(effects for _, effects in optimized.values())
+
+    def _is_always_valid(self, definition):
+        return definition == {} or (self._boolean_schemas and definition is True)
+
+    def _fold_not(self, definition):
+        """
+        Replaces ``{'not': {'not': X}}`` by ``{'allOf': [X]}`` which is merged later.
+        """
+        negated = definition.get('not')
+        if not isinstance(negated, dict) or list(negated) != ['not']:
+            return
+        if not isinstance(definition.get('allOf', []), list):
+            return
+        if not isinstance(negated['not'], dict) and not self._boolean_schemas:
+            return
+        del definition['not']
+        definition['allOf'] = definition.get('allOf', []) + [negated['not']]
+
+    def _drop_any_of(self, definition):
+        any_of = definition.get('anyOf')
+        if isinstance(any_of, list) and any(self._is_always_valid(item) for item in any_of):
+            del definition['anyOf']
+
+    def _merge_all_of(self, definition):
+        all_of = definition.get('allOf')
+        if not isinstance(all_of, list) or not all_of:
+            return
+        members = []
+        items = list(reversed(all_of))
+        while items:
+            item = items.pop()
+            if self._is_always_valid(item):
+                continue
+            if isinstance(item, dict) and list(item) == ['allOf'] and isinstance(item['allOf'], list):
+                items.extend(reversed(item['allOf']))
+                continue
+            members.append(item)
+
+        del definition['allOf']
+        remaining = [member for member in members if not self._merge(definition, member)]
+        if remaining:
+            definition['allOf'] = remaining
+
+    def _merge(self, definition, member):
+        """
+        Merges keywords of ``member`` into ``definition`` when it is possible without
+        changing meaning of any keyword and returns whether it was done.
+        """
+        if not isinstance(member, dict) or UNMERGEABLE_KEYWORDS.intersection(member):
+            return False
+        if UNMERGEABLE_KEYWORDS.intersection(definition):
+            return False
+        for group in KEYWORD_GROUPS:
+            keys, member_keys = group.intersection(definition), group.intersection(member)
+            if keys and member_keys and (len(keys) > 1 or keys != member_keys):
+                return False
+        merged = {}
+        for key, value in member.items():
+            if key not in definition:
+                merged[key] = value
+                continue
+            merged_value = _merge_keyword(key, definition[key], value)
+            if merged_value is None:
+                return False
+            merged[key] = merged_value
+        definition.update(merged)
+        return True
+
+
+def _merge_keyword(key, value, other):
+    """
+    Returns value of keyword ``key`` valid only when both ``value`` and ``other``
+    are valid, or ``None`` when it cannot be expressed by one keyword.
+    """
+    if _is_same(value, other):
+        return value
+    if key == 'type':
+        return _merge_types(value, other)
+    if key in ('minimum', 'minLength', 'minItems', 'minProperties') and _are_numbers(value, other):
+        return max(value, other)
+    if key in ('maximum', 'maxLength', 'maxItems', 'maxProperties') and _are_numbers(value, other):
+        return min(value, other)
+    if key == 'required' and isinstance(value, list) and isinstance(other, list):
+        return value + [item for item in other if item not in value]
+    return None
+
+
+def _merge_types(value, other):
+    types = value if isinstance(value, list) else [value]
+    other_types = other if isinstance(other, list) else [other]
+    if not JSON_TYPES.issuperset(types) or not JSON_TYPES.issuperset(other_types):
+        return None
+    merged = []
+    for type_ in types:
+        if type_ in other_types:
+            merged.append(type_)
+        elif (type_ == 'integer' and 'number' in other_types) or (type_ == 'number' and 'integer' in other_types):
+            # Integers are numbers as well.
+            merged.append('integer')
+    merged = [type_ for index, type_ in enumerate(merged) if type_ not in merged[:index]]
+    if not merged:
+        return None
+    return merged[0] if len(merged) == 1 else merged
+
+
+def _are_numbers(*values):
+    return all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values)
+
+
+def _is_same(value, other):
+    if isinstance(value, bool) or isinstance(other, bool):
+        return value is other
+    return canonical(value) == canonical(other)
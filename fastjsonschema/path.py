@@ -0,0 +1,22 @@
+"""
+Paths of validated values used by generated code for names in error messages.
+
+Validation function of referenced definition gets path of its data as chain of
+tuples ``(parent, template, args)`` which is cheap to create for every call. It is
+rendered to string (such as ``data.a[1]``) only when an exception is raised.
+"""
+
+
+def render_path(path):
+    """
+    Returns string of ``path`` passed to generated function as ``name_prefix``.
+    It can be ``None`` for root data, string or chain of tuples ``(parent,
+    template, args)`` where ``template`` is formatted by ``args`` and appended to
+    rendered ``parent``.
+    """
+    parts = []
+    while isinstance(path, tuple):
+        path, template, args = path
+        parts.append(template.format(*args))
+    parts.append(path or 'data')
+    return ''.join(reversed(parts))
@@ -0,0 +1,216 @@
+"""
+Lowering of simple regular expressions of keyword ``pattern`` to string operations.
+
+Many patterns are just a prefix (``^abc``), a suffix (``abc$``), few alternatives
+(``^(abc|def)$``) or a fixed set of characters (``^[A-Z]{3}$``). Methods of ``str``
+such as ``startswith`` are several times faster than searching by regular expression,
+so such patterns are validated by them. Any other pattern returns ``None`` and it is
+validated by :mod:`re` as before.
+
+Patterns are expected to be searched (not matched) with ``$`` meaning the end of
+the string (as ``\\Z``), the same way as the keyword ``pattern`` is validated.
+"""
+
+import string
+
+
+# Characters which can be escaped by backslash to be used literally.
+ESCAPABLE = frozenset(string.punctuation)
+METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+MAX_CHARSET_SIZE = 256
+
+
+def pattern_to_condition(pattern, variable):
+    """
+    Returns code of condition equivalent to searching ``pattern`` in ``variable``
+    (which has to be a string) or ``None`` when the pattern is not simple enough.
+    """
+    starts = pattern.startswith('^')
+    body = pattern[1:] if starts else pattern
+    ends = body.endswith('$') and not _is_escaped(body, len(body) - 1)
+    if ends:
+        body = body[:-1]
+
+    alternatives = _parse_alternatives(body, anchored=starts or ends)
+    if alternatives is not None:
+        return _alternatives_condition(alternatives, variable, starts, ends)
+    if starts and ends:
+        return _repeated_charset_condition(body, variable)
+    return None
+
+
+def _alternatives_condition(alternatives, variable, starts, ends):
+    alternatives = list(dict.fromkeys(alternatives))
+    if len(alternatives) == 1:
+        value = repr(alternatives[0])
+    else:
+        value = '({})'.format(', '.join(repr(alternative) for alternative in alternatives))
+    if starts and ends:
+        if len(alternatives) == 1:
+            return '{} == {}'.format(variable, value)
+        return '{} in {}'.format(variable, value)
+    if starts:
+        return '{}.startswith({})'.format(variable, value)
+    if ends:
+        return '{}.endswith({})'.format(variable, value)
+    return '({})'.format(' or '.join(
+        '{!r} in {}'.format(alternative, variable) for alternative in alternatives
+    ))
+
+
+def _parse_alternatives(body, anchored):
+    """
+    Returns list of literal strings from ``abc`` or ``(abc|def)`` or ``(?:abc|def)``
+    (or ``abc|def`` when the pattern is not anchored, because ``^abc|def`` means
+    ``abc`` at the start or ``def`` anywhere).
+    """
+    if body.startswith('(?:') and body.endswith(')') and not _is_escaped(body, len(body) - 1):
+        body = body[3:-1]
+    elif body.startswith('(') and body.endswith(')') and not _is_escaped(body, len(body) - 1):
+        body = body[1:-1]
+    elif anchored and _find_unescaped(body, '|'):
+        return None
+    alternatives = []
+    start = 0
+    for index in _find_unescaped(body, '|') + [len(body)]:
+        literal = _parse_literal(body[start:index])
+        if literal is None:
+            return None
+        alternatives.append(literal)
+        start = index + 1
+    return alternatives
+
+
+def _parse_literal(text):
+    result = []
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char == '\\':
+            if index + 1 == len(text) or text[index + 1] not in ESCAPABLE:
+                return None
+            result.append(text[index + 1])
+            index += 2
+            continue
+        if char in METACHARACTERS:
+            return None
+        result.append(char)
+        index += 1
+    return ''.join(result)
+
+
+def _repeated_charset_condition(body, variable):  # pylint: disable=too-many-branches
+    """
+    Returns condition for ``[charset]`` or ``\\d`` followed by optional quantifier
+    (``+``, ``*``, ``{n}``, ``{n,}`` or ``{n,m}``) matching the whole string.
+    """
+    if body.startswith('\\d'):
+        charset, rest = None, body[2:]
+    elif body.startswith('['):
+        end = body.find(']', 1)
+        while end != -1 and _is_escaped(body, end):
+            end = body.find(']', end + 1)
+        if end == -1:
+            return None
+        charset, rest = _parse_charset(body[1:end]), body[end + 1:]
+        if not charset:
+            return None
+    else:
+        return None
+
+    quantifier = _parse_quantifier(rest)
+    if quantifier is None:
+        return None
+    minimum, maximum = quantifier
+
+    conditions = []
+    if minimum == maximum:
+        conditions.append('len({}) == {}'.format(variable, minimum))
+    elif maximum is not None:
+        conditions.append('{} <= len({}) <= {}'.format(minimum, variable, maximum))
+    elif minimum == 1 and charset is not None:
+        # Not needed for \d as empty string is not decimal.
+        conditions.append(variable)
+    elif minimum > 1:
+        conditions.append('len({}) >= {}'.format(variable, minimum))
+    if maximum == 0:
+        return conditions[0]
+    if charset is None:
+        # Same as \d in regular expression, any decimal digit in Unicode (not only 0-9).
+        if minimum == 0:
+            conditions.append('(not {0} or {0}.isdecimal())'.format(variable))
+        else:
+            conditions.append('{}.isdecimal()'.format(variable))
+    else:
+        # Stripping all allowed characters leaves empty string only if there is no other.
+        conditions.append('not {}.strip({!r})'.format(variable, charset))
+    return ' and '.join(conditions)
+
+
+def _parse_charset(text):  # pylint: disable=too-many-return-statements
+    if not text or text.startswith('^'):
+        return None
+    chars = []
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char == '\\':
+            if index + 1 == len(text) or text[index + 1] not in ESCAPABLE:
+                return None
+            char = text[index + 1]
+            index += 2
+        elif char == '[':
+            # Could be a nested set in future versions of Python.
+            return None
+        else:
+            index += 1
+        if index + 1 < len(text) and text[index] == '-':
+            last = text[index + 1]
+            if last in '\\[]':
+                return None
+            if ord(last) < ord(char) or ord(last) - ord(char) > MAX_CHARSET_SIZE:
+                return None
+            chars.extend(chr(code) for code in range(ord(char), ord(last) + 1))
+            index += 2
+        else:
+            chars.append(char)
+    chars = ''.join(dict.fromkeys(chars))
+    if len(chars) > MAX_CHARSET_SIZE:
+        return None
+    return chars
+
+
+def _parse_quantifier(text):  # pylint: disable=too-many-return-statements
+    if text == '':
+        return 1, 1
+    if text == '+':
+        return 1, None
+    if text == '*':
+        return 0, None
+    if not (text.startswith('{') and text.endswith('}')):
+        return None
+    parts = text[1:-1].split(',')
+    if len(parts) > 2 or not all(part.isascii() and part.isdigit() for part in parts if part):
+        return None
+    if len(parts) == 1:
+        if not parts[0]:
+            return None
+        return int(parts[0]), int(parts[0])
+    if not parts[0]:
+        return None
+    minimum = int(parts[0])
+    maximum = int(parts[1]) if parts[1] else None
+    if maximum is not None and maximum < minimum:
+        return None
+    return minimum, maximum
+
+
+def _is_escaped(text, index):
+    backslashes = 0
+    while index - backslashes > 0 and text[index - backslashes - 1] == '\\':
+        backslashes += 1
+    return backslashes % 2 == 1
+
+
+def _find_unescaped(text, char):
+    return [index for index, item in enumerate(text) if item == char and not _is_escaped(text, index)]
@@ -159,6 +159,14 @@ class RefResolver:
         finally:
             self.base_uri, self.schema = old_base_uri, old_schema
 
+    def is_available(self, ref: str):
+        """
+        Returns whether document of ``ref`` is known, so resolving it does not
+        need to fetch it.
+        """
+        uri = urlparse.urldefrag(urlparse.urljoin(self.resolution_scope, ref))[0]
+        return not uri or uri == self.base_uri or normalize(uri) in self.store
+
     def _ensure_walked(self, uri, schema):
         normalized = normalize(uri) if uri else ''
         if normalized in self._walked_uris:
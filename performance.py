@@ -75,6 +75,8 @@ VALUES_BAD = (
 
 fastjsonschema_validate = fastjsonschema.compile(JSON_SCHEMA)
 fastjsonschema_validate_without_exc = fastjsonschema.compile(JSON_SCHEMA, detailed_exceptions=False)
+fastjsonschema_validate_return_bool = fastjsonschema.compile(JSON_SCHEMA, return_bool=True)
+fastjsonschema_validate_json_input = fastjsonschema.compile(JSON_SCHEMA, json_input=True)
 
 
 def fast_compiled(value, _):
@@ -89,6 +91,14 @@ def fast_compiled_without_exc(value, _):
     fastjsonschema_validate_without_exc(value)
 
 
+def fast_compiled_return_bool(value, _):
+    fastjsonschema_validate_return_bool(value)
+
+
+def fast_compiled_json_input(value, _):
+    fastjsonschema_validate_json_input(value)
+
+
 validator_class = jsonschema.validators.validator_for(JSON_SCHEMA)
 validator = validator_class(JSON_SCHEMA)
 
@@ -124,6 +134,8 @@ def t(func, valid_values=True):
         jsonspec,
         fast_compiled,
         fast_compiled_without_exc,
+        fast_compiled_return_bool,
+        fast_compiled_json_input,
         fast_file,
         fast_not_compiled,
         jsonschema_compiled,
@@ -156,6 +168,12 @@ t('fast_compiled', valid_values=False)
 t('fast_compiled_without_exc')
 t('fast_compiled_without_exc', valid_values=False)
 
+t('fast_compiled_return_bool')
+t('fast_compiled_return_bool', valid_values=False)
+
+t('fast_compiled_json_input')
+t('fast_compiled_json_input', valid_values=False)
+
 t('fast_file')
 t('fast_file', valid_values=False)
 
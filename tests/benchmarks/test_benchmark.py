@@ -1,6 +1,8 @@
 import pytest
 
 import fastjsonschema
+from fastjsonschema.draft07 import CodeGeneratorDraft07
+from fastjsonschema.formats import NATIVE_FORMATS
 
 
 JSON_SCHEMA = {
@@ -45,6 +47,56 @@ JSON_SCHEMA = {
 
 
 fastjsonschema_validate = fastjsonschema.compile(JSON_SCHEMA)
+fastjsonschema_validate_json_input = fastjsonschema.compile(JSON_SCHEMA, json_input=True)
+
+EVENTS_JSON_SCHEMA = {
+    'oneOf': [
+        {
+            'type': 'object',
+            'properties': {
+                'type': {'const': 'event{}'.format(index)},
+                'value': {'type': 'integer'},
+            },
+            'required': ['type', 'value'],
+        }
+        for index in range(80)
+    ],
+}
+
+fastjsonschema_validate_events = fastjsonschema.compile(EVENTS_JSON_SCHEMA)
+fastjsonschema_validate_objects = fastjsonschema.compile({
+    'type': 'array',
+    'items': {
+        'type': 'object',
+        'required': ['id', 'name'],
+        'properties': {
+            'id': {'type': 'integer'},
+            'name': {'type': 'string'},
+            'tags': {'type': 'array'},
+        },
+        'additionalProperties': False,
+    },
+})
+fastjsonschema_validate_wide_object = fastjsonschema.compile({
+    'type': 'object',
+    'properties': {'id': {'type': 'integer'}},
+    'patternProperties': {'^x-': {'type': 'string'}},
+    'additionalProperties': {'type': 'number'},
+})
+fastjsonschema_validate_patterns = fastjsonschema.compile({
+    'type': 'array',
+    'items': [
+        {'type': 'string', 'pattern': '^[A-Z]{3}$'},
+        {'type': 'string', 'pattern': '^https://'},
+        {'type': 'string', 'pattern': '^(draft|published|archived)$'},
+    ],
+})
+fastjsonschema_validate_codes = fastjsonschema.compile({'enum': ['code{}'.format(index) for index in range(5000)]})
+fastjsonschema_validate_unique_items = fastjsonschema.compile({'type': 'array', 'uniqueItems': True})
+
+FORMAT_VALUES = {
+    'ipv6': ('2001:db8:85a3::8a2e:370:7334', '2001:db8:85a3::8a2e:370:7334:1:2'),
+}
 
 
 @pytest.mark.benchmark(min_rounds=20)
@@ -60,6 +112,17 @@ def test_benchmark_ok_values(benchmark, value):
         fastjsonschema_validate(value)
 
 
+@pytest.mark.benchmark(min_rounds=20)
+@pytest.mark.parametrize('value', (
+    [9, 'hello', [1, 'a', True], {'a': 'a', 'b': 'b', 'd': 'd'}, 42, 3],
+    [9, 'world', [1, 'a', True], {'a': 'a', 'b': 'b', 'c': 'xy'}, 'str', 5],
+))
+def test_benchmark_json_input_ok_values(benchmark, value):
+    @benchmark
+    def f():
+        fastjsonschema_validate_json_input(value)
+
+
 @pytest.mark.benchmark(min_rounds=20)
 @pytest.mark.parametrize('value', (
     [10, 'world', [1, 'a', True], {'a': 'a', 'b': 'b', 'c': 'xy'}, 'str', 5],
@@ -80,3 +143,189 @@ def test_benchmark_bad_values(benchmark, value):
             pass
         else:
             pytest.fail('Exception is not raised')
+
+
+@pytest.mark.benchmark(min_rounds=20)
+@pytest.mark.parametrize('value', (
+    b'[9, "hello", [1, "a", true], {"a": "a", "b": "b", "d": "d"}, 42, 3]',
+    b'[9, "world", [1, "a", true], {"a": "a", "b": "b", "c": "xy"}, "str", 5]',
+))
+def test_benchmark_bytes(benchmark, value):
+    @benchmark
+    def f():
+        fastjsonschema_validate.validate_bytes(value, max_size=1024)
+
+
+@pytest.mark.benchmark(min_rounds=20)
+@pytest.mark.parametrize('value', (
+    {'type': 'event0', 'value': 1},
+    {'type': 'event79', 'value': 1},
+))
+def test_benchmark_discriminated_one_of(benchmark, value):
+    @benchmark
+    def f():
+        fastjsonschema_validate_events(value)
+
+
+@pytest.mark.benchmark(min_rounds=20)
+@pytest.mark.parametrize('value', ('code0', 'code4999'))
+def test_benchmark_big_enum(benchmark, value):
+    @benchmark
+    def f():
+        fastjsonschema_validate_codes(value)
+
+
+@pytest.mark.benchmark(min_rounds=20)
+def test_benchmark_objects(benchmark):
+    value = [{'id': index, 'name': 'name', 'tags': []} for index in range(1000)]
+
+    @benchmark
+    def f():
+        fastjsonschema_validate_objects(value)
+
+
+@pytest.mark.benchmark(min_rounds=20)
+def test_benchmark_wide_object(benchmark):
+    value = {'id': 1}
+    value.update(('x-{}'.format(index), 'value') for index in range(1000))
+    value.update(('key{}'.format(index), index) for index in range(1000))
+
+    @benchmark
+    def f():
+        fastjsonschema_validate_wide_object(value)
+
+
+@pytest.mark.benchmark(min_rounds=20)
+def test_benchmark_simple_patterns(benchmark):
+    @benchmark
+    def f():
+        fastjsonschema_validate_patterns(['USD', 'https://example.com', 'published'])
+
+
+@pytest.mark.benchmark(min_rounds=20)
+@pytest.mark.parametrize('value', (
+    list(range(1000)),
+    ['item{}'.format(index) for index in range(1000)],
+    [{'id': index} for index in range(1000)],
+), ids=('numbers', 'strings', 'objects'))
+def test_benchmark_unique_items(benchmark, value):
+    @benchmark
+    def f():
+        fastjsonschema_validate_unique_items(value)
+
+
+@pytest.mark.benchmark(min_rounds=20)
+@pytest.mark.parametrize('items_definition, value', (
+    ({'type': 'number', 'minimum': 0, 'maximum': 100}, [index % 100 for index in range(1000)]),
+    ({'type': 'string', 'maxLength': 10}, ['item{}'.format(index) for index in range(1000)]),
+    ({'type': 'string', 'enum': ['draft', 'published']}, ['draft', 'published'] * 500),
+    ({'type': 'string', 'pattern': '^[a-z]+[0-9]+$'}, ['item{}'.format(index) for index in range(1000)]),
+), ids=('numbers', 'strings', 'enum', 'pattern'))
+def test_benchmark_homogeneous_items(benchmark, items_definition, value):
+    validate = fastjsonschema.compile({'type': 'array', 'items': items_definition})
+
+    @benchmark
+    def f():
+        validate(value)
+
+
+@pytest.mark.benchmark(min_rounds=20)
+@pytest.mark.parametrize('multiple_of, value', (
+    (3, 123456),
+    (3, 1234.5),
+    (0.01, 123456),
+    (0.01, 1234.0),
+    (0.01, 1234.56),
+), ids=('int-int', 'int-float', 'float-int', 'float-integral-float', 'float-float'))
+def test_benchmark_multiple_of(benchmark, multiple_of, value):
+    validate = fastjsonschema.compile({'type': 'number', 'multipleOf': multiple_of}, return_bool=True)
+
+    @benchmark
+    def f():
+        for _ in range(1000):
+            validate(value)
+
+
+@pytest.mark.benchmark(min_rounds=20)
+@pytest.mark.parametrize('format_name', sorted(FORMAT_VALUES))
+@pytest.mark.parametrize('valid', (True, False), ids=('valid', 'invalid'))
+@pytest.mark.parametrize('native', (False, True), ids=('regex', 'native'))
+def test_benchmark_formats(benchmark, format_name, valid, native):
+    formats = {format_name: NATIVE_FORMATS[format_name]} if native else {}
+    validate = fastjsonschema.compile({'format': format_name}, formats=formats, return_bool=True)
+    value = FORMAT_VALUES[format_name][0 if valid else 1]
+    assert validate(value) is valid
+
+    @benchmark
+    def f():
+        for _ in range(1000):
+            validate(value)
+
+
+BATCH_DEFINITION = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'integer', 'minimum': 1},
+        'price': {'type': 'number', 'minimum': 0, 'maximum': 1000},
+        'state': {'type': 'string', 'enum': ['new', 'paid', 'sent']},
+    },
+    'required': ['id', 'price', 'state'],
+}
+BATCH_RECORDS = [{'id': index + 1, 'price': index % 1000, 'state': 'paid'} for index in range(10000)]
+
+
+@pytest.mark.benchmark(min_rounds=20)
+@pytest.mark.parametrize('columns', (False, True), ids=('loop', 'columns'))
+def test_benchmark_batch(benchmark, columns):
+    numpy = pytest.importorskip('numpy')
+    validate = fastjsonschema.compile(BATCH_DEFINITION)
+    batch = {
+        name: numpy.array([record[name] for record in BATCH_RECORDS])
+        for name in BATCH_DEFINITION['properties']
+    }
+
+    @benchmark
+    def f():
+        if columns:
+            assert validate.validate_batch(batch) == []
+        else:
+            for record in BATCH_RECORDS:
+                validate(record)
+
+
+def synthetic_definition(properties_count):
+    return {
+        'type': 'object',
+        'properties': {
+            'property{}'.format(index): {
+                'type': 'object',
+                'properties': {'value': {'type': 'integer', 'minimum': 0}, 'name': {'type': 'string'}},
+                'required': ['value'],
+            }
+            for index in range(properties_count)
+        },
+    }
+
+
+@pytest.mark.benchmark(group='code-generation')
+@pytest.mark.parametrize('properties_count', (100, 1000, 10000))
+def test_benchmark_code_generation(benchmark, properties_count):
+    # Time of generating code should grow linearly with size of definition.
+    definition = synthetic_definition(properties_count)
+
+    def f():
+        CodeGeneratorDraft07(definition).func_code
+
+    benchmark.pedantic(f, rounds=max(1, 10000 // properties_count))
+
+
+@pytest.mark.benchmark(group='compile')
+@pytest.mark.parametrize('properties_count', (100, 1000))
+def test_benchmark_compile(benchmark, properties_count):
+    # Definitions reported by exceptions are passed to generated code as objects.
+    definition = synthetic_definition(properties_count)
+
+    def f():
+        fastjsonschema.compile(definition)
+
+    benchmark.pedantic(f, rounds=max(1, 1000 // properties_count))
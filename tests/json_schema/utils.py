@@ -1,4 +1,5 @@
 import json
+from copy import deepcopy
 from pathlib import Path
 from urllib.parse import urldefrag, urlsplit, urlunsplit
 
@@ -117,12 +118,27 @@ def template_test(schema_version, schema, data, is_valid):
         schema.setdefault('$schema', schema_version)
 
     validate = compile(schema, handlers=SCHEMA_HANDLERS)
+    # Results of keys are cached across calls, the second call has to give the same result.
+    validate_bool = compile(schema, handlers=SCHEMA_HANDLERS, return_bool=True, key_cache_size=16)
+    is_valid_result = validate_bool(deepcopy(data))
+    assert validate_bool(deepcopy(data)) is is_valid_result
+    # Test suite data are decoded from JSON, the result has to be the same with exact type checks.
+    is_valid_json_result = compile(schema, handlers=SCHEMA_HANDLERS, return_bool=True, json_input=True)(deepcopy(data))
+    # Optimized definition has to give the same result, also when redundant structure is added around.
+    validate_optimized = compile(schema, handlers=SCHEMA_HANDLERS, return_bool=True, optimize=True)
+    assert validate_optimized(deepcopy(data)) is is_valid_result
+    if not any(key in json.dumps(schema) for key in ('"$ref"', '"$id"', '"id"', '"$anchor"')):
+        redundant_schema = {'$schema': schema_version, 'allOf': [{'not': {'not': schema}}, {'allOf': [{}]}]}
+        validate_redundant = compile(redundant_schema, handlers=SCHEMA_HANDLERS, return_bool=True, optimize=True)
+        assert validate_redundant(deepcopy(data)) is is_valid_result
     try:
         result = validate(data)
         print('Validate result:', result)
     except JsonSchemaValueException:
+        assert is_valid_result is is_valid_json_result is False
         if is_valid:
             raise
     else:
+        assert is_valid_result is is_valid_json_result is True
         if not is_valid:
             pytest.fail('Test should not pass')
@@ -1,6 +1,8 @@
+from decimal import Decimal
+
 import pytest
 
-from fastjsonschema import JsonSchemaValueException
+from fastjsonschema import JsonSchemaValueException, compile_to_code
 
 
 exc = JsonSchemaValueException('data must be array', value='{data}', name='data', definition='{definition}', rule='type')
@@ -65,6 +67,13 @@ def test_min_items(asserter, value, expected):
     ([[1, 2], [1, 2]], JsonSchemaValueException('data must contain unique items', value='{data}', name='data', definition='{definition}', rule='uniqueItems')),
     ([{'a': {'b': {'c': [1, 2]}}}, {'a': {'b': {'c': [1, 2]}}}], JsonSchemaValueException('data must contain unique items', value='{data}', name='data', definition='{definition}', rule='uniqueItems')),
     ([{'a': {'b': {'c': [2, 1]}}}, {'a': {'b': {'c': [1, 2]}}}], [{'a': {'b': {'c': [2, 1]}}}, {'a': {'b': {'c': [1, 2]}}}]),
+    ([1, True], [1, True]),
+    ([0, False], [0, False]),
+    ([True, 'True'], [True, 'True']),
+    ([[1], [True]], [[1], [True]]),
+    ([1, 1.0], JsonSchemaValueException('data must contain unique items', value='{data}', name='data', definition='{definition}', rule='uniqueItems')),
+    ([[1], (1,)], JsonSchemaValueException('data must contain unique items', value='{data}', name='data', definition='{definition}', rule='uniqueItems')),
+    ([Decimal('1.5'), Decimal('1.5')], JsonSchemaValueException('data must contain unique items', value='{data}', name='data', definition='{definition}', rule='uniqueItems')),
 ])
 def test_unique_items(asserter, value, expected):
     asserter({
@@ -73,6 +82,38 @@ def test_unique_items(asserter, value, expected):
     }, value, expected)
 
 
+@pytest.mark.parametrize('items_type, value, expected', [
+    ('string', ['a', 'b'], ['a', 'b']),
+    ('string', ['a', 'a'], JsonSchemaValueException('data must contain unique items', value='{data}', name='data', definition='{definition}', rule='uniqueItems')),
+    (['number', 'null'], [1, 1.5, None], [1, 1.5, None]),
+    (['number', 'null'], [1, 1.0], JsonSchemaValueException('data must contain unique items', value='{data}', name='data', definition='{definition}', rule='uniqueItems')),
+    ('string', ['a', {'a': 1}], JsonSchemaValueException('data[1] must be string', value={'a': 1}, name='data[1]', definition={'type': 'string'}, rule='type')),
+    ('number', [1, True], JsonSchemaValueException('data[1] must be number', value=True, name='data[1]', definition={'type': 'number'}, rule='type')),
+])
+def test_unique_scalar_items(asserter, items_type, value, expected):
+    asserter({
+        'type': 'array',
+        'items': {'type': items_type},
+        'uniqueItems': True,
+    }, value, expected)
+
+
+def test_unique_items_with_ref(asserter):
+    asserter({
+        'type': 'array',
+        'definitions': {'item': {'type': ['number', 'boolean']}},
+        'items': {'$ref': '#/definitions/item', 'type': 'number'},
+        'uniqueItems': True,
+    }, [1, True], [1, True])
+
+
+def test_unique_items_of_mixed_types_compared_by_canonical_form():
+    code = compile_to_code({'items': {'type': ['number', 'boolean']}, 'uniqueItems': True})
+    assert 'has_unique_items(data)' in code
+    code = compile_to_code({'items': {'type': 'string'}, 'uniqueItems': True})
+    assert 'has_unique_scalars(data)' in code
+
+
 def test_not_unique_items(asserter):
     value = [{'id': 1}, {'id': 1}]
     asserter({
@@ -218,3 +259,41 @@ def test_additional_items_subschema_without_validation_code(asserter):
         'items': [{'type': 'string'}],
         'additionalItems': {'format': 'unknown-format'},
     }, ['a', 1], ['a', 1])
+
+
+exc = JsonSchemaValueException('data[2] must be smaller than or equal to 100', value=101, name='data[2]', definition={'type': 'number', 'minimum': 0, 'maximum': 100}, rule='maximum')
+@pytest.mark.parametrize('value, expected', [
+    ([], []),
+    ([0, 50.5, 100], [0, 50.5, 100]),
+    ([0, 50.5, 101], exc),
+    ([0, True], JsonSchemaValueException('data[1] must be number', value=True, name='data[1]', definition={'type': 'number', 'minimum': 0, 'maximum': 100}, rule='type')),
+    ([Decimal('1.5'), 2], [Decimal('1.5'), 2]),
+])
+def test_items_checked_at_once(asserter, value, expected):
+    asserter({
+        'type': 'array',
+        'items': {'type': 'number', 'minimum': 0, 'maximum': 100},
+    }, value, expected)
+
+
+@pytest.mark.parametrize('items_definition', [
+    {'type': 'integer', 'exclusiveMinimum': 0},
+    {'type': ['string', 'null']},
+    {'type': 'string', 'minLength': 1, 'maxLength': 3, 'pattern': '^a', 'enum': ['ab', 'ac']},
+    {'type': 'number', 'enum': [1, 2.5]},
+])
+def test_items_checked_at_once_code(items_definition):
+    code = compile_to_code({'$schema': 'http://json-schema.org/draft-07/schema', 'items': items_definition})
+    assert 'issuperset(map(type, data))' in code
+
+
+@pytest.mark.parametrize('items_definition', [
+    {'type': 'object'},
+    {'type': 'number', 'multipleOf': 2},
+    {'type': ['string', 'number'], 'minLength': 1},
+    {'type': 'number', 'enum': [1, True]},
+    {'minimum': 1},
+])
+def test_items_not_checked_at_once_code(items_definition):
+    code = compile_to_code({'items': items_definition})
+    assert 'issuperset' not in code
@@ -0,0 +1,143 @@
+import random
+
+import pytest
+
+import fastjsonschema
+from fastjsonschema import JsonSchemaValueException
+from fastjsonschema import batch
+from fastjsonschema.batch import _columns_definition, _record_from_columns
+
+
+RECORDS_DEFINITION = {
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'integer', 'minimum': 1},
+        'price': {'type': 'number', 'exclusiveMinimum': 0, 'maximum': 100},
+        'state': {'type': 'string', 'enum': ['new', 'paid']},
+        'note': {'type': ['string', 'null']},
+    },
+    'required': ['id', 'state'],
+}
+
+
+def _expected(func, records):
+    invalid = []
+    for index, record in enumerate(records):
+        try:
+            func(record)
+        except JsonSchemaValueException:
+            invalid.append(index)
+    return invalid
+
+
+@pytest.mark.parametrize('definition, simple', [
+    (RECORDS_DEFINITION, True),
+    ({'type': 'object'}, True),
+    ({'type': 'object', 'additionalProperties': False}, True),
+    ({'type': 'object', 'additionalProperties': {'type': 'string'}}, False),
+    ({'type': 'object', 'properties': {'a': {'type': 'string', 'minLength': 1}}}, False),
+    ({'type': 'object', 'properties': {'a': {'type': 'string', 'minimum': 1}}}, False),
+    ({'type': 'object', 'properties': {'a': {'type': 'integer', 'enum': [1, 'a']}}}, False),
+    ({'type': 'object', 'properties': {'a': {'minimum': 1}}}, False),
+    ({'properties': {'a': {'type': 'integer'}}}, False),
+    ({'type': 'array'}, False),
+    (True, False),
+])
+def test_columns_definition(definition, simple):
+    assert (_columns_definition(definition, False) is not None) is simple
+
+
+def test_validate_batch():
+    validate = fastjsonschema.compile(RECORDS_DEFINITION)
+    records = [
+        {'id': 1, 'price': 10, 'state': 'new'},
+        {'id': 0, 'price': 10, 'state': 'new'},
+        {'id': 2, 'price': 0, 'state': 'new'},
+        {'id': 3, 'price': 1.5, 'state': 'lost'},
+        {'id': 4, 'state': 'paid', 'note': None},
+        {'id': 5, 'state': 'paid', 'note': 1},
+        {'id': True, 'state': 'paid'},
+        {'state': 'paid'},
+        [],
+    ]
+    assert validate.validate_batch(records) == [1, 2, 3, 5, 6, 7, 8]
+    assert validate.validate_batch([]) == []
+
+
+def test_validate_batch_return_bool():
+    validate = fastjsonschema.compile(RECORDS_DEFINITION, return_bool=True)
+    assert validate.validate_batch([{'id': 1, 'state': 'new'}, {'id': 1}]) == [1]
+
+
+def test_validate_batch_without_numpy(monkeypatch):
+    monkeypatch.setattr(batch, 'numpy', None)
+    validate = fastjsonschema.compile(RECORDS_DEFINITION)
+    assert validate.validate_batch([{'id': 1, 'state': 'new'}, {'id': 0, 'state': 'new'}]) == [1]
+    assert validate.validate_batch({'id': [1, 0, 2], 'state': ['new', 'new', 'old']}) == [1, 2]
+
+
+def test_validate_batch_draft04_exclusive_flags():
+    validate = fastjsonschema.compile({
+        '$schema': 'http://json-schema.org/draft-04/schema',
+        'type': 'object',
+        'properties': {'a': {'type': 'number', 'minimum': 0, 'exclusiveMinimum': True}},
+    })
+    assert validate.validate_batch([{'a': 0}, {'a': 1}, {'a': -1}]) == [0, 2]
+
+
+def _random_value(rnd):
+    return rnd.choice([
+        None, True, False, 0, 1, -1, 100, 101, 0.5, 100.0, 1.0, 2 ** 53 + 1, 2 ** 70, -2 ** 70,
+        float('inf'), 'new', 'paid', 'lost', '', [], {},
+    ])
+
+
+def _random_column(rnd, numpy, count):
+    values = [_random_value(rnd) for _ in range(count)]
+    if rnd.random() < 0.5:
+        # Columns of only one type, can be NumPy arrays.
+        values = [values[0]] * count
+    if rnd.random() < 0.5:
+        if any(isinstance(value, (list, dict)) for value in values):
+            array = numpy.empty(count, dtype=object)
+            array[:] = values
+            return array
+        return numpy.array(values)
+    return values
+
+
+@pytest.mark.parametrize('additional_properties', [True, False])
+@pytest.mark.parametrize('schema', [
+    'http://json-schema.org/draft-04/schema',
+    'http://json-schema.org/draft-07/schema',
+])
+def test_validate_batch_same_as_validate(schema, additional_properties):
+    numpy = pytest.importorskip('numpy')
+    definition = dict(RECORDS_DEFINITION, additionalProperties=additional_properties)
+    definition['$schema'] = schema
+    validate = fastjsonschema.compile(definition)
+    rnd = random.Random(schema)
+    for _ in range(500):
+        columns = {
+            name: _random_column(rnd, numpy, 20)
+            for name in ('id', 'price', 'state', 'note', 'other')
+            if rnd.random() < (0.9 if name != 'other' else 0.1)
+        }
+        records = [_record_from_columns(columns, index) for index in range(20)]
+        assert validate.validate_batch(columns) == _expected(validate, records)
+        assert validate.validate_batch(records) == _expected(validate, records)
+
+
+def test_validate_batch_columns():
+    numpy = pytest.importorskip('numpy')
+    validate = fastjsonschema.compile(RECORDS_DEFINITION)
+    columns = {
+        'id': numpy.array([1, 0, 2, 3, 2 ** 60]),
+        'price': numpy.array([1.5, 2.0, 0.0, 100.0, 1.0]),
+        'state': numpy.array(['new', 'paid', 'paid', 'lost', 'new']),
+    }
+    assert validate.validate_batch(columns) == [1, 2, 3]
+    assert validate.validate_batch(dict(columns, price=columns['price'] > 1)) == [0, 1, 2, 3, 4]
+    assert validate.validate_batch(dict(columns, note=['a', None, 1, 'b', None])) == [1, 2, 3]
+    assert validate.validate_batch({'id': [1, 2], 'state': ['new']}) == [1]
+    assert validate.validate_batch({'id': numpy.array([1, 2])}) == [0, 1]
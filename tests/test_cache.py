@@ -0,0 +1,68 @@
+import re
+
+import pytest
+
+import fastjsonschema
+from fastjsonschema.cache import KeyCache, PatternsCache
+
+
+@pytest.mark.parametrize('patterns, key, expected', [
+    (['^x', 'y$'], 'x', (True, False)),
+    (['^x', 'y$'], 'xy', (True, True)),
+    (['^x', 'y$'], 'ay', (False, True)),
+    (['^x', 'y$'], 'a', (False, False)),
+    # Patterns with groups are not joined to one regular expression.
+    (['^x', '(y)\\1$'], 'xyy', (True, True)),
+    (['^x', '(y)\\1$'], 'xy', (True, False)),
+    (['^x', '(y)\\1$'], 'a', (False, False)),
+])
+def test_patterns_cache(patterns, key, expected):
+    cache = PatternsCache([re.compile(pattern) for pattern in patterns])
+    assert cache[key] == expected
+    assert cache[key] == expected
+    assert len(cache) == 1
+
+
+def test_patterns_cache_is_bounded():
+    cache = PatternsCache([re.compile('^x')], max_size=10)
+    for index in range(25):
+        assert cache['x{}'.format(index)] == (True,)
+        assert len(cache) <= 10
+
+
+def test_key_cache():
+    calls = []
+    def func(key, custom_formats):
+        calls.append(key)
+        return key.startswith('x')
+    cache = KeyCache(func, 2)
+    assert cache('x1', {}) is True
+    assert cache('y1', {}) is False
+    assert cache('x1', {}) is True
+    assert cache('x2', {}) is True  # Removes least recently used y1.
+    assert cache('y1', {}) is False
+    assert calls == ['x1', 'y1', 'x2', 'y1']
+    assert cache.cache_info() == (1, 4, 2, 2)
+    assert cache.cache_info().hit_ratio == 0.2
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+    assert cache.cache_info().hit_ratio == 0.0
+
+
+def test_compile_with_key_cache():
+    validate = fastjsonschema.compile({
+        'propertyNames': {'maxLength': 3},
+        'patternProperties': {'^x': {'type': 'string'}},
+    }, key_cache_size=10)
+    assert validate({'xa': 'a', 'b': 1}) == {'xa': 'a', 'b': 1}
+    assert validate({'xa': 'b'}) == {'xa': 'b'}
+    with pytest.raises(fastjsonschema.JsonSchemaValueException):
+        validate({'xa': 1})
+    with pytest.raises(fastjsonschema.JsonSchemaValueException):
+        validate({'long': 1})
+    assert sorted(validate.key_cache_info().values()) == [(1, 3, 10, 3), (2, 3, 10, 3)]
+
+
+def test_compile_without_key_cache():
+    validate = fastjsonschema.compile({'propertyNames': {'maxLength': 3}})
+    assert validate.key_cache_info() == {}
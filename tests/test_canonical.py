@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+import pytest
+
+from fastjsonschema.canonical import canonical, depth, has_unique_items, has_unique_scalars
+
+
+@pytest.mark.parametrize('a, b', (
+    (1, 1.0),
+    ([1, 'a'], (1.0, 'a')),
+    ({'a': 1, 'b': [None]}, {'b': [None], 'a': 1}),
+))
+def test_canonical_equal(a, b):
+    assert canonical(a) == canonical(b)
+
+
+@pytest.mark.parametrize('a, b', (
+    (1, True),
+    (0, False),
+    ('1', 1),
+    ([1], [True]),
+    ([1, 2], [2, 1]),
+    (['boolean', 1], True),
+    ([], {}),
+    ({'a': 1}, [['a', 1]]),
+))
+def test_canonical_not_equal(a, b):
+    assert canonical(a) != canonical(b)
+
+
+def test_canonical_max_depth():
+    assert canonical([[1]], 2) == canonical([[1]])
+    assert canonical([[1]], 1) != canonical([[1]])
+
+
+@pytest.mark.parametrize('value, expected', (
+    (1, 0),
+    ([], 1),
+    ({'a': [1, {'b': {}}], 'c': []}, 4),
+))
+def test_depth(value, expected):
+    assert depth(value) == expected
+
+
+def test_canonical_other_types():
+    assert canonical(Decimal('1.5')) == canonical(1.5)
+    assert canonical({1}) != canonical({1})
+
+
+@pytest.mark.parametrize('items, expected', (
+    ([], True),
+    ([1, 2, 'a'], True),
+    ([1, 1.0], False),
+    ([1, True], True),
+    ([True, 'True'], True),
+    ([{'a': [1]}, {'a': [True]}], True),
+    ([{'a': [1]}, {'a': (1,)}], False),
+))
+def test_has_unique_items(items, expected):
+    assert has_unique_items(items) is expected
+
+
+@pytest.mark.parametrize('items, expected', (
+    (['a', 'b', None], True),
+    ([1, 1.0], False),
+    ([1, [1]], True),
+    ([[1], [1]], False),
+))
+def test_has_unique_scalars(items, expected):
+    assert has_unique_scalars(items) is expected
@@ -1,6 +1,6 @@
 import pytest
 
-from fastjsonschema import JsonSchemaValueException
+from fastjsonschema import JsonSchemaValueException, compile_to_code
 
 
 exc = JsonSchemaValueException('data must be one of [1, 2, \'a\', "b\'c"]', value='{data}', name='data', definition='{definition}', rule='enum')
@@ -15,6 +15,33 @@ def test_enum(asserter, value, expected):
     asserter({'enum': [1, 2, 'a', "b'c"]}, value, expected)
 
 
+exc = JsonSchemaValueException("data must be one of ['a', 'b', 1, 2.5, True, None, [1]]", value='{data}', name='data', definition='{definition}', rule='enum')
+@pytest.mark.parametrize('value, expected', [
+    ('a', 'a'),
+    ('b', 'b'),
+    ('c', exc),
+    ('1', exc),
+    (1, 1),
+    (1.0, 1.0),
+    (2.5, 2.5),
+    (2, exc),
+    (True, True),
+    (False, exc),
+    (None, None),
+    ([1], [1]),
+    ([True], exc),
+    ({}, exc),
+])
+def test_enum_with_more_values_of_same_type(asserter, value, expected):
+    asserter({'enum': ['a', 'b', 1, 2.5, True, None, [1]]}, value, expected)
+
+
+def test_enum_in_frozenset():
+    code = compile_to_code({'enum': ['code{}'.format(index) for index in range(5000)]})
+    assert 'frozenset' in code
+    assert code.count('code4999') == 3  # In the set, in the error message and in the definition.
+
+
 exc = JsonSchemaValueException('data must be string or number', value='{data}', name='data', definition='{definition}', rule='type')
 @pytest.mark.parametrize('value, expected', [
     (0, 0),
@@ -147,3 +174,49 @@ def test_not_annotation_only_all_drafts(asserter, schema_version):
 
 def test_not_not_annotation_only(asserter):
     asserter({'not': {'not': {'title': 'x'}}}, 1, 1)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('', JsonSchemaValueException('data must be longer than or equal to 1 characters', value='{data}', name='data', definition='{definition}', rule='minLength')),
+    ('a', 'a'),
+    ([], JsonSchemaValueException('data must contain at least 1 items', value='{data}', name='data', definition='{definition}', rule='minItems')),
+    ([1], [1]),
+    ({}, {}),
+    (1, 1),
+])
+def test_keywords_of_more_types(asserter, value, expected):
+    asserter({'minLength': 1, 'minItems': 1}, value, expected)
+
+
+def test_keywords_of_same_type_check_type_once():
+    code = compile_to_code({
+        'minLength': 1,
+        'maxLength': 5,
+        'pattern': '^a',
+        'minimum': 1,
+        'multipleOf': 2,
+    })
+    assert code.count('isinstance(data, str)') == 1
+    assert code.count('isinstance(data, (int, float, Decimal))') == 1
+    assert code.count('elif isinstance(data, (int, float, Decimal))') == 1
+
+
+def test_keywords_of_checked_type_are_not_guarded():
+    code = compile_to_code({'type': 'object', 'required': ['a'], 'minProperties': 1})
+    assert code.count('isinstance(data, dict)') == 0
+    assert code.count('isinstance(data, (dict))') == 1
+    code = compile_to_code({'type': ['string', 'null'], 'minLength': 1, 'minimum': 1})
+    assert code.count('isinstance(data, str)') == 1
+    assert 'isinstance(data, (int, float, Decimal))' not in code
+    code = compile_to_code({'type': 'object', 'required': ['a']}, fast_fail=False)
+    assert code.count('isinstance(data, dict)') == 1
+
+
+@pytest.mark.parametrize('value, expected', [
+    ({'a': 1}, {'a': 1}),
+    ({}, JsonSchemaValueException('data must contain [\'a\'] properties', value='{data}', name='data', definition='{definition}', rule='required')),
+    ([], JsonSchemaValueException('data must be object', value='{data}', name='data', definition='{definition}', rule='type')),
+    ('a', JsonSchemaValueException('data must be object', value='{data}', name='data', definition='{definition}', rule='type')),
+])
+def test_keywords_of_checked_type(asserter, value, expected):
+    asserter({'type': 'object', 'required': ['a'], 'minLength': 1}, value, expected)
@@ -120,3 +120,44 @@ def test_compile_to_code_custom_format_with_refs(tmp_path, monkeypatch):
     with pytest.raises(JsonSchemaValueException) as exc:
         validate({"a": ["identifier", "not-valid"]}, formats)
     assert exc.value.message == "data.a[1] must be my-format"
+
+
+def test_compile_to_code_enum_of_objects(tmp_path, monkeypatch):
+    code = compile_to_code({
+        'enum': [{'a': [1, 2]}, {'b': None}, 'c', 'd'],
+    })
+    with open(tmp_path / 'schema_enum.py', 'w') as f:
+        f.write(code)
+    with monkeypatch.context() as m:
+        m.syspath_prepend(tmp_path)
+        from schema_enum import validate
+    assert validate({'a': [1, 2]}) == {'a': [1, 2]}
+    assert validate('d') == 'd'
+    with pytest.raises(JsonSchemaValueException):
+        validate({'a': [2, 1]})
+
+
+def test_compile_to_code_definitions(tmp_path, monkeypatch):
+    definition = {
+        'properties': {
+            'a': {'type': 'integer', 'minimum': 0},
+            'b': {'$ref': '#/definitions/b'},
+        },
+        'definitions': {
+            'b': {'type': 'string', 'maxLength': 2},
+        },
+    }
+    code = compile_to_code(definition)
+    # Each definition is in the code only once for all its errors.
+    assert code.count("{'type': 'integer', 'minimum': 0}") == 1
+    (tmp_path / 'schema_definitions.py').write_text(code, encoding='utf-8')
+    with monkeypatch.context() as m:
+        m.syspath_prepend(tmp_path)
+        from schema_definitions import validate
+    with pytest.raises(JsonSchemaValueException) as exc:
+        validate({'a': -1})
+    assert exc.value.definition == {'type': 'integer', 'minimum': 0}
+    assert exc.value.rule == 'minimum'
+    with pytest.raises(JsonSchemaValueException) as exc:
+        validate({'b': 'abc'})
+    assert exc.value.definition == {'type': 'string', 'maxLength': 2}
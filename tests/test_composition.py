@@ -168,3 +168,105 @@ def test_if_then_else_annotation_only_else():
     assert validator(42) == 42
     with pytest.raises(JsonSchemaValueException):
         validator("a")
+
+
+@pytest.mark.parametrize("definition", [
+    {"anyOf": [{"type": "string"}, {"type": "number"}]},
+    {"oneOf": [{"type": "string"}, {"type": "number"}]},
+    {"not": {"type": "string"}},
+    {"if": {"type": "string"}, "then": {"minLength": 1}, "else": {"minimum": 0}},
+    {"contains": {"type": "string"}},
+    {"propertyNames": {"maxLength": 3}},
+])
+def test_composition_without_catching_exceptions(definition):
+    code = fastjsonschema.compile_to_code(definition)
+    assert "except JsonSchemaValueException" not in code
+
+
+@pytest.mark.parametrize("value, valid", [
+    ("a", True),
+    (3, True),
+    (15, False),
+    (None, False),
+])
+def test_one_of_without_fast_fail(value, valid):
+    validate = fastjsonschema.compile({
+        "properties": {
+            "a": {"oneOf": [
+                {"type": "string"},
+                {"type": "number", "multipleOf": 3},
+                {"type": "number", "multipleOf": 5},
+            ]},
+        },
+    }, fast_fail=False)
+    if valid:
+        assert validate({"a": value}) == {"a": value}
+    else:
+        with pytest.raises(fastjsonschema.JsonSchemaValuesException) as exc:
+            validate({"a": value})
+        assert [error.rule for error in exc.value.errors] == ["oneOf"]
+
+
+def _discriminated_definition(composition):
+    return {
+        "definitions": {
+            "square": {
+                "type": "object",
+                "properties": {"kind": {"const": "square"}, "size": {"type": "number"}},
+                "required": ["kind", "size"],
+            },
+        },
+        composition: [
+            {"$ref": "#/definitions/square"},
+            {
+                "type": "object",
+                "properties": {"kind": {"enum": ["rectangle", "rect"]}, "width": {"type": "number"}},
+                "required": ["kind", "width"],
+            },
+        ],
+    }
+
+
+@pytest.mark.parametrize("composition", ["oneOf", "anyOf"])
+@pytest.mark.parametrize("value, valid", [
+    ({"kind": "square", "size": 1}, True),
+    ({"kind": "rect", "width": 1}, True),
+    ({"kind": "rectangle", "width": 1}, True),
+    ({"kind": "square", "width": 1}, False),
+    ({"kind": "circle", "size": 1}, False),
+    ({"kind": ["square"], "size": 1}, False),
+    ({"size": 1}, False),
+    ("square", False),
+])
+def test_discriminated_composition(composition, value, valid):
+    definition = _discriminated_definition(composition)
+    code = fastjsonschema.compile_to_code(definition)
+    assert "validate__dispatch" in code
+    validate = fastjsonschema.compile(definition)
+    if valid:
+        assert validate(value) == value
+    else:
+        with pytest.raises(JsonSchemaValueException) as exc:
+            validate(value)
+        assert exc.value.rule == composition
+
+
+@pytest.mark.parametrize("definition", [
+    # Not required, so object without kind can match.
+    {"oneOf": [
+        {"type": "object", "properties": {"kind": {"const": "a"}}},
+        {"type": "object", "properties": {"kind": {"const": "b"}}},
+    ]},
+    # Not only objects can match.
+    {"oneOf": [
+        {"properties": {"kind": {"const": "a"}}, "required": ["kind"]},
+        {"properties": {"kind": {"const": "b"}}, "required": ["kind"]},
+    ]},
+    # Value used by more definitions.
+    {"oneOf": [
+        {"type": "object", "properties": {"kind": {"enum": ["a", "b"]}}, "required": ["kind"]},
+        {"type": "object", "properties": {"kind": {"const": "b"}}, "required": ["kind"]},
+    ]},
+])
+def test_not_discriminated_composition(definition):
+    assert "dispatch" not in fastjsonschema.compile_to_code(definition)
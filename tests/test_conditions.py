@@ -0,0 +1,44 @@
+import pytest
+
+from fastjsonschema.conditions import bulk_items_checks, find_discriminator, integer_modulo_code, value_condition
+
+
+@pytest.mark.parametrize('value, json_input, data, expected', (
+    (1, False, 1.0, True),
+    (1, False, True, False),
+    (1, True, True, False),
+    ({'a': [1]}, False, {'a': (1,)}, True),
+    ({'a': [1]}, True, {'a': [1, 2]}, False),
+    ([], True, {}, False),
+))
+def test_value_condition(value, json_input, data, expected):
+    assert eval(value_condition('data', value, json_input), {}, {'data': data}) is expected
+
+
+@pytest.mark.parametrize('multiple_of, value, expected', (
+    (0.01, 1, True),
+    (2.5, 5, True),
+    (2.5, 6, False),
+    (1e23, 10 ** 23, True),
+))
+def test_integer_modulo_code(multiple_of, value, expected):
+    assert (eval(integer_modulo_code(multiple_of).format(value)) == 0) is expected
+
+
+def test_find_discriminator():
+    assert find_discriminator([{'kind': ['a'], 'id': ['x']}, {'kind': ['b', 'c'], 'id': ['x']}]) == (
+        'kind', {'a': 0, 'b': 1, 'c': 1},
+    )
+    assert find_discriminator([{'kind': ['a']}, {'kind': ['a']}]) is None
+    assert find_discriminator([{'kind': ['a']}]) is None
+
+
+def test_bulk_items_checks():
+    assert bulk_items_checks({'type': 'number', 'minimum': 0, 'exclusiveMaximum': 10}) == (
+        {'number'}, [('min', '>=', 0), ('max', '<', 10)], [], None, None,
+    )
+    assert bulk_items_checks({'type': 'number', 'minimum': 0, 'exclusiveMinimum': True}, True)[1] == [
+        ('min', '>', 0),
+    ]
+    assert bulk_items_checks({'type': 'string', 'minimum': 0}) is None
+    assert bulk_items_checks({'type': 'object'}) is None
@@ -22,3 +22,22 @@ def test_const(asserter, value, testError):
         '$schema': 'http://json-schema.org/draft-06/schema',
         'const': const,
     }, value, expected)
+
+
+CONST = {'a': [1, True, {'b': None}], 'c': 'd'}
+exc = JsonSchemaValueException('data must be same as const definition: {}'.format(CONST), value='{data}', name='data', definition='{definition}', rule='const')
+@pytest.mark.parametrize('value, expected', (
+    ({'a': [1, True, {'b': None}], 'c': 'd'}, {'a': [1, True, {'b': None}], 'c': 'd'}),
+    ({'c': 'd', 'a': [1.0, True, {'b': None}]}, {'c': 'd', 'a': [1.0, True, {'b': None}]}),
+    ({'a': [1, 1, {'b': None}], 'c': 'd'}, exc),
+    ({'a': [True, True, {'b': None}], 'c': 'd'}, exc),
+    ({'a': [1, True, {'b': None}]}, exc),
+    ({'a': [1, True, {'b': [[[None]]]}], 'c': 'd'}, exc),
+    ([1, True, {'b': None}], exc),
+    ('d', exc),
+))
+def test_const_object(asserter, value, expected):
+    asserter({
+        '$schema': 'http://json-schema.org/draft-06/schema',
+        'const': CONST,
+    }, value, expected)
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+import fastjsonschema.decoder
+from fastjsonschema import JsonSchemaValueException, compile, decode
+
+
+@pytest.fixture(params=['default', 'json'])
+def loads(request, monkeypatch):
+    if request.param == 'json':
+        monkeypatch.setattr(fastjsonschema.decoder, 'loads', json.loads)
+
+
+@pytest.mark.parametrize('buf', [
+    b'{"a": [1, 2.5, "x", true, null]}',
+    bytearray(b'{"a": [1, 2.5, "x", true, null]}'),
+    memoryview(b'{"a": [1, 2.5, "x", true, null]}'),
+    '{"a": [1, 2.5, "x", true, null]}',
+])
+def test_decode(loads, buf):
+    assert decode(buf) == {'a': [1, 2.5, 'x', True, None]}
+
+
+def test_decode_invalid_json(loads):
+    with pytest.raises(JsonSchemaValueException) as exc:
+        decode(b'{"a": ')
+    assert exc.value.message == 'data must be valid JSON'
+
+
+def test_decode_max_size(loads):
+    assert decode(b'[1, 2]', max_size=6) == [1, 2]
+    with pytest.raises(JsonSchemaValueException) as exc:
+        decode(b'[1, 2]', max_size=5)
+    assert exc.value.message == 'data must be shorter than or equal to 5 bytes'
+
+
+@pytest.mark.parametrize('buf', [
+    b'[[[{"a": []}]]]',
+    '[[[{"a": []}]]]',
+    b'[[], [], [], [], [], [], [[[[]]]]]',
+    b'[[["[[[[[[", "\\"[[[[[[[["]]]',
+])
+def test_decode_max_depth(loads, buf):
+    assert decode(buf, max_depth=5) == json.loads(buf)
+
+
+@pytest.mark.parametrize('buf', [
+    b'[[[[[[]]]]]]',
+    '[[[{"a": [[]]}]]]',
+    b'[[[[["[", [[]]]]]]]',
+])
+def test_decode_too_deep(loads, buf):
+    with pytest.raises(JsonSchemaValueException) as exc:
+        decode(buf, max_depth=5)
+    assert exc.value.message == 'data must be nested less than or equal to 5 levels'
+
+
+def test_decode_too_deep_for_json(monkeypatch):
+    monkeypatch.setattr(fastjsonschema.decoder, 'loads', json.loads)
+    with pytest.raises(JsonSchemaValueException) as exc:
+        decode(b'[' * 100000 + b']' * 100000)
+    assert exc.value.message == 'data must be valid JSON'
+
+
+def test_validate_bytes(loads):
+    validate = compile({'type': 'object', 'properties': {'a': {'type': 'integer'}}})
+    assert validate.validate_bytes(b'{"a": 1}') == {'a': 1}
+    with pytest.raises(JsonSchemaValueException) as exc:
+        validate.validate_bytes(b'{"a": "x"}')
+    assert exc.value.message == 'data.a must be integer'
+    with pytest.raises(JsonSchemaValueException):
+        validate.validate_bytes(b'{"a": 1}', max_size=5)
+
+
+def test_validate_bytes_with_formats(loads):
+    validate = compile({'type': 'string', 'format': 'my-format'}, formats={'my-format': str.isidentifier})
+    assert validate.validate_bytes(b'"valid"') == 'valid'
+    with pytest.raises(JsonSchemaValueException):
+        validate.validate_bytes(b'"not-valid"')
+
+
+def test_validate_bytes_return_bool(loads):
+    validate = compile({'type': 'object'}, return_bool=True)
+    assert validate.validate_bytes(b'{"a": 1}') is True
+    assert validate.validate_bytes(b'[]') is False
+    assert validate.validate_bytes(b'{"a": ') is False
+    assert validate.validate_bytes(b'[[[]]]', max_depth=2) is False
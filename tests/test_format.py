@@ -76,6 +76,7 @@ exc = JsonSchemaValueException('data must be ipv6', value='{data}', name='data',
     ('bla', exc),
     ('1.1.1.1', exc),
     ('2001:db8::1:1', '2001:db8::1:1'),
+    ('1::2:3:4:5:6', '1::2:3:4:5:6'),
     ('::ffff:1.1.1.1', '::ffff:1.1.1.1'),
 ])
 def test_ipv6(asserter, value, expected):
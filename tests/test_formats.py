@@ -0,0 +1,105 @@
+import random
+import re
+
+import pytest
+
+import fastjsonschema
+from fastjsonschema import JsonSchemaValueException
+from fastjsonschema.draft2019 import CodeGeneratorDraft2019
+from fastjsonschema.formats import NATIVE_FORMATS, cached_format, ipv6
+
+
+FORMAT_EXAMPLES = {
+    'ipv6': [
+        '2001:db8::1', '::ffff:127.0.0.1', '1::2:3:4:5:6', '1:2:3:4:5:6:7:8', '1:2:3:4:5:6:1.2.3.4',
+        '::', '::1.2.3.4', 'abcd:EF01::',
+    ],
+}
+
+ALPHABET = '0123456789.:aF٢²\n '
+
+
+def _mutated_examples(format_name, count=5000):
+    rnd = random.Random(format_name)
+    for example in FORMAT_EXAMPLES[format_name]:
+        yield example
+        for _ in range(count):
+            chars = list(example)
+            for _ in range(rnd.randint(1, 3)):
+                index = rnd.randint(0, len(chars))
+                operation = rnd.randint(0, 2)
+                if operation == 0:
+                    chars.insert(index, rnd.choice(ALPHABET))
+                elif chars:
+                    index = min(index, len(chars) - 1)
+                    if operation == 1:
+                        del chars[index]
+                    else:
+                        chars[index] = rnd.choice(ALPHABET)
+            yield ''.join(chars)
+
+
+@pytest.mark.parametrize('format_name', sorted(NATIVE_FORMATS))
+def test_native_format_same_as_regex(format_name):
+    func = NATIVE_FORMATS[format_name]
+    regex = re.compile(CodeGeneratorDraft2019.FORMAT_REGEXS[format_name])
+    for example in FORMAT_EXAMPLES[format_name]:
+        assert func(example) is True
+    for data in _mutated_examples(format_name):
+        assert func(data) is bool(regex.match(data)), (format_name, data)
+
+
+@pytest.mark.parametrize('format_name, value', [
+    ('ipv6', '::01.2.3.4'),
+    ('ipv6', '::1.2.3.4\n'),
+    ('ipv6', '::1.2.3.٤'),
+    ('ipv6', '::256.2.3.4'),
+    ('ipv6', ''),
+    ('ipv6', ':::'),
+    ('ipv6', '1.2.3.4'),
+    ('ipv6', '1.2.3.4::'),
+    ('ipv6', '1:2:3:4:5:6:7::8'),
+    ('ipv6', '1:2:3:4:5:6:7:1.2.3.4'),
+    ('ipv6', '1:2:3:4:5::1.2.3.4'),
+    ('ipv6', '1::12345'),
+])
+def test_native_format_edge_cases(format_name, value):
+    regex = re.compile(CodeGeneratorDraft2019.FORMAT_REGEXS[format_name])
+    assert NATIVE_FORMATS[format_name](value) is bool(regex.match(value))
+
+
+exc = JsonSchemaValueException('data must be ipv6', value='{data}', name='data', definition='{definition}', rule='format')
+@pytest.mark.parametrize('value, expected', [
+    ('2001:db8::1', '2001:db8::1'),
+    ('2001:db8::1::', exc),
+])
+def test_native_format_as_custom_format(asserter, value, expected):
+    asserter({'format': 'ipv6'}, value, expected, formats={'ipv6': ipv6})
+
+
+def test_cached_format():
+    calls = []
+    def is_currency(value):
+        calls.append(value)
+        return value in ('USD', 'EUR')
+    currency = cached_format(is_currency, 10)
+    validate = fastjsonschema.compile({'type': 'array', 'items': {'format': 'currency'}}, formats={
+        'currency': currency,
+    })
+    assert validate(['USD', 'EUR', 'USD', 'USD']) == ['USD', 'EUR', 'USD', 'USD']
+    with pytest.raises(JsonSchemaValueException):
+        validate(['EUR', 'CZK'])
+    with pytest.raises(JsonSchemaValueException):
+        validate(['CZK'])
+    assert calls == ['USD', 'EUR', 'CZK']
+    assert currency.cache_info() == (4, 3, 10, 3)
+    assert currency.cache_info().hit_ratio == 4 / 7
+
+
+@pytest.mark.parametrize('regex', ('^[A-Z]{3}$', re.compile('^[A-Z]{3}$')))
+def test_cached_format_regex(regex):
+    currency = cached_format(regex)
+    assert currency('USD') is True
+    assert currency('usd') is False
+    assert currency('USD') is True
+    assert currency.cache_info().hits == 1
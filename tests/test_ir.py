@@ -0,0 +1,57 @@
+from fastjsonschema.ir import Block, Statement, drop_empty_blocks, emit, merge_blocks, simplify
+
+
+def test_merge_blocks():
+    nodes = merge_blocks([
+        Block('if a:', children=[Statement('x = 1')]),
+        Block('if a:', children=[Statement('y = 1')]),
+        Block('if a:', merge=False, children=[Statement('z = 1')]),
+        Statement('w = 1'),
+        Statement('w = 1'),
+    ])
+    assert emit(nodes) == [
+        'if a:',
+        '    x = 1',
+        '    y = 1',
+        'if a:',
+        '    z = 1',
+        'w = 1',
+    ]
+
+
+def test_drop_empty_blocks():
+    nodes = drop_empty_blocks([
+        Block('for x in y:', children=[Block('if x:', children=[Statement('pass')])]),
+        Block('if a:'),
+        Block('elif b:', children=[Statement('x = 1')]),
+        Block('else:'),
+        Block('try:', children=[Statement('x = 1')]),
+        Block('except Exception:'),
+    ])
+    assert emit(nodes) == [
+        'if a:',
+        '    pass',
+        'elif b:',
+        '    x = 1',
+        'try:',
+        '    x = 1',
+        'except Exception:',
+        '    pass',
+    ]
+
+
+def test_simplify_merged_empty_blocks():
+    nodes = simplify([
+        Block('if a:', children=[Block('if b:')]),
+        Block('if a:', children=[Block('if b:'), Statement('x = 1')]),
+    ])
+    assert emit(nodes, indent=2) == [
+        'if a:',
+        '  x = 1',
+    ]
+
+
+def test_is_empty():
+    assert Block('if a:', children=[Block('for x in a:', children=[Statement('pass')])]).is_empty()
+    assert not Block('if a:', children=[Statement('x = 1')]).is_empty()
+    assert not Block('except Exception:').is_empty()
@@ -0,0 +1,80 @@
+from decimal import Decimal
+
+import pytest
+
+from fastjsonschema import JsonSchemaValueException, compile, compile_to_code
+
+
+def assert_json_input(definition, value, is_valid):
+    validate = compile(definition, json_input=True)
+    if is_valid:
+        assert validate(value) == value
+    else:
+        with pytest.raises(JsonSchemaValueException):
+            validate(value)
+
+
+@pytest.mark.parametrize('types, value, is_valid', [
+    ('null', None, True),
+    ('null', False, False),
+    ('boolean', True, True),
+    ('boolean', 1, False),
+    ('number', 1, True),
+    ('number', 1.5, True),
+    ('number', True, False),
+    ('number', Decimal('1.5'), False),
+    ('integer', 1, True),
+    ('integer', 1.0, True),
+    ('integer', 1.5, False),
+    ('integer', False, False),
+    ('string', 'a', True),
+    ('string', b'a', False),
+    ('array', [], True),
+    ('array', (), False),
+    ('object', {}, True),
+    ('object', [], False),
+    (['null', 'string'], None, True),
+    (['null', 'string'], 'a', True),
+    (['null', 'string'], 1, False),
+    (['integer', 'boolean'], True, True),
+    (['integer', 'number'], 1.5, True),
+])
+def test_json_input_type(types, value, is_valid):
+    assert_json_input({'type': types}, value, is_valid)
+
+
+def test_json_input_draft04_integer():
+    assert_json_input({'$schema': 'http://json-schema.org/draft-04/schema', 'type': 'integer'}, 1.0, False)
+
+
+@pytest.mark.parametrize('definition, value, is_valid', [
+    ({'minimum': 5}, 4, False),
+    ({'minimum': 5}, 4.5, False),
+    ({'minimum': 5}, True, True),
+    ({'maxLength': 1}, 'ab', False),
+    ({'maxLength': 1}, ['a', 'b'], True),
+    ({'minItems': 1}, [], False),
+    ({'minItems': 1}, (), True),
+    ({'required': ['a']}, {}, False),
+    ({'enum': [1, 'a', None, [True]]}, 1.0, True),
+    ({'enum': [1, 'a', None, [True]]}, True, False),
+    ({'enum': [1, 'a', None, [True]]}, [True], True),
+    ({'enum': [1, 'a', None, [True]]}, [1], False),
+    ({'const': {'a': [False]}}, {'a': [False]}, True),
+    ({'const': {'a': [False]}}, {'a': [0]}, False),
+    ({'const': False}, 0, False),
+])
+def test_json_input_keywords(definition, value, is_valid):
+    assert_json_input(definition, value, is_valid)
+
+
+def test_json_input_computes_type_once():
+    code = compile_to_code({
+        'type': ['string', 'number'],
+        'minLength': 1,
+        'pattern': 'a',
+        'minimum': 1,
+        'multipleOf': 2,
+    }, json_input=True)
+    assert code.count('type(data)') == 1
+    assert 'isinstance' not in code
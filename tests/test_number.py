@@ -141,6 +141,47 @@ def test_multiple_of_float_1_5(asserter, value, expected):
     }, value, expected)
 
 
+exc = JsonSchemaValueException('data must be multiple of 2.5', value='{data}', name='data', definition='{definition}', rule='multipleOf')
+@pytest.mark.parametrize('multiple_of, value, expected', [
+    (2.5, 5, 5),
+    (2.5, -10, -10),
+    (2.5, 3, exc),
+    (2.5, 5.0, 5.0),
+    (2.5, 3.0, exc),
+    (2.5, 7.5, 7.5),
+    (2.5, 7.6, exc),
+    (2.5, 2.5e20, 2.5e20),
+    (2.5, 10 ** 30 + 5, 10 ** 30 + 5),
+    (2.5, 10 ** 30 + 1, exc),
+    # Float which is not exact integer, int(1e23) is 99999999999999991611392.
+    (1e23, 10 ** 23, 10 ** 23),
+    (1e23, 3 * 10 ** 23, 3 * 10 ** 23),
+    (1e23, 99999999999999991611392, JsonSchemaValueException(
+        'data must be multiple of 1e+23', value='{data}', name='data', definition='{definition}', rule='multipleOf',
+    )),
+])
+def test_multiple_of_float_for_integers(asserter, multiple_of, value, expected):
+    asserter({
+        'type': 'number',
+        'multipleOf': multiple_of,
+    }, value, expected)
+
+
+exc = JsonSchemaValueException('data must be multiple of 3', value='{data}', name='data', definition='{definition}', rule='multipleOf')
+@pytest.mark.parametrize('value, expected', [
+    (10 ** 30, exc),
+    (3 * 10 ** 30, 3 * 10 ** 30),
+    (3 * 2 ** 53 + 1, exc),
+    (3.0, 3.0),
+    (3.5, exc),
+])
+def test_multiple_of_big_integers(asserter, value, expected):
+    asserter({
+        'type': 'number',
+        'multipleOf': 3,
+    }, value, expected)
+
+
 @pytest.mark.parametrize('value', (
     1.0,
     0.1,
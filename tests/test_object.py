@@ -316,3 +316,49 @@ def test_dependencies_annotation_only_schema():
     validator = fastjsonschema.compile(schema)
     assert validator({'foo': 1}) == {'foo': 1}
     assert validator({'bar': 1}) == {'bar': 1}
+
+
+@pytest.mark.parametrize('schema', [
+    {'required': ['a'], 'properties': {'a': {}}, 'additionalProperties': False},
+    {'properties': {'a': {'type': 'string'}}, 'additionalProperties': {'type': 'string'}},
+    {'properties': {'a': {}}, 'patternProperties': {'^x': {}}, 'additionalProperties': False},
+])
+def test_object_keys_are_not_copied(schema):
+    code = fastjsonschema.compile_to_code(schema)
+    assert 'set(data.keys())' not in code
+    assert 'frozenset' in code
+
+
+@pytest.mark.parametrize('schema', [
+    {'patternProperties': {'^x': {'title': 'x'}}, 'additionalProperties': False},
+    {'additionalProperties': {'$comment': 'x'}},
+])
+def test_object_keywords_without_validation_code(schema):
+    validator = fastjsonschema.compile(schema)
+    assert validator({'x': 1}) == {'x': 1}
+
+
+@pytest.mark.parametrize('additional_properties', [False, {'type': 'boolean'}])
+def test_pattern_and_additional_properties_in_one_loop(additional_properties):
+    code = fastjsonschema.compile_to_code({
+        'properties': {'a': {'type': 'integer'}},
+        'patternProperties': {'^x': {'type': 'string'}, '^y': {}},
+        'additionalProperties': additional_properties,
+    })
+    assert code.count('for data_key, data_val in data.items():') == 1
+
+
+def test_pattern_and_additional_properties_without_fast_fail():
+    validator = fastjsonschema.compile({
+        'properties': {'a': {'type': 'integer'}},
+        'patternProperties': {'^x': {'type': 'string'}},
+        'additionalProperties': False,
+    }, fast_fail=False)
+    assert validator({'a': 1, 'x1': 'x', 'x2': 'y'}) == {'a': 1, 'x1': 'x', 'x2': 'y'}
+    with pytest.raises(fastjsonschema.JsonSchemaValuesException) as exc:
+        validator({'a': 1, 'x1': 1, 'b': 1, 'c': 1})
+    assert [error.rule for error in exc.value.errors] == ['type', 'additionalProperties']
+    assert exc.value.errors[1].message in (
+        "data must not contain {'b', 'c'} properties",
+        "data must not contain {'c', 'b'} properties",
+    )
@@ -0,0 +1,93 @@
+import pytest
+
+from fastjsonschema import JsonSchemaValueException, compile
+from fastjsonschema.optimizer import optimize_definition
+
+
+@pytest.mark.parametrize('definition, expected', [
+    ({'allOf': [{'type': 'string'}]}, {'type': 'string'}),
+    ({'allOf': [{'allOf': [{'allOf': [{'minimum': 1}]}]}]}, {'minimum': 1}),
+    ({'type': 'number', 'allOf': [{'type': ['integer', 'string']}]}, {'type': 'integer'}),
+    ({'type': ['number', 'null'], 'allOf': [{'type': ['null', 'string']}]}, {'type': 'null'}),
+    ({'allOf': [{'minimum': 1}, {'minimum': 5}, {'maximum': 9}, {'maximum': 7}]}, {'minimum': 5, 'maximum': 7}),
+    ({'required': ['a'], 'allOf': [{'required': ['b', 'a']}]}, {'required': ['a', 'b']}),
+    ({'allOf': [True, {}]}, {}),
+    ({'anyOf': [{'type': 'string'}, True]}, {}),
+    ({'not': {'not': {'type': 'string'}}}, {'type': 'string'}),
+    ({'properties': {'a': {'allOf': [{'type': 'string'}]}}}, {'properties': {'a': {'type': 'string'}}}),
+    # Conflicting keywords are kept.
+    ({'type': 'string', 'allOf': [{'type': 'integer'}]}, {'type': 'string', 'allOf': [{'type': 'integer'}]}),
+    ({'pattern': 'a', 'allOf': [{'pattern': 'b'}]}, {'pattern': 'a', 'allOf': [{'pattern': 'b'}]}),
+    # Keywords depending on other keywords are not merged.
+    (
+        {'additionalProperties': False, 'allOf': [{'properties': {'a': {}}}]},
+        {'additionalProperties': False, 'allOf': [{'properties': {'a': {}}}]},
+    ),
+    (
+        {'required': ['a'], 'allOf': [{'additionalProperties': False}]},
+        {'required': ['a'], 'allOf': [{'additionalProperties': False}]},
+    ),
+    (
+        {'additionalProperties': {}, 'properties': {'a': {}}, 'required': ['a'], 'allOf': [{'required': ['b']}]},
+        {'additionalProperties': {}, 'properties': {'a': {}}, 'required': ['a'], 'allOf': [{'required': ['b']}]},
+    ),
+    (
+        {'$schema': 'http://json-schema.org/draft-04/schema', 'minimum': 1, 'allOf': [{'minimum': 2, 'exclusiveMinimum': True}]},
+        {'$schema': 'http://json-schema.org/draft-04/schema', 'minimum': 1, 'allOf': [{'minimum': 2, 'exclusiveMinimum': True}]},
+    ),
+    # Definitions changing data are kept.
+    (
+        {'allOf': [{'properties': {'a': {'default': 1}}}]},
+        {'allOf': [{'properties': {'a': {'default': 1}}}]},
+    ),
+    # Referenced definitions are kept.
+    (
+        {'allOf': [{'minimum': 1}], 'properties': {'a': {'$ref': '#/allOf/0'}}},
+        {'allOf': [{'minimum': 1}], 'properties': {'a': {'$ref': '#/allOf/0'}}},
+    ),
+    (
+        {'definitions': {'a': {'allOf': [{'minimum': 1}]}}, 'properties': {'a': {'$ref': '#/definitions/a'}}},
+        {'definitions': {'a': {'minimum': 1}}, 'properties': {'a': {'$ref': '#/definitions/a'}}},
+    ),
+])
+def test_optimize_definition(definition, expected):
+    assert optimize_definition(definition) == expected
+
+
+def test_optimize_definition_draft04():
+    definition = {'anyOf': [True, {'type': 'string'}]}
+    assert optimize_definition(definition, boolean_schemas=False) == definition
+
+
+def test_optimize_does_not_change_definition():
+    definition = {'properties': {'a': {'allOf': [{'type': 'string'}]}}}
+    optimize_definition(definition)
+    assert definition == {'properties': {'a': {'allOf': [{'type': 'string'}]}}}
+
+
+def test_compile_optimized():
+    validate = compile({
+        'type': 'object',
+        'properties': {
+            'a': {'allOf': [{'type': 'integer'}, {'allOf': [{'minimum': 0}, {'minimum': 10}]}]},
+        },
+    }, optimize=True)
+    assert validate({'a': 10}) == {'a': 10}
+    with pytest.raises(JsonSchemaValueException) as exc:
+        validate({'a': 5})
+    assert exc.value.name == 'data.a'
+    assert exc.value.rule == 'minimum'
+    assert exc.value.definition == {'type': 'integer', 'minimum': 10}
+
+
+
+@pytest.mark.parametrize('additional_properties', [False, {}])
+def test_compile_optimized_required_with_additional_properties(additional_properties):
+    validate = compile({
+        '$schema': 'http://json-schema.org/draft-06/schema',
+        'required': ['a'],
+        'allOf': [{'additionalProperties': additional_properties}],
+    }, optimize=True)
+    with pytest.raises(JsonSchemaValueException) as exc:
+        validate({})
+    assert exc.value.rule == 'required'
@@ -0,0 +1,15 @@
+import pytest
+
+from fastjsonschema.path import render_path
+
+
+@pytest.mark.parametrize('path, expected', [
+    (None, 'data'),
+    ('data', 'data'),
+    ('item', 'item'),
+    ((None, '.a', ()), 'data.a'),
+    (((None, '[{}].a', (1,)), '.b[{}][{}]', (2, 'x')), 'data[1].a.b[2][x]'),
+    (('item', '.a{{}}', ()), 'item.a{}'),
+])
+def test_render_path(path, expected):
+    assert render_path(path) == expected
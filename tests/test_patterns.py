@@ -0,0 +1,78 @@
+import random
+import re
+
+import pytest
+
+from fastjsonschema.draft04 import DOLLAR_FINDER
+from fastjsonschema.patterns import pattern_to_condition
+
+
+LOWERED_PATTERNS = [
+    '',
+    '^',
+    '$',
+    '^$',
+    'abc',
+    '^abc',
+    'abc$',
+    '^abc$',
+    'a|bc|',
+    '(ab|cd)',
+    '^(ab|cd)',
+    '(?:ab|cd)$',
+    '^(ab|cd|ab)$',
+    '^a\\.b\\$',
+    'a\\|b',
+    'x\\\\$',
+    '^[A-Z]{3}$',
+    '^[a-c0-1_-]+$',
+    '^[-a]*$',
+    '^[\\]a]{1,2}$',
+    '^[a-c]{2,}$',
+    '^[a]{0}$',
+    '^\\d$',
+    '^\\d+$',
+    '^\\d*$',
+    '^\\d{2,3}$',
+]
+
+NOT_LOWERED_PATTERNS = [
+    'a.c',
+    '^a|b$',
+    '^ab+$',
+    '^[^a]$',
+    '^[a-z]$x',
+    '^\\w+$',
+    '^\\d{,3}$',
+    '^[a-c]{3,1}$',
+    '(a)|(b)',
+    '(?i)abc',
+    '^abc\\n$',
+    '^[[a]]$',
+    '^\\d+\\Z',
+]
+
+ALPHABET = 'abcdxAZ019_-.|$\\]\né٣² '
+
+
+def _random_strings(pattern, count=2000):
+    rnd = random.Random(pattern)
+    alphabet = ALPHABET + pattern
+    for _ in range(count):
+        yield ''.join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 6)))
+
+
+@pytest.mark.parametrize('pattern', LOWERED_PATTERNS)
+def test_pattern_lowered_same_as_regex(pattern):
+    condition = pattern_to_condition(pattern, 'data')
+    assert condition is not None
+    assert 'REGEX' not in condition
+    regex = re.compile(DOLLAR_FINDER.sub(r'\\Z', pattern))
+    code = compile(condition, '<condition>', 'eval')
+    for data in _random_strings(pattern):
+        assert bool(eval(code, {'data': data})) is bool(regex.search(data)), (pattern, data)
+
+
+@pytest.mark.parametrize('pattern', NOT_LOWERED_PATTERNS)
+def test_pattern_not_lowered(pattern):
+    assert pattern_to_condition(pattern, 'data') is None
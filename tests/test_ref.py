@@ -0,0 +1,92 @@
+import pytest
+
+from fastjsonschema import JsonSchemaValueException, compile
+from fastjsonschema.draft07 import CodeGeneratorDraft07
+
+
+def test_small_ref_is_inlined():
+    definition = {
+        'type': 'array',
+        'items': {'$ref': '#/definitions/id'},
+        'definitions': {
+            'id': {'type': 'string', 'maxLength': 3},
+        },
+    }
+    code = CodeGeneratorDraft07(definition).func_code
+    assert 'validate___definitions_id' not in code
+    validator = compile(definition)
+    assert validator(['a', 'b']) == ['a', 'b']
+    with pytest.raises(JsonSchemaValueException) as exc:
+        validator(['a', 'long'])
+    assert exc.value.name == 'data[1]'
+    assert exc.value.definition == {'type': 'string', 'maxLength': 3}
+    assert exc.value.rule == 'maxLength'
+
+
+def test_chain_of_refs_is_inlined():
+    definition = {
+        '$ref': '#/definitions/a',
+        'definitions': {
+            'a': {'properties': {'b': {'$ref': '#/definitions/b'}}},
+            'b': {'type': 'integer'},
+        },
+    }
+    code = CodeGeneratorDraft07(definition).func_code
+    assert code.count('def validate') == 1
+    with pytest.raises(JsonSchemaValueException) as exc:
+        compile(definition)({'b': 'x'})
+    assert exc.value.name == 'data.b'
+
+
+def test_recursive_ref_is_called():
+    definition = {
+        '$ref': '#/definitions/tree',
+        'definitions': {
+            'tree': {
+                'type': 'object',
+                'properties': {
+                    'children': {'type': 'array', 'items': {'$ref': '#/definitions/tree'}},
+                },
+            },
+        },
+    }
+    code = CodeGeneratorDraft07(definition).func_code
+    assert 'def validate___definitions_tree(' in code
+    validator = compile(definition)
+    assert validator({'children': [{'children': []}]})
+    with pytest.raises(JsonSchemaValueException) as exc:
+        validator({'children': [{'children': [1]}]})
+    assert exc.value.name == 'data.children[0].children[0]'
+
+
+def test_big_ref_is_called():
+    definition = {
+        'items': {'$ref': '#/definitions/big'},
+        'definitions': {
+            'big': {'properties': {
+                'p{}'.format(index): {'type': 'integer'} for index in range(CodeGeneratorDraft07.INLINE_REF_MAX_SIZE)
+            }},
+        },
+    }
+    code = CodeGeneratorDraft07(definition).func_code
+    assert 'def validate___definitions_big(' in code
+    with pytest.raises(JsonSchemaValueException) as exc:
+        compile(definition)([{'p1': 'x'}])
+    assert exc.value.name == 'data[0].p1'
+
+
+def test_referenced_definition_in_exception_is_copy():
+    definition = {
+        'type': 'object',
+        'properties': {'a': {'$ref': '#/definitions/a'}},
+        'definitions': {'a': {'type': 'string'}},
+    }
+    validate = compile(definition)
+    with pytest.raises(JsonSchemaValueException) as exc:
+        validate([])
+    assert exc.value.definition['properties']['a'] == {'type': 'string'}
+    exc.value.definition['properties']['a']['type'] = 'integer'
+    assert definition['definitions']['a'] == {'type': 'string'}
+    with pytest.raises(JsonSchemaValueException) as exc:
+        validate({'a': 1})
+    assert exc.value.message == 'data.a must be string'
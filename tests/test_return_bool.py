@@ -0,0 +1,103 @@
+import pytest
+
+from fastjsonschema import JsonSchemaValueException, compile
+
+
+SCHEMA = {
+    '$schema': 'http://json-schema.org/draft-07/schema',
+    'type': 'object',
+    'properties': {
+        'id': {'$ref': '#/definitions/id'},
+        'tags': {
+            'type': 'array',
+            'items': {'type': 'string', 'minLength': 1},
+            'contains': {'const': 'main'},
+        },
+        'value': {
+            'anyOf': [
+                {'type': 'integer', 'minimum': 10},
+                {'type': 'string', 'pattern': '^a'},
+            ],
+        },
+        'kind': {
+            'oneOf': [
+                {'enum': ['a', 'b']},
+                {'enum': ['b', 'c']},
+            ],
+        },
+        'other': {
+            'not': {'type': 'null'},
+            'if': {'type': 'integer'},
+            'then': {'multipleOf': 2},
+            'else': {'type': 'string'},
+        },
+        'tree': {'$ref': '#/definitions/tree'},
+    },
+    'propertyNames': {'maxLength': 5},
+    'required': ['id'],
+    'definitions': {
+        'id': {'type': 'integer', 'minimum': 1},
+        'tree': {
+            'type': 'object',
+            'properties': {
+                'children': {'type': 'array', 'items': {'$ref': '#/definitions/tree'}},
+            },
+            'additionalProperties': False,
+        },
+    },
+}
+
+
+@pytest.mark.parametrize('value, expected', [
+    ({'id': 1}, True),
+    ({'id': 1, 'tags': ['main', 'x'], 'value': 10, 'kind': 'a', 'other': 4}, True),
+    ({'id': 1, 'value': 'abc', 'kind': 'c', 'other': 'x'}, True),
+    ({'id': 1, 'tree': {'children': [{'children': []}, {}]}}, True),
+    ({}, False),
+    ({'id': 0}, False),
+    ({'id': '1'}, False),
+    ({'id': 1, 'tags': ['x']}, False),
+    ({'id': 1, 'tags': ['main', '']}, False),
+    ({'id': 1, 'value': 5}, False),
+    ({'id': 1, 'value': 'b'}, False),
+    ({'id': 1, 'kind': 'b'}, False),
+    ({'id': 1, 'kind': 'd'}, False),
+    ({'id': 1, 'other': None}, False),
+    ({'id': 1, 'other': 3}, False),
+    ({'id': 1, 'other': []}, False),
+    ({'id': 1, 'tree': {'children': [{'children': [{'x': 1}]}]}}, False),
+    ({'id': 1, 'toolong': 1}, False),
+    ([], False),
+])
+def test_return_bool(value, expected):
+    validate = compile(SCHEMA)
+    is_valid = compile(SCHEMA, return_bool=True)
+    assert is_valid(value) is expected
+    try:
+        validate(value)
+    except JsonSchemaValueException:
+        assert not expected
+    else:
+        assert expected
+
+
+@pytest.mark.parametrize('definition, valid, invalid', [
+    ({'anyOf': [{'$ref': '#/definitions/a'}, {'type': 'string'}], 'definitions': {'a': {'type': 'integer'}}}, 1, None),
+    ({'not': {'$ref': '#/definitions/a'}, 'definitions': {'a': {'type': 'string'}}}, 1, 'a'),
+])
+def test_return_bool_ref_in_composition(definition, valid, invalid):
+    is_valid = compile(definition, return_bool=True)
+    assert is_valid(valid) is True
+    assert is_valid(invalid) is False
+
+
+def test_return_bool_uses_defaults():
+    is_valid = compile({'properties': {'a': {'default': 42}}}, return_bool=True)
+    data = {}
+    assert is_valid(data) is True
+    assert data == {'a': 42}
+
+
+def test_return_bool_without_fast_fail():
+    is_valid = compile({'properties': {'a': {'type': 'string'}, 'b': {'type': 'string'}}}, fast_fail=False, return_bool=True)
+    assert is_valid({'a': 1, 'b': 2}) is False